@@ -0,0 +1,142 @@
+import os
+import queue
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, wait
+from typing import Iterable, List, Optional
+
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS
+
+
+class StreamingArchiveWriter:
+    STORED_SUFFIXES = (".pdf", ".zip", ".xlsx", ".parquet", ".gz", ".png", ".jpg", ".jpeg")
+    SKIPPED_SUFFIXES = (".part", ".tmp")
+
+    def __init__(
+        self,
+        name: str,
+        root_dir: str,
+        max_volume_bytes: Optional[int] = None,
+        compress_level: int = 6,
+    ) -> None:
+        self._name = name
+        self._base_dir = os.path.dirname(os.path.normpath(root_dir))
+        self._max_volume_bytes = max_volume_bytes
+        self._compress_level = compress_level
+        self._queue = queue.Queue()
+        self._archive: Optional[zipfile.ZipFile] = None
+        self._volume_bytes = 0
+        self._closed = False
+        self._aborted = threading.Event()
+        self.paths: List[str] = []
+        self._worker = threading.Thread(target=self._run, name="Archive", daemon=True)
+        self._worker.start()
+
+    def add_directory(self, directory: str, pending: Iterable[Future] = ()) -> None:
+        self._queue.put((directory, list(pending)))
+
+    def add_file(self, path: str) -> None:
+        self._queue.put((path, []))
+
+    def finalize(self) -> List[str]:
+        if self._closed:
+            return self.paths
+        self._closed = True
+        started_at = time.monotonic()
+        self._queue.put(None)
+        self._worker.join()
+        self._close_volume()
+        if not self.paths:
+            Message.warning_message("Нет файлов для архивации. Архив не создан.")
+            return self.paths
+        for path in self.paths:
+            Message.success_message(
+                f"Размер архива: {os.stat(path).st_size // (1024 * 1024)} мб.\n"
+                f"Путь к файлу: {path}"
+            )
+        Message.info_message(f"Архив завершён за {time.monotonic() - started_at:.2f} сек.")
+        return self.paths
+
+    def abort(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._aborted.set()
+        self._queue.put(None)
+        self._worker.join()
+        self._close_volume()
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except OSError:
+                ...
+        if self.paths:
+            Message.warning_message(f"Архивация прервана, незавершённый архив удалён: {', '.join(self.paths)}")
+        self.paths.clear()
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            if self._aborted.is_set():
+                continue
+            path, pending = task
+            try:
+                wait(pending)
+                self._add_path(path=path)
+            except Exception as error:
+                STATISTICS.increment("archive.errors")
+                Message.error_message(f"Ошибка архивации. Путь: {path}. Ошибка: {error!r}")
+
+    def _add_path(self, path: str) -> None:
+        if os.path.isfile(path):
+            self._write(path=path)
+            return
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if not name.endswith(self.SKIPPED_SUFFIXES):
+                    self._write(path=os.path.join(root, name))
+        Message.info_message(f"Директория добавлена в архив: {path}")
+
+    def _write(self, path: str) -> None:
+        size = os.path.getsize(path)
+        stored = path.lower().endswith(self.STORED_SUFFIXES)
+        archive = self._volume_for(size=size)
+        archive.write(
+            path,
+            arcname=os.path.relpath(path, start=self._base_dir),
+            compress_type=zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED,
+            compresslevel=None if stored else self._compress_level,
+        )
+        self._volume_bytes += archive.infolist()[-1].compress_size
+        STATISTICS.increment("archive.files")
+        STATISTICS.increment("archive.stored_files" if stored else "archive.deflated_files")
+        STATISTICS.increment("archive.bytes", size)
+
+    def _volume_for(self, size: int) -> zipfile.ZipFile:
+        over_limit = (
+            self._max_volume_bytes is not None
+            and self._volume_bytes
+            and self._volume_bytes + size > self._max_volume_bytes
+        )
+        if self._archive is not None and over_limit:
+            self._close_volume()
+        if self._archive is None:
+            path = self._volume_path(number=len(self.paths) + 1)
+            self._archive = zipfile.ZipFile(path, "w", allowZip64=True)
+            self._volume_bytes = 0
+            self.paths.append(path)
+        return self._archive
+
+    def _volume_path(self, number: int) -> str:
+        if self._max_volume_bytes is None:
+            return os.path.abspath(f"{self._name}.zip")
+        return os.path.abspath(f"{self._name}.part{number}.zip")
+
+    def _close_volume(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from math import ceil
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium import webdriver
+
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS, process_tree_rss
+
+StageResult = Dict[str, float]
+
+WEBDRIVER_CALLS = "benchmark.webdriver_calls"
+LATENCY_ROUTES = ("search", "api", "patent", "pdf")
+
+
+class BenchmarkScenario(ABC):
+    name = ""
+
+    @abstractmethod
+    def units(self) -> List[Any]:
+        ...
+
+    @abstractmethod
+    def run_unit(self, unit: Any) -> int:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class RssSampler:
+
+    def __init__(self, interval: float = 0.2) -> None:
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="RSS sampler", daemon=True)
+        self.peak = 0
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            self.peak = max(self.peak, process_tree_rss(pid=os.getpid()))
+            if self._stopped.wait(timeout=self._interval):
+                return
+
+
+class BenchmarkRunner:
+    METRICS = (
+        ("pages_per_sec", "стр./сек.", True),
+        ("latency_p50", "p50 сек.", False),
+        ("latency_p95", "p95 сек.", False),
+        ("webdriver_calls_per_page", "вызовов WebDriver на стр.", False),
+        ("peak_rss_mb", "пиковая память мб", False),
+    )
+
+    def __init__(self, threads_count: int = 1, rss_interval: float = 0.2) -> None:
+        self._threads_count = threads_count
+        self._rss_interval = rss_interval
+
+    def run(self, scenarios: List[BenchmarkScenario]) -> Dict[str, StageResult]:
+        results = {}
+        for scenario in scenarios:
+            try:
+                results[scenario.name] = self._run_scenario(scenario=scenario)
+            finally:
+                scenario.close()
+        return results
+
+    def _run_scenario(self, scenario: BenchmarkScenario) -> StageResult:
+        units = scenario.units()
+        Message.info_message(f"Сценарий {scenario.name}. Единиц работы: {len(units)}")
+        calls_before = STATISTICS.get_counter(WEBDRIVER_CALLS)
+        started_at = time.monotonic()
+        with RssSampler(interval=self._rss_interval) as sampler:
+            with ThreadPoolExecutor(max_workers=self._threads_count, thread_name_prefix=scenario.name) as executor:
+                measurements = list(executor.map(lambda unit: self._measure(scenario=scenario, unit=unit), units))
+        elapsed = time.monotonic() - started_at
+        pages = sum(unit_pages for unit_pages, _ in measurements)
+        latencies = sorted(
+            unit_elapsed / unit_pages for unit_pages, unit_elapsed in measurements if unit_pages
+        )
+        result = {
+            "units": len(units),
+            "pages": pages,
+            "elapsed": round(elapsed, 3),
+            "pages_per_sec": round(pages / elapsed, 3) if elapsed else 0.0,
+            "latency_p50": round(percentile(values=latencies, fraction=0.5), 4),
+            "latency_p95": round(percentile(values=latencies, fraction=0.95), 4),
+            "webdriver_calls_per_page": round(
+                (STATISTICS.get_counter(WEBDRIVER_CALLS) - calls_before) / pages, 2
+            ) if pages else 0.0,
+            "peak_rss_mb": round(sampler.peak / (1024 * 1024), 1),
+        }
+        Message.success_message(
+            f"Сценарий {scenario.name}: " + ", ".join(f"{name}={value}" for name, value in result.items())
+        )
+        return result
+
+    @staticmethod
+    def _measure(scenario: BenchmarkScenario, unit: Any) -> Tuple[int, float]:
+        started_at = time.monotonic()
+        pages = scenario.run_unit(unit=unit)
+        return pages, time.monotonic() - started_at
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(max(ceil(fraction * len(values)) - 1, 0), len(values) - 1)]
+
+
+def count_webdriver_calls(driver: webdriver.Chrome) -> webdriver.Chrome:
+    execute = driver.execute
+
+    def counted_execute(*args, **kwargs):
+        STATISTICS.increment(WEBDRIVER_CALLS)
+        return execute(*args, **kwargs)
+
+    driver.execute = counted_execute
+    return driver
+
+
+def parse_latency(value: Optional[str]) -> Dict[str, float]:
+    if not value:
+        return {}
+    if ":" not in value:
+        return {route: float(value) for route in LATENCY_ROUTES}
+    latency = {}
+    for entry in value.split(","):
+        route, _, seconds = entry.partition(":")
+        if route.strip() not in LATENCY_ROUTES:
+            Message.warning_message(f"Неизвестный тип страницы для задержки пропущен: {route}")
+            continue
+        latency[route.strip()] = float(seconds)
+    return latency
+
+
+def save_baseline(path: str, results: Dict[str, StageResult], settings: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {"created_at": datetime.now().isoformat(timespec="seconds"), "settings": settings, "stages": results},
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+    Message.success_message(f"Результаты бенчмарка сохранены. Путь к файлу: {path}")
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare_with_baseline(
+    results: Dict[str, StageResult],
+    baseline: Dict[str, Any],
+    settings: Dict[str, Any],
+    tolerance: float = 0.1,
+) -> List[str]:
+    if baseline.get("settings") != settings:
+        Message.warning_message(
+            f"Параметры запуска отличаются от базовой линии: {baseline.get('settings')}. Сравнение может быть неточным."
+        )
+    regressions = []
+    for stage, result in results.items():
+        expected = baseline.get("stages", {}).get(stage)
+        if expected is None:
+            Message.warning_message(f"Сценарий {stage} отсутствует в базовой линии.")
+            continue
+        for metric, title, higher_is_better in BenchmarkRunner.METRICS:
+            before, after = expected.get(metric, 0.0), result.get(metric, 0.0)
+            change = (after - before) / before if before else 0.0
+            Message.info_message(f"{stage}. {title}: {before} -> {after} ({change:+.1%})")
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{stage}.{metric}: {before} -> {after} ({change:+.1%})")
+    for regression in regressions:
+        Message.warning_message(f"Ухудшение относительно базовой линии: {regression}")
+    return regressions
@@ -0,0 +1,283 @@
+import html
+import json
+import os
+import random
+from datetime import date, timedelta
+from math import ceil
+from typing import Dict, List, Optional
+
+from general_classes.type_annotations import FixturePatent
+
+SEARCH_FORM_PAGE = """<!DOCTYPE html>
+<html><head><title>Google Patents</title></head>
+<body>
+<form action="/" method="get"><input id="searchInput" name="q" type="text"></form>
+</body></html>
+"""
+
+SEARCH_RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><title>Google Patents</title>
+<style>iron-icon {{ display: inline-block; width: 24px; height: 24px; }}</style>
+</head>
+<body>
+<search-results><search-ui><div><div>
+  <div></div>
+  <div><div><div>
+    <div>
+      <div></div>
+      <div>
+        <div></div>
+        <div>
+          <span></span>
+          <span>
+            <span></span><span></span><span></span>
+            <span><dropdown-menu><span><iron-icon onclick="openDropdown()"></iron-icon></span></dropdown-menu></span>
+          </span>
+        </div>
+      </div>
+    </div>
+    <span id="numResultsLabel">About {total} results</span>
+    <div id="results"></div>
+  </div></div></div>
+</div></div></search-ui>
+<search-paging>
+  <state-modifier></state-modifier><state-modifier></state-modifier>
+  <state-modifier><a><paper-icon-button><iron-icon id="next" onclick="nextPage()"></iron-icon></paper-icon-button></a>
+  </state-modifier>
+</search-paging>
+</search-results>
+<iron-dropdown id="dropdown"></iron-dropdown>
+<script>
+const results = {results};
+let num = 10;
+let page = 0;
+const escape = (value) => {{
+  const node = document.createElement("span");
+  node.textContent = value;
+  return node.innerHTML;
+}};
+function render() {{
+  const container = document.getElementById("results");
+  container.innerHTML = results.slice(num * page, num * (page + 1)).map((result) =>
+    `<search-result-item><article>` +
+    `<state-modifier data-result="${{result.id}}"><a id="link" href="/${{result.id}}">${{escape(result.title)}}</a></state-modifier>` +
+    `<h3>${{escape(result.title)}}</h3>` +
+    `<h4 class="metadata"><span>${{result.code}}</span><span>EN</span>` +
+    `<span>${{escape(result.inventors)}}</span><span>${{escape(result.assignee)}}</span></h4>` +
+    `<h4 class="dates">Priority ${{result.priority}} • Published ${{result.published}}</h4>` +
+    `</article></search-result-item>`
+  ).join("");
+  document.getElementById("next").style.display = num * (page + 1) < results.length ? "" : "none";
+}}
+function openDropdown() {{
+  document.getElementById("dropdown").innerHTML = '<div onclick="setNum(100)">100</div>';
+}}
+function setNum(value) {{
+  num = value;
+  page = 0;
+  render();
+}}
+function nextPage() {{
+  page += 1;
+  render();
+}}
+render();
+</script>
+</body></html>
+"""
+
+NO_RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><title>Google Patents</title></head>
+<body>
+<search-results><span id="numResultsLabel">About 0 results</span><div id="noResultsMessage">No results found</div>
+</search-results>
+</body></html>
+"""
+
+PATENT_PAGE = """<!DOCTYPE html>
+<html><head><title>{patent_code} - {title}</title></head>
+<body>
+<result-container><patent-result><div><div><div>
+  <div>
+    <div>
+      <h1 id="title">{title}</h1>
+      <abstract><div>{abstract}</div></abstract>
+      <section id="classifications"><classification-viewer><div><div>
+        <div onclick="expandClassifications()">View {hidden_count} more classifications</div>
+      </div></div>
+      <div id="codes"><classification-tree>{codes}</classification-tree></div>
+      </classification-viewer></section>
+    </div>
+    <div>
+      <section>
+        <header>
+          <h2 id="pubnum">{patent_code}</h2>
+          <p>{country}</p>
+          <div><a href="/pdf/{patent_code}.pdf">Download PDF</a></div>
+        </header>
+        <dl class="important-people">{people}</dl>
+        <application-timeline>
+          <div class="event"><div class="priority">{priority_date}</div></div>
+          <div class="event"><div class="publication">{publication_date}</div><span>{patent_code}</span></div>
+        </application-timeline>
+      </section>
+    </div>
+  </div>
+</div></div></div></patent-result></result-container>
+<script>
+const hiddenCodes = {hidden_codes};
+function expandClassifications() {{
+  const tree = document.querySelector("#codes classification-tree");
+  hiddenCodes.forEach((code) => {{
+    tree.insertAdjacentHTML("beforeend", `<state-modifier><a>${{code}}</a></state-modifier>`);
+  }});
+  hiddenCodes.length = 0;
+}}
+</script>
+</body></html>
+"""
+
+
+class PatentFixtures:
+    CODE_PREFIX = "US"
+    COUNTRY = "United States"
+    ASSIGNEES = ("Raytheon Company", "Raytheon Technologies Corp")
+    VISIBLE_CODES = ("H04L9/0819", "H04L9/3247", "G06F21/602", "G06F21/64", "H04W12/04")
+    HIDDEN_CODES = ("H04L2209/80", "G06F2221/2107", "H04L63/0428", "Y02D30/70")
+    TITLE_WORDS = ("secure", "key", "exchange", "crypt", "channel", "token", "network", "module", "signature")
+    ABSTRACT_SENTENCE = "A secure crypt module derives a session key for the network channel."
+
+    def __init__(
+        self,
+        patents_count: int = 200,
+        inventors_count: int = 60,
+        seed: int = 1,
+        recorded_dir: Optional[str] = None,
+        pdf_size: int = 256 * 1024,
+    ) -> None:
+        self._random = random.Random(seed)
+        self._recorded_dir = recorded_dir
+        self._pdf_size = pdf_size
+        self.inventors = [f"Inventor {self._name(index)}" for index in range(inventors_count)]
+        self.patents: List[FixturePatent] = [self._make_patent(number=index) for index in range(patents_count)]
+        self._by_code = {patent["patent_code"]: patent for patent in self.patents}
+
+    @staticmethod
+    def link(patent: FixturePatent) -> str:
+        return f"patent/{patent['patent_code']}/en"
+
+    def get(self, patent_code: str) -> Optional[FixturePatent]:
+        return self._by_code.get(patent_code)
+
+    def search(self, inventor: Optional[str] = None) -> List[FixturePatent]:
+        if inventor is None:
+            return self.patents
+        return [patent for patent in self.patents if inventor in patent["inventors"]]
+
+    def search_form_page(self) -> str:
+        return SEARCH_FORM_PAGE
+
+    def search_page(self, patents: List[FixturePatent]) -> str:
+        if not patents:
+            return NO_RESULTS_PAGE
+        results = [
+            {
+                "id": self.link(patent=patent),
+                "code": patent["patent_code"],
+                "title": patent["title"],
+                "inventors": ", ".join(patent["inventors"]),
+                "assignee": patent["current_assignee"][0],
+                "priority": patent["priority_date"],
+                "published": patent["publication_date"],
+            }
+            for patent in patents
+        ]
+        return SEARCH_RESULTS_PAGE.format(total=len(results), results=json.dumps(results).replace("</", "<\\/"))
+
+    def api_page(self, patents: List[FixturePatent], num: int, page: int) -> Dict:
+        results = [
+            {
+                "id": self.link(patent=patent),
+                "patent": {
+                    "title": patent["title"],
+                    "publication_number": patent["patent_code"],
+                    "priority_date": patent["priority_date"].replace("-", ""),
+                    "publication_date": patent["publication_date"].replace("-", ""),
+                    "inventor": ", ".join(patent["inventors"]),
+                    "assignee": patent["current_assignee"][0],
+                },
+            }
+            for patent in patents[num * page:num * (page + 1)]
+        ]
+        return {
+            "results": {
+                "total_num_results": len(patents),
+                "total_num_pages": max(ceil(len(patents) / num), 1),
+                "cluster": [{"result": results}],
+            }
+        }
+
+    def patent_page(self, patent_code: str) -> Optional[str]:
+        recorded = self._recorded_page(patent_code=patent_code)
+        if recorded is not None:
+            return recorded
+        patent = self.get(patent_code=patent_code)
+        if patent is None:
+            return None
+        inventors = "".join(
+            f'<dd><state-modifier act=\'{{"type": "QUERY_ADD", "inventor": "{html.escape(name)}"}}\'>'
+            f'<a id="link">{html.escape(name)}</a></state-modifier></dd>'
+            for name in patent["inventors"]
+        )
+        assignees = "".join(f"<dd>{html.escape(name)}</dd>" for name in patent["current_assignee"])
+        people = f"<dt>Inventor</dt>{inventors}<dt>Current Assignee</dt>{assignees}"
+        return PATENT_PAGE.format(
+            patent_code=patent["patent_code"],
+            title=html.escape(patent["title"]),
+            abstract=html.escape(patent["abstract"]),
+            hidden_count=len(patent["hidden_classification_codes"]),
+            codes="".join(
+                f"<state-modifier><a>{code}</a></state-modifier>" for code in patent["classification_codes"]
+            ),
+            hidden_codes=json.dumps(patent["hidden_classification_codes"]),
+            country=self.COUNTRY,
+            people=people,
+            priority_date=patent["priority_date"],
+            publication_date=patent["publication_date"],
+        )
+
+    def pdf(self, patent_code: str) -> Optional[bytes]:
+        if self.get(patent_code=patent_code) is None:
+            return None
+        header = f"%PDF-1.4\n% {patent_code}\n".encode("ascii")
+        return header + b"0" * max(self._pdf_size - len(header), 0)
+
+    def _recorded_page(self, patent_code: str) -> Optional[str]:
+        if self._recorded_dir is None:
+            return None
+        path = os.path.join(self._recorded_dir, "patent", patent_code, "en.html")
+        if not os.path.isfile(path):
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def _make_patent(self, number: int) -> FixturePatent:
+        priority = date(2005, 1, 1) + timedelta(days=self._random.randrange(5000))
+        publication = priority + timedelta(days=self._random.randrange(400, 1500))
+        title = " ".join(self._random.sample(self.TITLE_WORDS, k=4)).capitalize()
+        return FixturePatent(
+            patent_code=f"{self.CODE_PREFIX}{9000000 + number}B2",
+            title=title,
+            abstract=" ".join([self.ABSTRACT_SENTENCE] * self._random.randrange(3, 12)),
+            inventors=self._random.sample(self.inventors, k=self._random.randrange(1, 5)),
+            current_assignee=[self._random.choice(self.ASSIGNEES)],
+            priority_date=priority.isoformat(),
+            publication_date=publication.isoformat(),
+            classification_codes=self._random.sample(self.VISIBLE_CODES, k=2),
+            hidden_classification_codes=self._random.sample(self.HIDDEN_CODES, k=2),
+        )
+
+    @staticmethod
+    def _name(index: int) -> str:
+        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        return f"{letters[index % 26]}{letters[index // 26 % 26].lower()}{index}"
@@ -0,0 +1,190 @@
+from general_classes.enums import XpathIdElements, XpathRightPartElements, UniqueNames
+
+SCRIPT_XPATHS = {
+    element.name: element.value
+    for enum in (XpathIdElements, XpathRightPartElements)
+    for element in enum
+}
+SCRIPT_XPATHS.update({"inventor_name": UniqueNames.INVENTOR.value, "assignee_name": UniqueNames.CURRENT_ASSIGNEE.value})
+
+EXTRACT_PATENT_PAGE = """
+const xpaths = arguments[0];
+const expand = arguments[1] !== false;
+const done = arguments[arguments.length - 1];
+const snapshot = (xpath) => document.evaluate(
+    xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+const first = (xpath) => {
+    const result = snapshot(xpath);
+    return result.snapshotLength ? result.snapshotItem(0) : null;
+};
+const text = (xpath) => {
+    const node = first(xpath);
+    return node ? node.innerText.trim() : null;
+};
+const countCodes = () => snapshot(xpaths.classification_element_codes).snapshotLength;
+
+const extract = (moreButton) => {
+    const codes = [];
+    const codesResult = snapshot(xpaths.classification_element_codes);
+    for (let i = 0; i < codesResult.snapshotLength; i++) {
+        const code = codesResult.snapshotItem(i).innerText.trim();
+        if (code) codes.push(code);
+    }
+
+    let currentAssignee = null;
+    let inventors = null;
+    const people = snapshot(xpaths.important_people_section);
+    if (people.snapshotLength) {
+        currentAssignee = [];
+        inventors = [];
+        let currentElement = "";
+        for (let i = 0; i < people.snapshotLength; i++) {
+            const node = people.snapshotItem(i);
+            const tagName = node.tagName.toLowerCase();
+            if (tagName === "dt") {
+                const name = node.innerText.trim();
+                if (name === xpaths.inventor_name || name === xpaths.assignee_name) currentElement = name;
+            } else if (tagName === "dd") {
+                if (currentElement === xpaths.inventor_name) {
+                    const link = node.querySelector("#link");
+                    inventors.push((link || node).innerText.trim());
+                } else if (currentElement === xpaths.assignee_name) {
+                    currentAssignee.push(node.innerText.trim());
+                }
+            }
+        }
+    }
+
+    const patentCode = text(xpaths.patent_code);
+    const publicationDate = patentCode
+        ? text(xpaths.date_publication_template.replace("{patent_code}", patentCode))
+        : null;
+    const pdf = first(xpaths.pdf);
+    return {
+        more_button: moreButton,
+        title: text(xpaths.patent_title),
+        patent_code: patentCode,
+        classification_codes: codes.length ? codes : null,
+        current_assignee: currentAssignee,
+        inventors: inventors,
+        country: text(xpaths.country),
+        priority_date: text(xpaths.date_priority),
+        publication_date: publicationDate,
+        abstract: text(xpaths.abstract),
+        pdf_link: pdf && pdf.href ? pdf.href : null,
+    };
+};
+
+const button = first(xpaths.more_classifications_button);
+if (!expand) {
+    done(extract(null));
+} else if (!button) {
+    done(extract(false));
+} else {
+    const codesBefore = countCodes();
+    button.click();
+    const startedAt = Date.now();
+    const waitForRender = () => {
+        if (countCodes() !== codesBefore || Date.now() - startedAt > 1000) {
+            done(extract(true));
+        } else {
+            setTimeout(waitForRender, 50);
+        }
+    };
+    setTimeout(waitForRender, 0);
+}
+"""
+
+EXPAND_CLASSIFICATIONS = """
+const xpaths = arguments[0];
+const done = arguments[arguments.length - 1];
+const snapshot = (xpath) => document.evaluate(
+    xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+const readCodes = () => {
+    const codes = [];
+    const result = snapshot(xpaths.classification_element_codes);
+    for (let i = 0; i < result.snapshotLength; i++) {
+        const code = result.snapshotItem(i).innerText.trim();
+        if (code) codes.push(code);
+    }
+    return codes;
+};
+const finish = (moreButton) => {
+    const codes = readCodes();
+    done({more_button: moreButton, classification_codes: codes.length ? codes : null});
+};
+
+const buttons = snapshot(xpaths.more_classifications_button);
+if (!buttons.snapshotLength) {
+    finish(false);
+} else {
+    const codesBefore = snapshot(xpaths.classification_element_codes).snapshotLength;
+    buttons.snapshotItem(0).click();
+    const startedAt = Date.now();
+    const waitForRender = () => {
+        const codesNow = snapshot(xpaths.classification_element_codes).snapshotLength;
+        if (codesNow !== codesBefore || Date.now() - startedAt > 1000) {
+            finish(true);
+        } else {
+            setTimeout(waitForRender, 50);
+        }
+    };
+    setTimeout(waitForRender, 0);
+}
+"""
+
+COUNT_KEYWORDS = """
+const [patterns, threshold, earlyExit, withOffsets] = arguments;
+const text = document.body ? document.body.innerText : "";
+const regex = new RegExp(patterns.map((pattern) => "(" + pattern.source + ")").join("|"), "gi");
+const counts = new Array(patterns.length).fill(0);
+const offsets = [];
+let score = 0;
+let stoppedEarly = false;
+let match;
+while ((match = regex.exec(text)) !== null) {
+    let group = 1;
+    while (match[group] === undefined) {
+        group++;
+    }
+    const pattern = patterns[group - 1];
+    counts[group - 1]++;
+    score += pattern.weight;
+    if (withOffsets) {
+        offsets.push([pattern.keyword, match.index]);
+    }
+    if (earlyExit && score >= threshold) {
+        stoppedEarly = regex.lastIndex < text.length;
+        break;
+    }
+}
+return {
+    counts: counts,
+    score: score,
+    stopped_early: stoppedEarly,
+    offsets: withOffsets ? offsets : null,
+    text_length: text.length,
+};
+"""
+
+EXTRACT_RESULT_CARDS = """
+const items = document.evaluate(
+    arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+const text = (node) => node ? node.innerText.trim() : null;
+const cards = [];
+for (let i = 0; i < items.snapshotLength; i++) {
+    const item = items.snapshotItem(i);
+    const modifier = item.querySelector("state-modifier[data-result]");
+    if (!modifier) continue;
+    cards.push({
+        link: modifier.getAttribute("data-result"),
+        title: text(item.querySelector("h3")),
+        metadata: Array.from(item.querySelectorAll("h4.metadata > span")).map((span) => span.innerText.trim()),
+        dates: text(item.querySelector("h4.dates")),
+    });
+}
+return cards;
+"""
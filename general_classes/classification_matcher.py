@@ -0,0 +1,171 @@
+import re
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Set, Tuple
+
+from general_classes.enums import ClassificationDecisionEnum
+from general_classes.logger import Message
+
+CodeKey = Tuple[str, int, str, int, str]
+
+
+class ClassificationCode:
+    CODE_REGEX = re.compile(r"^([A-HY])(\d{2})?([A-Z])?(\d{1,4})?(?:/(\d{2,6}))?$")
+    MAIN_GROUP_SUBGROUP = "00"
+
+    def __init__(self, section: str, klass: str, subclass: str, group: str, subgroup: str) -> None:
+        self.section = section
+        self.klass = klass
+        self.subclass = subclass
+        self.group = group
+        self.subgroup = subgroup if subgroup != self.MAIN_GROUP_SUBGROUP else ""
+
+    @classmethod
+    def parse(cls, code: str) -> Optional["ClassificationCode"]:
+        match = cls.CODE_REGEX.match(re.sub(r"\s+", "", code).upper())
+        if match is None:
+            return None
+        section, klass, subclass, group, subgroup = (part or "" for part in match.groups())
+        if (subclass and not klass) or (group and not subclass) or (subgroup and not group):
+            return None
+        return cls(section=section, klass=klass, subclass=subclass, group=str(int(group)) if group else "",
+                   subgroup=subgroup)
+
+    def __str__(self) -> str:
+        code = f"{self.section}{self.klass}{self.subclass}{self.group}"
+        return f"{code}/{self.subgroup}" if self.subgroup else code
+
+    def ancestors(self) -> List[str]:
+        levels = [self.section]
+        if self.klass:
+            levels.append(f"{self.section}{self.klass}")
+        if self.subclass:
+            levels.append(f"{levels[-1]}{self.subclass}")
+        if self.group:
+            levels.append(f"{levels[-1]}{self.group}")
+            main_group = levels[-1]
+            for length in range(2, len(self.subgroup) + 1):
+                levels.append(f"{main_group}/{self.subgroup[:length]}")
+        return levels
+
+    def low_key(self) -> CodeKey:
+        return (
+            self.section,
+            int(self.klass or 0),
+            self.subclass,
+            int(self.group or 0),
+            self.subgroup,
+        )
+
+    def high_key(self) -> CodeKey:
+        return (
+            self.section,
+            int(self.klass) if self.klass else 99,
+            self.subclass or "Z",
+            int(self.group) if self.group else 9999,
+            self.subgroup.ljust(6, "9") if self.subgroup else "999999",
+        )
+
+
+class ClassificationMatcher:
+    CODE_IN_TEXT_REGEX = re.compile(
+        r"(?<![A-Za-z\d])[A-HY]\d{2}(?:[A-Z](?:\d{1,4}(?:/\d{2,6})?)?)?(?![A-Za-z\d/])"
+        r"|(?<=\()[A-HY](?=\))"
+    )
+    ENTRIES_SEPARATOR = ","
+    RANGE_SEPARATOR = "-"
+    DENY_PREFIX = "!"
+
+    def __init__(self, allow: Iterable[str], deny: Iterable[str] = ()) -> None:
+        self._allow_codes, self._allow_ranges = self._build_index(entries=allow)
+        self._deny_codes, self._deny_ranges = self._build_index(entries=deny)
+        if not self._allow_codes and not self._allow_ranges[0]:
+            raise ValueError("Не задано ни одного кода классификатора")
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "ClassificationMatcher":
+        allow, deny = [], []
+        for entry in spec.split(cls.ENTRIES_SEPARATOR):
+            entry = entry.strip()
+            if entry.startswith(cls.DENY_PREFIX):
+                deny.append(entry[len(cls.DENY_PREFIX):].strip())
+            elif entry:
+                allow.append(entry)
+        return cls(allow=allow, deny=deny)
+
+    @classmethod
+    def codes_in_text(cls, text: str) -> List[str]:
+        return list(dict.fromkeys(cls.CODE_IN_TEXT_REGEX.findall(text)))
+
+    def describe(self) -> str:
+        allow = sorted(self._allow_codes) + [f"{low}-{high}" for low, high in self._allow_ranges[2]]
+        deny = sorted(self._deny_codes) + [f"{low}-{high}" for low, high in self._deny_ranges[2]]
+        description = ", ".join(allow)
+        if deny:
+            description += f"; исключения: {', '.join(deny)}"
+        return description
+
+    @property
+    def has_deny_rules(self) -> bool:
+        return bool(self._deny_codes or self._deny_ranges[0])
+
+    def decide(self, codes: List[str]) -> ClassificationDecisionEnum:
+        if self.find_denied(codes=codes) is not None:
+            return ClassificationDecisionEnum.REJECT
+        if not self.has_deny_rules and self.find_allowed(codes=codes) is not None:
+            return ClassificationDecisionEnum.ACCEPT
+        return ClassificationDecisionEnum.UNDECIDED
+
+    def find_allowed(self, codes: Iterable[str]) -> Optional[str]:
+        return self._find(codes=codes, index_codes=self._allow_codes, index_ranges=self._allow_ranges)
+
+    def find_denied(self, codes: Iterable[str]) -> Optional[str]:
+        return self._find(codes=codes, index_codes=self._deny_codes, index_ranges=self._deny_ranges)
+
+    def _find(self, codes: Iterable[str], index_codes: Set[str], index_ranges: Tuple) -> Optional[str]:
+        for raw_code in codes:
+            code = ClassificationCode.parse(raw_code)
+            if code is None:
+                continue
+            if any(ancestor in index_codes for ancestor in code.ancestors()):
+                return raw_code
+            if self._in_ranges(code=code, index_ranges=index_ranges):
+                return raw_code
+        return None
+
+    @staticmethod
+    def _in_ranges(code: ClassificationCode, index_ranges: Tuple) -> bool:
+        lows, highs, _ = index_ranges
+        if not lows:
+            return False
+        position = bisect_right(lows, code.low_key()) - 1
+        return position >= 0 and code.low_key() <= highs[position]
+
+    def _build_index(self, entries: Iterable[str]) -> Tuple[Set[str], Tuple]:
+        codes: Set[str] = set()
+        ranges = []
+        for entry in entries:
+            low, separator, high = entry.partition(self.RANGE_SEPARATOR)
+            low_code = ClassificationCode.parse(low)
+            high_code = ClassificationCode.parse(high) if separator else None
+            if low_code is None or (separator and high_code is None):
+                Message.warning_message(f"Неверный код классификатора пропущен: {entry}")
+                continue
+            if high_code is None:
+                codes.add(str(low_code))
+            else:
+                ranges.append((low_code.low_key(), high_code.high_key(), str(low_code), str(high_code)))
+        return codes, self._merge_ranges(ranges=ranges)
+
+    @staticmethod
+    def _merge_ranges(ranges: List[Tuple]) -> Tuple[List[CodeKey], List[CodeKey], List[Tuple[str, str]]]:
+        lows, highs, names = [], [], []
+        for low, high, low_name, high_name in sorted(ranges):
+            if lows and low <= highs[-1]:
+                if high > highs[-1]:
+                    highs[-1] = high
+                    names[-1] = (names[-1][0], high_name)
+                continue
+            lows.append(low)
+            highs.append(high)
+            names.append((low_name, high_name))
+        return lows, highs, names
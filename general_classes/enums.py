@@ -5,12 +5,59 @@ class DirTypeEnum(Enum):
     TEMP_DIR = "/tmp/google_patents/"
     LINKS_DIR = "links"
     RESULT_DIR = "result"
+    CACHE_DIR = "cache"
 
 
 class FileTypeEnum(Enum):
     MAIN_JSON = "main_links.json"
     INVENTORS_JSON = "inventors.json"
     PATENTS_JSON = "patents.json"
+    LEDGER_DB = "ledger.sqlite3"
+    TASKS_DB = "tasks.sqlite3"
+    METRICS_JSON = "metrics.json"
+
+
+class ExtractionModeEnum(Enum):
+    ELEMENTS = "elements"
+    SCRIPT = "script"
+
+
+class KeywordCountModeEnum(Enum):
+    PYTHON = "python"
+    BROWSER = "browser"
+
+
+class ClassificationDecisionEnum(Enum):
+    ACCEPT = "accept"
+    REJECT = "reject"
+    UNDECIDED = "undecided"
+
+
+class ResultFormatEnum(Enum):
+    XLSX = "xlsx"
+    JSONL = "jsonl"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+class BrowserProfileEnum(Enum):
+    DEFAULT = "default"
+    SCRAPING = "scraping"
+
+
+class JobStatusEnum(Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class LedgerStageEnum(Enum):
+    MAIN_LINKS = "main_links"
+    INVENTORS = "inventors"
+    PATENTS_LINKS = "patents_links"
+    PATENTS = "patents"
+    AUTHORS = "authors"
 
 
 class UniqueNames(Enum):
@@ -70,10 +117,17 @@ class SearchItems(Enum):
     result_items = (
         "//search-results//search-result-item//a[@id='link']/parent::state-modifier"
     )
+    result_cards = "//search-results//search-result-item"
     no_result_message = "//div[@id='noResultsMessage']"
     next_button = "//search-paging/state-modifier[3]/a/paper-icon-button/iron-icon"
 
 
+class ReadySignalElements(Enum):
+    patent_result = "//result-container/patent-result//*[@id='title' or @id='pubnum']"
+    search_form = "//input[@id='searchInput']"
+    search_results = "//span[@id='numResultsLabel']|//div[@id='noResultsMessage']"
+
+
 class PatentsColumnName(Enum):
     title = "Название"
     current_assignee = "Патентообладатель"
@@ -98,3 +152,7 @@ class MetaDataColumnName(Enum):
 
 class PersonColumnName(Enum):
     patents = "Патенты"
+
+
+class ConsolidatedColumnName(Enum):
+    author = "Папка автора"
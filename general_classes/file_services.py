@@ -1,11 +1,12 @@
 import json
 import os
 import shutil
+import threading
 from typing import Tuple, List
 
 from xlsxwriter import Workbook
 
-from general_classes.enums import PatentsColumnName, MetaDataColumnName, PersonColumnName
+from general_classes.enums import PatentsColumnName, MetaDataColumnName, PersonColumnName, ConsolidatedColumnName
 from general_classes.logger import Message
 from general_classes.type_annotations import State
 
@@ -18,117 +19,158 @@ class LinksJsonFileReader:
             return json.load(file)
 
 
-class XlsxFileWriter:
+WORKBOOK_OPTIONS = {"constant_memory": True, "strings_to_formulas": False, "strings_to_urls": False}
+
+
+class XlsxRows:
+
+    @staticmethod
+    def patents(state: State) -> List[List[str]]:
+        current_assignee = state["current_assignee"]
+        inventors = state["inventors"]
+        rows = []
+        for index in range(max(len(current_assignee), len(inventors))):
+            rows.append([
+                state["title"],
+                current_assignee[index] if index < len(current_assignee) else "",
+                inventors[index] if index < len(inventors) else "",
+                state["link"],
+                state["priority_date"],
+                state["publication_date"],
+                state["classification_codes"],
+                state["patent_code"],
+                state["country"],
+                "",
+                state["path_to_pdf_file"],
+            ])
+        return rows
+
+    @staticmethod
+    def metadata(state: State) -> List[List[str]]:
+        return [[
+            state["path_to_pdf_file"],
+            state["link"],
+            state["publication_date"],
+            ", ".join(state["inventors"]),
+            state["patent_code"],
+        ]]
+
+    @staticmethod
+    def person(state: State) -> List[List[str]]:
+        return [[
+            f"{state['title']} {state['priority_date']} "
+            f"{', '.join(state['inventors'])} {state['abstract']} {state['link']}"
+        ]]
+
+
+class StreamingXlsxSheet:
+
+    def __init__(self, workbook: Workbook, name: str, headers: List[str]) -> None:
+        self._worksheet = workbook.add_worksheet(name=name)
+        self._worksheet.write_row(0, 0, headers, workbook.add_format({"bold": True}))
+        self._row = 1
+
+    def write_rows(self, rows: List[List[str]]) -> None:
+        for row in rows:
+            self._worksheet.write_row(self._row, 0, row)
+            self._row += 1
+
+
+class StreamingXlsxWriter:
     PATENTS = "patents.xlsx"
     METADATA = "metadata.xlsx"
     PERSON = "person.xlsx"
+    SHEETS = (
+        (PATENTS, "Patents", PatentsColumnName, XlsxRows.patents),
+        (METADATA, "Metadata", MetaDataColumnName, XlsxRows.metadata),
+        (PERSON, "Person", PersonColumnName, XlsxRows.person),
+    )
+
+    def __init__(self, directory: str) -> None:
+        self._lock = threading.Lock()
+        self._workbooks = []
+        self._sheets = []
+        for file_name, sheet_name, columns, rows in self.SHEETS:
+            workbook = Workbook(os.path.join(directory, file_name), WORKBOOK_OPTIONS)
+            self._workbooks.append(workbook)
+            self._sheets.append(
+                (StreamingXlsxSheet(workbook=workbook, name=sheet_name, headers=[i.value for i in columns]), rows)
+            )
+        self.rows_written = 0
+
+    def append(self, state: State) -> None:
+        with self._lock:
+            for sheet, rows in self._sheets:
+                sheet.write_rows(rows=rows(state))
+            self.rows_written += 1
+
+    def close(self) -> None:
+        with self._lock:
+            for workbook in self._workbooks:
+                workbook.close()
+            self._workbooks.clear()
+        Message.success_message(f"Запись данных в xlsx завершена. Записано патентов: {self.rows_written}")
+
+    def __enter__(self) -> "StreamingXlsxWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class ConsolidatedXlsxWriter:
+    FILE_NAME = "consolidated.xlsx"
+
+    def __init__(self, directory: str) -> None:
+        self.path = os.path.join(directory, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self._workbook = Workbook(self.path, WORKBOOK_OPTIONS)
+        author_column = ConsolidatedColumnName.author.value
+        self._sheets = [
+            (
+                StreamingXlsxSheet(
+                    workbook=self._workbook,
+                    name=sheet_name,
+                    headers=[author_column] + [i.value for i in columns],
+                ),
+                rows,
+            )
+            for _, sheet_name, columns, rows in StreamingXlsxWriter.SHEETS
+        ]
+        self.rows_written = 0
+
+    def append(self, author: str, states: List[State]) -> None:
+        with self._lock:
+            for state in states:
+                for sheet, rows in self._sheets:
+                    sheet.write_rows(rows=[[author] + row for row in rows(state)])
+            self.rows_written += len(states)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._workbook is None:
+                return
+            self._workbook.close()
+            self._workbook = None
+        Message.success_message(
+            f"Сводный файл записан. Патентов: {self.rows_written}. Путь к файлу: {self.path}"
+        )
+
+
+class XlsxFileWriter:
+    PATENTS = StreamingXlsxWriter.PATENTS
+    METADATA = StreamingXlsxWriter.METADATA
+    PERSON = StreamingXlsxWriter.PERSON
 
     def __init__(self, directory: str, state: List[State]) -> None:
         self.__directory = directory
         self.__state = state
-        self.__patents_path = os.path.join(self.__directory, self.PATENTS)
-        self.__metadata_path = os.path.join(self.__directory, self.METADATA)
-        self.__person_path = os.path.join(self.__directory, self.PERSON)
 
     def execute_write(self) -> None:
-        self._write_patents()
-        self._write_metadata()
-        self._write_person()
-
-    def _write_patents(self):
-        Message.info_message(f"Запись данных в {self.PATENTS}...")
-        with Workbook(self.__patents_path) as workbook:
-            worksheet = workbook.add_worksheet(name="Patents")
-            bold = workbook.add_format({"bold": True})
-            columns = [attribute.value for attribute in PatentsColumnName]
-            for column, header in enumerate(columns):
-                worksheet.write_string(0, column, header, cell_format=bold)
-
-            row = 1
-            for element in self.__state:
-                current_assignee = element["current_assignee"]
-                inventors = element["inventors"]
-                max_deep = max((len(current_assignee), len(inventors)))
-                iter_current_assignee = iter(current_assignee)
-                iter_inventors = iter(inventors)
-                for index in range(max_deep):
-                    worksheet.write_string(row, 0, element["title"])
-
-                    try:
-                        current_assignee = next(iter_current_assignee)
-                    except StopIteration:
-                        current_assignee = ""
-                    worksheet.write_string(row, 1, current_assignee)
-
-                    try:
-                        inventor = next(iter_inventors)
-                    except StopIteration:
-                        inventor = ""
-                    worksheet.write_string(row, 2, inventor)
-
-                    worksheet.write_string(row, 3, element["link"])
-                    worksheet.write_string(row, 4, element["priority_date"])
-                    worksheet.write_string(row, 5, element["publication_date"])
-                    worksheet.write_string(row, 6, element["classification_codes"])
-                    worksheet.write_string(row, 7, element["patent_code"])
-                    worksheet.write_string(row, 8, element["country"])
-                    worksheet.write_string(row, 9, "")
-                    worksheet.write_string(row, 10, element["path_to_pdf_file"])
-                    row += 1
-        Message.success_message(f"Запись данных в {self.PATENTS} завершена.")
-
-    def _write_metadata(self) -> None:
-        Message.info_message(f"Запись данных в {self.METADATA}...")
-        with Workbook(self.__metadata_path) as workbook:
-            columns = [attribute.value for attribute in MetaDataColumnName]
-            worksheet = workbook.add_worksheet(name="Metadata")
-            bold = workbook.add_format({"bold": True})
-            for column, header in enumerate(columns):
-                worksheet.write_string(0, column, header, cell_format=bold)
-
-            row = 1
-            for element in self.__state:
-                worksheet.write_string(row, 0, element["path_to_pdf_file"])
-                worksheet.write_string(row, 1, element["link"])
-                worksheet.write_string(row, 2, element["publication_date"])
-                worksheet.write_string(row, 3, ", ".join(element["inventors"]))
-                worksheet.write_string(row, 4, element["patent_code"])
-                row += 1
-        Message.success_message(f"Запись данных в {self.METADATA} завершена.")
-
-    def _write_person(self) -> None:
-        Message.info_message(f"Запись данных в {self.PERSON}...")
-        with Workbook(self.__person_path) as workbook:
-            columns = [attribute.value for attribute in PersonColumnName]
-            worksheet = workbook.add_worksheet(name="Person")
-            bold = workbook.add_format({"bold": True})
-            for column, header in enumerate(columns):
-                worksheet.write_string(0, column, header, cell_format=bold)
-
-            row = 1
+        Message.info_message(f"Запись данных в {self.PATENTS}, {self.METADATA}, {self.PERSON}...")
+        with StreamingXlsxWriter(directory=self.__directory) as writer:
             for element in self.__state:
-                text = (
-                    f"{element['title']} {element['priority_date']} "
-                    f"{', '.join(element['inventors'])} {element['abstract']} {element['link']}"
-                )
-                worksheet.write_string(row, 0, text)
-                row += 1
-        Message.success_message(f"Запись данных в {self.PERSON} завершена.")
-
-    @staticmethod
-    def zipped_files(dir_name: str, zip_file_name: str) -> None:
-        if not os.listdir(dir_name):
-            Message.warning_message(f"Директория {dir_name} пуста. Архивация невозможна")
-        else:
-            zip_file_name = f"{zip_file_name}.zip"
-            Message.info_message("Упаковываю файлы в архив...")
-            wget = f"zip -r {zip_file_name} {dir_name}"
-            os.system(wget)
-            Message.success_message("Файлы упакованы в архив.")
-            Message.success_message(
-                f"Размер архива: {os.stat(zip_file_name).st_size // (1024 * 1024)} мб.\n"
-                f"Путь к файлу: {os.path.join(os.getcwd(), zip_file_name)}"
-            )
+                writer.append(state=element)
 
     @staticmethod
     def delete_empty_directory(dir_name: str) -> None:
@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import List, Optional, Tuple, Dict
+from urllib.parse import urljoin
+
+from lxml import etree, html as lxml_html
+
+from general_classes.enums import XpathIdElements, XpathRightPartElements, UniqueNames
+from general_classes.type_annotations import PatentPage
+
+
+def compile_xpath(xpath: str) -> etree.XPath:
+    return etree.XPath(xpath.replace("@Id", "@id"))
+
+
+class PatentHtmlExtractor:
+    TITLE = compile_xpath(XpathIdElements.patent_title.value)
+    PATENT_CODE = compile_xpath(XpathIdElements.patent_code.value)
+    CLASSIFICATION_CODES = compile_xpath(XpathIdElements.classification_element_codes.value)
+    PEOPLE_SECTION = compile_xpath(XpathRightPartElements.important_people_section.value)
+    COUNTRY = compile_xpath(XpathRightPartElements.country.value)
+    PDF = compile_xpath(XpathRightPartElements.pdf.value)
+    DATE_PRIORITY = compile_xpath(XpathRightPartElements.date_priority.value)
+    DATE_PUBLICATION = compile_xpath(
+        XpathRightPartElements.date_publication_template.value.replace("'{patent_code}'", "$patent_code")
+    )
+    ABSTRACT = compile_xpath(XpathRightPartElements.abstract.value)
+    INVENTOR_LINK = etree.XPath(".//*[@id='link']")
+
+    def extract(self, html: str, url: str) -> PatentPage:
+        document = lxml_html.fromstring(html)
+        page = PatentPage()
+        page["title"] = self._first_text(document=document, xpath=self.TITLE)
+        page["patent_code"] = self._first_text(document=document, xpath=self.PATENT_CODE)
+        page["classification_codes"] = self._find_classification_codes(document=document)
+        page["current_assignee"], page["inventors"] = self._parse_people_section(document=document)
+        page["country"] = self._first_text(document=document, xpath=self.COUNTRY)
+        page["priority_date"] = self._convert_date(
+            date=self._first_text(document=document, xpath=self.DATE_PRIORITY)
+        )
+        page["publication_date"] = self._find_publication_date(
+            document=document, patent_code=page["patent_code"]
+        )
+        page["abstract"] = self._first_text(document=document, xpath=self.ABSTRACT)
+        page["pdf_link"] = self._find_pdf_link(document=document, url=url)
+        etree.strip_elements(document, "script", "style", with_tail=False)
+        page["text"] = self._normalize(document.text_content())
+        return page
+
+    def from_script_result(self, result: Dict) -> PatentPage:
+        page = PatentPage()
+        for field in (
+            "title", "patent_code", "classification_codes", "current_assignee",
+            "inventors", "country", "abstract", "pdf_link",
+        ):
+            page[field] = result.get(field)
+        page["priority_date"] = self._convert_date(date=result.get("priority_date"))
+        page["publication_date"] = self._convert_date(date=result.get("publication_date"))
+        page["text"] = None
+        return page
+
+    def _find_classification_codes(self, document: etree.ElementBase) -> Optional[List[str]]:
+        codes = [self._normalize(element.text_content()) for element in self.CLASSIFICATION_CODES(document)]
+        codes = [code for code in codes if code]
+        return codes or None
+
+    def _parse_people_section(
+        self, document: etree.ElementBase
+    ) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+        people_section = self.PEOPLE_SECTION(document)
+        if not people_section:
+            return None, None
+        current_element = ""
+        current_assignee = []
+        inventors = []
+        for element in people_section:
+            if element.tag == "dt":
+                text = self._normalize(element.text_content())
+                if text in {UniqueNames.INVENTOR.value, UniqueNames.CURRENT_ASSIGNEE.value}:
+                    current_element = text
+            elif element.tag == "dd":
+                if current_element == UniqueNames.INVENTOR.value:
+                    link = self.INVENTOR_LINK(element)
+                    inventors.append(self._normalize((link[0] if link else element).text_content()))
+                elif current_element == UniqueNames.CURRENT_ASSIGNEE.value:
+                    current_assignee.append(self._normalize(element.text_content()))
+        return current_assignee, inventors
+
+    def _find_publication_date(self, document: etree.ElementBase, patent_code: Optional[str]) -> Optional[str]:
+        if not patent_code:
+            return None
+        elements = self.DATE_PUBLICATION(document, patent_code=patent_code)
+        if not elements:
+            return None
+        return self._convert_date(date=self._normalize(elements[0].text_content()))
+
+    def _find_pdf_link(self, document: etree.ElementBase, url: str) -> Optional[str]:
+        elements = self.PDF(document)
+        if not elements or not elements[0].get("href"):
+            return None
+        return urljoin(base=url, url=elements[0].get("href"))
+
+    def _first_text(self, document: etree.ElementBase, xpath: etree.XPath) -> Optional[str]:
+        elements = xpath(document)
+        if not elements:
+            return None
+        return self._normalize(elements[0].text_content())
+
+    @staticmethod
+    def _convert_date(date: Optional[str]) -> Optional[str]:
+        if date is None:
+            return None
+        if not date:
+            return ""
+        try:
+            return datetime.strptime(date, "%Y-%m-%d").strftime("%d.%m.%Y")
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.split())
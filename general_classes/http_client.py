@@ -0,0 +1,97 @@
+import json
+import time
+from typing import Optional, Dict
+
+import urllib3
+from urllib3.exceptions import HTTPError
+from urllib3.response import HTTPResponse
+
+from general_classes.logger import Message
+from general_classes.rate_governor import RateGovernor, RATE_GOVERNOR
+
+
+class HttpClient:
+    DEFAULT_HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/102.0.0.0 Safari/537.36"
+        ),
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+
+    THROTTLED_STATUSES = (429, 503)
+
+    def __init__(
+        self,
+        pool_size: int = 8,
+        timeout: float = 15.0,
+        retries: int = 2,
+        governor: Optional[RateGovernor] = RATE_GOVERNOR,
+    ) -> None:
+        self._governor = governor
+        self._pool = urllib3.PoolManager(
+            num_pools=pool_size,
+            maxsize=pool_size,
+            block=True,
+            headers=self.DEFAULT_HEADERS,
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503)),
+        )
+
+    def get_text(self, url: str, headers: Optional[Dict] = None) -> Optional[str]:
+        try:
+            response = self._request(url=url, headers=headers)
+        except HTTPError as error:
+            Message.warning_message(f"Ошибка HTTP запроса. URL: {url}. Ошибка: {error}")
+            return None
+        if response.status != 200:
+            Message.warning_message(f"Неверный статус ответа: {response.status}. URL: {url}")
+            return None
+        return response.data.decode("utf-8", errors="replace")
+
+    def get_json(self, url: str, headers: Optional[Dict] = None) -> Optional[Dict]:
+        text = self.get_text(url=url, headers=headers)
+        if text is None:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            Message.warning_message(f"Ответ не является JSON. URL: {url}")
+            return None
+
+    def open_stream(self, url: str, headers: Optional[Dict] = None) -> Optional[HTTPResponse]:
+        try:
+            return self._request(url=url, headers=headers, preload_content=False)
+        except HTTPError as error:
+            Message.warning_message(f"Ошибка HTTP запроса. URL: {url}. Ошибка: {error}")
+            return None
+
+    def _request(self, url: str, headers: Optional[Dict], preload_content: bool = True) -> HTTPResponse:
+        governed = self._governor is not None and self._governor.governs(url)
+        if governed:
+            self._governor.acquire()
+        started_at = time.monotonic()
+        try:
+            response = self._pool.request("GET", url, headers=headers, preload_content=preload_content)
+        except HTTPError:
+            if governed:
+                self._governor.report_failure(reason=f"ошибка HTTP запроса: {url}")
+            raise
+        if governed:
+            if response.status in self.THROTTLED_STATUSES:
+                self._governor.report_failure(reason=f"статус ответа {response.status}: {url}")
+            else:
+                self._governor.report_response(elapsed=time.monotonic() - started_at)
+        return response
+
+    def clear(self) -> None:
+        self._pool.clear()
+
+
+class HttpPageFetcher:
+
+    def __init__(self, client: HttpClient) -> None:
+        self._client = client
+
+    def fetch(self, url: str) -> Optional[str]:
+        return self._client.get_text(url=url)
@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Dict
+
+from general_classes.enums import JobStatusEnum, LedgerStageEnum
+from general_classes.logger import Message
+
+
+class JobLedger:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            stage TEXT NOT NULL,
+            key TEXT NOT NULL,
+            status TEXT NOT NULL,
+            payload TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (stage, key)
+        )
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(self.SCHEMA)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM jobs")
+        Message.info_message(f"Журнал задач очищен. Путь: {self._path}")
+
+    def requeue_in_progress(self) -> int:
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status IN (?, ?)",
+                (
+                    JobStatusEnum.PENDING.value,
+                    time.time(),
+                    JobStatusEnum.IN_PROGRESS.value,
+                    JobStatusEnum.FAILED.value,
+                ),
+            )
+        Message.info_message(f"Возвращено в очередь незавершённых задач: {cursor.rowcount}")
+        return cursor.rowcount
+
+    def start(self, stage: LedgerStageEnum, key: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO jobs (stage, key, status, attempts, updated_at) VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT (stage, key) DO UPDATE SET "
+                "status = excluded.status, attempts = attempts + 1, updated_at = excluded.updated_at",
+                (stage.value, key, JobStatusEnum.IN_PROGRESS.value, time.time()),
+            )
+
+    def finish(self, stage: LedgerStageEnum, key: str, payload: Any = None) -> None:
+        self._set_status(stage=stage, key=key, status=JobStatusEnum.DONE, payload=json.dumps(payload))
+
+    def fail(self, stage: LedgerStageEnum, key: str) -> None:
+        self._set_status(stage=stage, key=key, status=JobStatusEnum.FAILED)
+
+    def status(self, stage: LedgerStageEnum, key: str) -> Optional[JobStatusEnum]:
+        row = self._fetch_row(stage=stage, key=key)
+        return JobStatusEnum(row[0]) if row else None
+
+    def is_done(self, stage: LedgerStageEnum, key: str) -> bool:
+        return self.status(stage=stage, key=key) == JobStatusEnum.DONE
+
+    def payload(self, stage: LedgerStageEnum, key: str) -> Any:
+        row = self._fetch_row(stage=stage, key=key)
+        if not row or row[1] is None:
+            return None
+        return json.loads(row[1])
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT stage, status, COUNT(*) FROM jobs GROUP BY stage, status"
+            ).fetchall()
+        result = {}
+        for stage, status, count in rows:
+            result.setdefault(stage, {})[status] = count
+        return result
+
+    def report(self) -> None:
+        for stage, statuses in sorted(self.summary().items()):
+            counts = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+            Message.info_message(f"Журнал задач. Этап {stage}: {counts}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _set_status(
+        self,
+        stage: LedgerStageEnum,
+        key: str,
+        status: JobStatusEnum,
+        payload: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO jobs (stage, key, status, payload, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (stage, key) DO UPDATE SET "
+                "status = excluded.status, payload = excluded.payload, updated_at = excluded.updated_at",
+                (stage.value, key, status.value, payload, time.time()),
+            )
+
+    def _fetch_row(self, stage: LedgerStageEnum, key: str) -> Optional[tuple]:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT status, payload FROM jobs WHERE stage = ? AND key = ?",
+                (stage.value, key),
+            ).fetchone()
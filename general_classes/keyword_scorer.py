@@ -0,0 +1,133 @@
+import re
+from typing import Dict, List, Tuple, Optional, Any
+
+from general_classes.statistics import STATISTICS
+
+
+class KeywordScore:
+
+    def __init__(
+        self,
+        score: float,
+        threshold: float,
+        counts: Dict[str, int],
+        stopped_early: bool,
+        offsets: Optional[List[Tuple[str, int]]] = None,
+    ) -> None:
+        self.score = score
+        self.threshold = threshold
+        self.counts = counts
+        self.stopped_early = stopped_early
+        self.offsets = offsets
+
+    @property
+    def passed(self) -> bool:
+        return self.score >= self.threshold
+
+    def describe(self) -> str:
+        counts = ", ".join(f"{keyword}: {count}" for keyword, count in self.counts.items() if count)
+        suffix = " (подсчёт остановлен досрочно)" if self.stopped_early else ""
+        return f"{self.score:g} [{counts or 'нет совпадений'}]{suffix}"
+
+
+class KeywordScorer:
+    KEYWORDS_SEPARATOR = ","
+    WEIGHT_SEPARATOR = ":"
+    JS_SPECIAL_CHARACTERS = re.compile(r"[\\^$.*+?()[\]{}|/-]")
+
+    # Keywords are matched as plain text: regex metacharacters are escaped and only the whitespace between
+    # words is flexible. An empty keyword list disables the check, every page passes it.
+    def __init__(self, keywords: List[Tuple[str, float]], threshold: float) -> None:
+        self._keywords = [keyword for keyword, _ in keywords]
+        self._weights = [weight for _, weight in keywords]
+        self._threshold = threshold
+        self._order = sorted(range(len(keywords)), key=lambda index: -len(self._keywords[index]))
+        self._pattern = re.compile(
+            "|".join(f"(?P<k{index}>{self._keyword_pattern(self._keywords[index])})" for index in self._order),
+            flags=re.IGNORECASE,
+        )
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._keywords)
+
+    def script_patterns(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "keyword": self._keywords[index],
+                "source": r"\s+".join(self._js_escape(word) for word in self._keywords[index].split()),
+                "weight": self._weights[index],
+            }
+            for index in self._order
+        ]
+
+    def from_script_result(self, result: Dict[str, Any]) -> KeywordScore:
+        counts = dict.fromkeys(self._keywords, 0)
+        for index, count in zip(self._order, result["counts"]):
+            counts[self._keywords[index]] = count
+        offsets = result.get("offsets")
+        STATISTICS.increment("keywords.scored")
+        if result["stopped_early"]:
+            STATISTICS.increment("keywords.early_exits")
+        return KeywordScore(
+            score=result["score"],
+            threshold=self._threshold,
+            counts=counts,
+            stopped_early=result["stopped_early"],
+            offsets=[(keyword, offset) for keyword, offset in offsets] if offsets is not None else None,
+        )
+
+    @classmethod
+    def from_prompt(cls, raw: str, threshold: float) -> "KeywordScorer":
+        keywords = []
+        for part in raw.split(cls.KEYWORDS_SEPARATOR):
+            keyword, separator, weight = part.strip().rpartition(cls.WEIGHT_SEPARATOR)
+            if not separator or not cls._is_number(weight):
+                keyword, weight = part.strip(), "1"
+            keyword = " ".join(keyword.split())
+            if keyword:
+                keywords.append((keyword, float(weight)))
+        return cls(keywords=keywords, threshold=threshold)
+
+    def score(self, text: str, early_exit: bool = True) -> KeywordScore:
+        if not self.enabled:
+            return KeywordScore(score=0.0, threshold=0.0, counts={}, stopped_early=False)
+        counts = [0] * len(self._keywords)
+        score = 0.0
+        stopped_early = False
+        for match in self._pattern.finditer(text):
+            index = int(match.lastgroup[1:])
+            counts[index] += 1
+            score += self._weights[index]
+            if early_exit and score >= self._threshold:
+                stopped_early = match.end() < len(text)
+                break
+        STATISTICS.increment("keywords.scored")
+        if stopped_early:
+            STATISTICS.increment("keywords.early_exits")
+        return KeywordScore(
+            score=score,
+            threshold=self._threshold,
+            counts=dict(zip(self._keywords, counts)),
+            stopped_early=stopped_early,
+        )
+
+    @staticmethod
+    def _keyword_pattern(keyword: str) -> str:
+        return r"\s+".join(re.escape(word) for word in keyword.split())
+
+    @classmethod
+    def _js_escape(cls, word: str) -> str:
+        return cls.JS_SPECIAL_CHARACTERS.sub(lambda match: f"\\{match.group(0)}", word)
+
+    @staticmethod
+    def _is_number(value: str) -> bool:
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
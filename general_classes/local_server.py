@@ -0,0 +1,279 @@
+import hmac
+import json
+import os
+import re
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler, BaseHTTPRequestHandler
+from math import ceil
+from typing import List, Dict, Optional
+from urllib.parse import urlsplit, parse_qs
+
+from general_classes.benchmark_fixtures import PatentFixtures
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS
+from general_classes.task_queue import TaskQueueService, RemoteTaskQueue
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+
+    def translate_path(self, path: str) -> str:
+        translated = super().translate_path(path)
+        if not os.path.isfile(translated) and os.path.isfile(f"{translated.rstrip('/')}.html"):
+            return f"{translated.rstrip('/')}.html"
+        return translated
+
+    def log_message(self, format: str, *args) -> None:
+        ...
+
+
+class SearchStubRequestHandler(BaseHTTPRequestHandler):
+
+    def __init__(
+        self,
+        *args,
+        links: List[str],
+        inventors: Dict[str, List[str]],
+        queries: List[Dict[str, List[str]]],
+        **kwargs,
+    ) -> None:
+        self._links = links
+        self._inventors = inventors
+        self._queries = queries
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/xhr/query":
+            self.send_error(404)
+            return
+        inner_query = parse_qs(parse_qs(url.query).get("url", [""])[0])
+        self._queries.append(inner_query)
+        links = self._links
+        if "inventor" in inner_query:
+            links = self._inventors.get(inner_query["inventor"][0], [])
+        num = int(inner_query.get("num", ["10"])[0])
+        page = int(inner_query.get("page", ["0"])[0])
+        results = [{"id": link} for link in links[num * page:num * (page + 1)]]
+        body = json.dumps({
+            "results": {
+                "total_num_results": len(links),
+                "total_num_pages": max(ceil(len(links) / num), 1),
+                "cluster": [{"result": results}],
+            }
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        ...
+
+
+class PatentsStandInRequestHandler(BaseHTTPRequestHandler):
+    PATENT_PATH_REGEX = re.compile(r"^/patent/([A-Z0-9]+)/en/?$")
+    PDF_PATH_REGEX = re.compile(r"^/pdf/([A-Z0-9]+)\.pdf$")
+
+    def __init__(self, *args, fixtures: PatentFixtures, latency: Dict[str, float], **kwargs) -> None:
+        self._fixtures = fixtures
+        self._latency = latency
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        patent_match = self.PATENT_PATH_REGEX.match(url.path)
+        pdf_match = self.PDF_PATH_REGEX.match(url.path)
+        if url.path.rstrip("/") == "/xhr/query":
+            self._serve_api(query=parse_qs(parse_qs(url.query).get("url", [""])[0]))
+        elif url.path == "/":
+            self._serve_search(query=parse_qs(url.query))
+        elif patent_match is not None:
+            self._send(route="patent", body=self._fixtures.patent_page(patent_code=patent_match.group(1)))
+        elif pdf_match is not None:
+            self._send(route="pdf", body=self._fixtures.pdf(patent_code=pdf_match.group(1)),
+                       content_type="application/pdf")
+        else:
+            self.send_error(404)
+
+    def _serve_search(self, query: Dict[str, List[str]]) -> None:
+        if "q" not in query:
+            self._send(route="search", body=self._fixtures.search_form_page())
+            return
+        patents = self._fixtures.search(inventor=self._inventor(query=query))
+        self._send(route="search", body=self._fixtures.search_page(patents=patents))
+
+    def _serve_api(self, query: Dict[str, List[str]]) -> None:
+        patents = self._fixtures.search(inventor=self._inventor(query=query))
+        page = self._fixtures.api_page(
+            patents=patents,
+            num=int(query.get("num", ["10"])[0]),
+            page=int(query.get("page", ["0"])[0]),
+        )
+        self._send(route="api", body=json.dumps(page), content_type="application/json")
+
+    @staticmethod
+    def _inventor(query: Dict[str, List[str]]) -> Optional[str]:
+        values = query.get("inventor")
+        return values[0] if values else None
+
+    def _send(self, route: str, body, content_type: str = "text/html; charset=utf-8") -> None:
+        time.sleep(self._latency.get(route, 0.0))
+        STATISTICS.increment(f"stand_in.{route}")
+        if body is None:
+            self.send_error(404)
+            return
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        ...
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path.rstrip("/")
+        if path == "/metrics":
+            body, content_type = STATISTICS.to_prometheus(), self.CONTENT_TYPE
+        elif path == "/metrics.json":
+            body, content_type = json.dumps(STATISTICS.metrics(), ensure_ascii=False), "application/json"
+        else:
+            self.send_error(404)
+            return
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        ...
+
+
+class TaskQueueRequestHandler(BaseHTTPRequestHandler):
+
+    def __init__(self, *args, service: TaskQueueService, token: Optional[str], **kwargs) -> None:
+        self._service = service
+        self._token = token
+        super().__init__(*args, **kwargs)
+
+    def do_POST(self) -> None:
+        if self._token and not hmac.compare_digest(self.headers.get(RemoteTaskQueue.TOKEN_HEADER, ""), self._token):
+            self.send_error(403)
+            return
+        method = urlsplit(self.path).path.strip("/")
+        if not self._service.supports(method=method):
+            self.send_error(404)
+            return
+        try:
+            params = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            result = self._service.call(method=method, params=params)
+        except Exception as error:
+            STATISTICS.increment("task_queue_server.errors")
+            Message.error_message(f"Ошибка обработки запроса к общей очереди. Метод: {method}. Ошибка: {error!r}")
+            self.send_error(500)
+            return
+        body = json.dumps({"result": result}, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        ...
+
+
+class LocalHttpServer:
+
+    def __init__(self, handler: type, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="Local HTTP server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "LocalHttpServer":
+        self._thread.start()
+        Message.info_message(f"Локальный HTTP сервер запущен: {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        Message.info_message("Локальный HTTP сервер остановлен.")
+
+    def __enter__(self) -> "LocalHttpServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+class FixtureHttpServer(LocalHttpServer):
+
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__(handler=partial(FixtureRequestHandler, directory=directory), host=host, port=port)
+
+
+class SearchStubHttpServer(LocalHttpServer):
+
+    def __init__(
+        self,
+        links: List[str],
+        inventors: Optional[Dict[str, List[str]]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.queries: List[Dict[str, List[str]]] = []
+        super().__init__(
+            handler=partial(SearchStubRequestHandler, links=links, inventors=inventors or {}, queries=self.queries),
+            host=host,
+            port=port,
+        )
+
+
+class PatentsStandInServer(LocalHttpServer):
+
+    def __init__(
+        self,
+        fixtures: PatentFixtures,
+        latency: Optional[Dict[str, float]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__(
+            handler=partial(PatentsStandInRequestHandler, fixtures=fixtures, latency=latency or {}),
+            host=host,
+            port=port,
+        )
+
+
+class MetricsHttpServer(LocalHttpServer):
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464) -> None:
+        super().__init__(handler=MetricsRequestHandler, host=host, port=port)
+
+
+class TaskQueueHttpServer(LocalHttpServer):
+
+    def __init__(
+        self,
+        service: TaskQueueService,
+        token: Optional[str] = None,
+        host: str = "0.0.0.0",
+        port: int = 8765,
+    ) -> None:
+        super().__init__(handler=partial(TaskQueueRequestHandler, service=service, token=token), host=host, port=port)
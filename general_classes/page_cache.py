@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS
+
+
+class PageCache:
+    FILE_SUFFIX = ".z"
+    DEFAULT_TTL = 7 * 24 * 60 * 60
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compress_level: int = 6,
+    ) -> None:
+        self._directory = directory
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._compress_level = compress_level
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(self._directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def canonical_url(url: str) -> str:
+        parts = urlsplit(url.strip())
+        path = parts.path.rstrip("/") or "/"
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+    def get(self, url: str) -> Optional[str]:
+        key, path = self._locate(url=url)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            record = json.loads(zlib.decompress(data).decode("utf-8"))
+        except (OSError, ValueError, zlib.error):
+            self._miss(key=key, path=path)
+            return None
+        if time.time() - record["stored_at"] > self._ttl:
+            self._miss(key=key, path=path)
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            ...
+        STATISTICS.increment("cache.hits")
+        STATISTICS.increment("cache.bytes_read", len(data))
+        return record["content"]
+
+    def put(self, url: str, content: str) -> None:
+        key, path = self._locate(url=url)
+        record = {"url": self.canonical_url(url), "stored_at": time.time(), "content": content}
+        data = zlib.compress(json.dumps(record, ensure_ascii=False).encode("utf-8"), self._compress_level)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = f"{path}.{threading.get_ident()}.tmp"
+        with open(part, "wb") as file:
+            file.write(data)
+        os.replace(part, path)
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+        STATISTICS.increment("cache.writes")
+        STATISTICS.increment("cache.bytes_written", len(data))
+        self._evict()
+
+    def report(self) -> None:
+        hits = STATISTICS.get_counter("cache.hits")
+        misses = STATISTICS.get_counter("cache.misses")
+        requests = hits + misses
+        ratio = hits / requests * 100 if requests else 0
+        Message.info_message(
+            f"Кэш страниц: попаданий {hits}, промахов {misses} ({ratio:.1f}% попаданий). "
+            f"Прочитано {STATISTICS.get_counter('cache.bytes_read')} байт, "
+            f"записано {STATISTICS.get_counter('cache.bytes_written')} байт, "
+            f"размер кэша {self._total_bytes} байт."
+        )
+
+    def _locate(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha1(self.canonical_url(url).encode("utf-8")).hexdigest()
+        return key, os.path.join(self._directory, key[:2], f"{key}{self.FILE_SUFFIX}")
+
+    def _miss(self, key: str, path: str) -> None:
+        STATISTICS.increment("cache.misses")
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is None:
+                return
+            self._total_bytes -= size
+        self._remove(path=path)
+
+    def _evict(self) -> None:
+        while True:
+            with self._lock:
+                if self._total_bytes <= self._max_bytes or not self._entries:
+                    return
+                key, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+            self._remove(path=os.path.join(self._directory, key[:2], f"{key}{self.FILE_SUFFIX}"))
+            STATISTICS.increment("cache.evictions")
+
+    def _load_index(self) -> None:
+        files = []
+        for root, _, names in os.walk(self._directory):
+            for name in names:
+                if not name.endswith(self.FILE_SUFFIX):
+                    continue
+                stat = os.stat(os.path.join(root, name))
+                files.append((stat.st_mtime, name[:-len(self.FILE_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        Message.info_message(f"Кэш страниц: {len(self._entries)} записей, {self._total_bytes} байт.")
+        self._evict()
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            ...
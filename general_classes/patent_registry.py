@@ -0,0 +1,70 @@
+import os
+import threading
+from typing import Dict, Optional, Set
+
+from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.statistics import STATISTICS
+from general_classes.type_annotations import State
+
+
+class RegisteredPatent:
+
+    def __init__(self, state: Optional[State], patent_dir: str) -> None:
+        self.state = state
+        self.patent_dir = patent_dir
+
+    @property
+    def accepted(self) -> bool:
+        return self.state is not None
+
+    @property
+    def file_path(self) -> Optional[str]:
+        if not self.state or not self.state.get("path_to_pdf_file"):
+            return None
+        return os.path.join(self.patent_dir, os.path.basename(self.state["path_to_pdf_file"]))
+
+    def state_for(self, patent_dir: str) -> State:
+        state = self.state.copy()
+        if state.get("path_to_pdf_file"):
+            target = os.path.join(patent_dir, os.path.basename(state["path_to_pdf_file"]))
+            state["path_to_pdf_file"] = "/".join(target.split("/")[-3:])
+        return state
+
+
+class PatentRegistry:
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._patents: Dict[str, RegisteredPatent] = {}
+        self._in_progress: Set[str] = set()
+
+    def claim(self, link: str) -> Optional[RegisteredPatent]:
+        key = PageCache.canonical_url(link)
+        with self._condition:
+            while key in self._in_progress:
+                self._condition.wait()
+            if key in self._patents:
+                STATISTICS.increment("registry.reused")
+                return self._patents[key]
+            self._in_progress.add(key)
+            return None
+
+    def complete(self, link: str, state: Optional[State], patent_dir: str) -> RegisteredPatent:
+        key = PageCache.canonical_url(link)
+        with self._condition:
+            self._in_progress.discard(key)
+            patent = self._patents.setdefault(key, RegisteredPatent(state=state, patent_dir=patent_dir))
+            self._condition.notify_all()
+        STATISTICS.increment("registry.parsed")
+        return patent
+
+    def abandon(self, link: str) -> None:
+        with self._condition:
+            self._in_progress.discard(PageCache.canonical_url(link))
+            self._condition.notify_all()
+
+    def report(self) -> None:
+        parsed = STATISTICS.get_counter("registry.parsed")
+        reused = STATISTICS.get_counter("registry.reused")
+        Message.info_message(f"Реестр патентов: разобрано уникальных патентов {parsed}, переиспользовано {reused}.")
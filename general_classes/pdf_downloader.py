@@ -0,0 +1,174 @@
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Optional, Tuple, List, Set
+
+from urllib3.exceptions import HTTPError
+from urllib3.response import HTTPResponse
+
+from general_classes.http_client import HttpClient
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS
+
+
+class PdfDownloadError(Exception):
+    ...
+
+
+def link_or_copy(source: str, target: str) -> None:
+    if os.path.exists(target):
+        return
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class PdfDownloadManager:
+    CHUNK_SIZE = 64 * 1024
+    PART_SUFFIX = ".part"
+    CONTENT_RANGE_REGEX = re.compile(r"bytes (\d+)-\d+/(\d+)")
+
+    def __init__(self, client: HttpClient, max_workers: int = 4, max_attempts: int = 3) -> None:
+        self._client = client
+        self._max_attempts = max_attempts
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="PDF")
+        self._lock = threading.Lock()
+        self._by_url: Dict[str, Future] = {}
+        self._by_target: Dict[str, Future] = {}
+        self._failed_targets: Set[str] = set()
+
+    def submit(self, url: str, target: str) -> Future:
+        with self._lock:
+            if target in self._by_target:
+                return self._by_target[target]
+            self._failed_targets.discard(target)
+            source = self._by_url.get(url)
+            if source is None:
+                future = self._executor.submit(self._download, url, target)
+                self._by_url[url] = future
+            else:
+                future = Future()
+            self._by_target[target] = future
+        if source is not None:
+            # A finished source runs the callback right here, and _link_to_target may take the lock.
+            source.add_done_callback(lambda done: self._link_to_target(done, future, target))
+        return future
+
+    def wait(self) -> None:
+        with self._lock:
+            futures = list(self._by_target.values())
+            failed = len(self._failed_targets)
+        Message.info_message(f"Ожидание завершения скачивания pdf файлов: {len(futures)}")
+        for future in futures:
+            try:
+                path = future.result()
+            except Exception as error:
+                Message.warning_message(f"Ошибка в задаче скачивания pdf файла: {error!r}")
+                path = None
+            failed += path is None
+        if failed:
+            Message.warning_message(f"Не удалось скачать pdf файлов: {failed}")
+
+    def futures_under(self, directory: str) -> List[Future]:
+        prefix = os.path.join(os.path.normpath(directory), "")
+        with self._lock:
+            return [future for target, future in self._by_target.items() if target.startswith(prefix)]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "PdfDownloadManager":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _download(self, url: str, target: str) -> Optional[str]:
+        try:
+            path = self._download_with_retries(url=url, target=target)
+        except Exception as error:
+            STATISTICS.increment("pdf.failures")
+            Message.error_message(f"Pdf файл не скачен. URL: {url}. Ошибка: {error!r}")
+            path = None
+        if path is None:
+            self._forget_failed(target=target, url=url)
+        return path
+
+    def _download_with_retries(self, url: str, target: str) -> Optional[str]:
+        part = f"{target}{self.PART_SUFFIX}"
+        started_at = time.monotonic()
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                self._download_part(url=url, part=part)
+            except (PdfDownloadError, HTTPError, OSError) as error:
+                Message.warning_message(
+                    f"Ошибка скачивания pdf файла. Попытка {attempt}/{self._max_attempts}. URL: {url}. Ошибка: {error}"
+                )
+                continue
+            os.replace(part, target)
+            STATISTICS.increment("pdf.downloads")
+            STATISTICS.observe("pdf.download", time.monotonic() - started_at)
+            Message.success_message(f"Файл успешно скачен. Путь: {target}")
+            return target
+        STATISTICS.increment("pdf.failures")
+        Message.error_message(f"Pdf файл не скачен. URL: {url}")
+        return None
+
+    def _download_part(self, url: str, part: str) -> None:
+        offset = os.path.getsize(part) if os.path.isfile(part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        response = self._client.open_stream(url=url, headers=headers)
+        if response is None:
+            raise PdfDownloadError("нет ответа сервера")
+        try:
+            if response.status == 416:
+                os.remove(part)
+                raise PdfDownloadError("частичный файл не совпадает с сервером")
+            offset, expected = self._expected_size(response=response, offset=offset)
+            if offset:
+                STATISTICS.increment("pdf.resumed")
+            mode = "ab" if offset else "wb"
+            with open(part, mode) as file:
+                for chunk in response.stream(self.CHUNK_SIZE):
+                    file.write(chunk)
+                    STATISTICS.increment("pdf.bytes", len(chunk))
+        finally:
+            response.release_conn()
+        size = os.path.getsize(part)
+        if expected is not None and size != expected:
+            raise PdfDownloadError(f"размер файла {size} байт, ожидалось {expected} байт")
+
+    def _expected_size(self, response: HTTPResponse, offset: int) -> Tuple[int, Optional[int]]:
+        if response.status == 206:
+            match = self.CONTENT_RANGE_REGEX.match(response.headers.get("Content-Range", ""))
+            if match is None or int(match.group(1)) != offset:
+                raise PdfDownloadError("неверный заголовок Content-Range")
+            return offset, int(match.group(2))
+        if response.status != 200:
+            raise PdfDownloadError(f"неверный статус ответа: {response.status}")
+        length = response.headers.get("Content-Length")
+        return 0, int(length) if length is not None else None
+
+    def _forget_failed(self, target: str, url: Optional[str] = None) -> None:
+        with self._lock:
+            if self._by_target.pop(target, None) is not None:
+                self._failed_targets.add(target)
+            if url is not None:
+                self._by_url.pop(url, None)
+
+    def _link_to_target(self, source: Future, future: Future, target: str) -> None:
+        try:
+            path = source.result()
+            if path is not None:
+                link_or_copy(source=path, target=target)
+                STATISTICS.increment("pdf.linked")
+        except Exception as error:
+            Message.warning_message(f"Не удалось скопировать pdf файл. Путь: {target}. Ошибка: {error!r}")
+            path = None
+        if path is None:
+            self._forget_failed(target=target)
+        future.set_result(target if path is not None else None)
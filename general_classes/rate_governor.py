@@ -0,0 +1,147 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS
+
+
+class RemotePermits(ABC):
+
+    @abstractmethod
+    def reserve_permit(self) -> float:
+        ...
+
+    @abstractmethod
+    def report_rate(self, elapsed: Optional[float] = None, failure: Optional[str] = None) -> float:
+        ...
+
+
+class RateGovernor:
+    DEFAULT_HOSTS = ("patents.google.com",)
+
+    def __init__(self, requests_per_second: float = 2.0, **settings) -> None:
+        self._lock = threading.Lock()
+        self._activity: Dict[int, float] = {}
+        self._remote: Optional[RemotePermits] = None
+        self.configure(requests_per_second=requests_per_second, **settings)
+
+    def configure(
+        self,
+        requests_per_second: float,
+        min_rate: float = 0.2,
+        max_rate: float = 8.0,
+        burst: int = 4,
+        slow_response: float = 8.0,
+        increase_step: float = 0.1,
+        decrease_factor: float = 0.5,
+        hosts: Tuple[str, ...] = DEFAULT_HOSTS,
+    ) -> None:
+        with self._lock:
+            self._rate = requests_per_second
+            self._min_rate = min_rate
+            self._max_rate = max(max_rate, requests_per_second)
+            self._burst = burst
+            self._slow_response = slow_response
+            self._increase_step = increase_step
+            self._decrease_factor = decrease_factor
+            self._hosts = hosts
+            self._tokens = float(burst)
+            self._updated_at = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        with self._lock:
+            return self._rate
+
+    def governs(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        return any(host == governed or host.endswith(f".{governed}") for governed in self._hosts)
+
+    def last_activity(self, thread_id: int) -> float:
+        return self._activity.get(thread_id, 0.0)
+
+    def attach(self, remote: Optional[RemotePermits]) -> None:
+        self._remote = remote
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self._rate)
+
+    def acquire(self) -> None:
+        self._activity[threading.get_ident()] = time.monotonic()
+        delay = self._reserve()
+        if delay > 0:
+            STATISTICS.add_time("governor.waited", delay)
+            time.sleep(delay)
+
+    def run(self, load: Callable[[], bool], failure_reason: str) -> bool:
+        self.acquire()
+        started_at = time.monotonic()
+        try:
+            succeeded = load()
+        except Exception:
+            self.report_failure(reason=failure_reason)
+            raise
+        if succeeded:
+            self.report_response(elapsed=time.monotonic() - started_at)
+        else:
+            self.report_failure(reason=failure_reason)
+        return succeeded
+
+    def report_response(self, elapsed: float) -> None:
+        self._activity[threading.get_ident()] = time.monotonic()
+        if self._remote is not None:
+            self._report_remote(elapsed=elapsed)
+            return
+        if elapsed > self._slow_response:
+            self.report_failure(reason=f"медленный ответ {elapsed:.1f} сек.")
+        else:
+            self.report_success()
+
+    def report_success(self) -> None:
+        with self._lock:
+            self._rate = min(self._max_rate, self._rate + self._increase_step)
+
+    def report_failure(self, reason: str) -> None:
+        rate = self._report_remote(failure=reason) if self._remote is not None else None
+        if rate is None:
+            with self._lock:
+                self._rate = max(self._min_rate, self._rate * self._decrease_factor)
+                self._tokens = min(self._tokens, 0.0)
+                rate = self._rate
+        STATISTICS.increment("governor.backoffs")
+        Message.warning_message(f"Снижение частоты запросов до {rate:.2f} в сек. Причина: {reason}")
+
+    def _reserve(self) -> float:
+        if self._remote is None:
+            return self.reserve()
+        try:
+            return self._remote.reserve_permit()
+        except Exception as error:
+            STATISTICS.increment("governor.remote_errors")
+            Message.warning_message(f"Общий ограничитель частоты недоступен, используется локальный. Ошибка: {error!r}")
+            return self.reserve()
+
+    def _report_remote(self, elapsed: Optional[float] = None, failure: Optional[str] = None) -> Optional[float]:
+        try:
+            return self._remote.report_rate(elapsed=elapsed, failure=failure)
+        except Exception as error:
+            STATISTICS.increment("governor.remote_errors")
+            Message.warning_message(f"Не удалось передать ответ общему ограничителю частоты. Ошибка: {error!r}")
+            return None
+
+    def report(self) -> None:
+        Message.info_message(
+            f"Частота запросов: {self.rate:.2f} в сек. Снижений частоты: {STATISTICS.get_counter('governor.backoffs')}. "
+            f"Ожидание ограничителя: {STATISTICS.get_time('governor.waited'):.2f} сек."
+        )
+
+
+RATE_GOVERNOR = RateGovernor()
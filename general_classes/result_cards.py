@@ -0,0 +1,95 @@
+import html
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+from general_classes.type_annotations import PatentCard
+
+PDF_BASE_URL = "https://patentimages.storage.googleapis.com/"
+
+
+class ResultCardReader:
+    TAG_REGEX = re.compile(r"<[^>]+>")
+    DATE_REGEX = re.compile(r"(Priority|Filed|Published|Granted)\s+(\d{4}-\d{2}-\d{2})")
+    LANGUAGE_REGEX = re.compile(r"^[A-Z]{2}$")
+    NAMES_SEPARATOR = ","
+    TRUNCATION_MARKS = ("...", "…")
+    CORPORATE_SUFFIX_REGEX = re.compile(
+        r"^(inc|ltd|llc|llp|lp|co|corp|plc|gmbh|ag|sa|s\.a|nv|bv|kk|limited|corporation|company)\.?$",
+        re.IGNORECASE,
+    )
+
+    @classmethod
+    def from_api(cls, result: Dict[str, Any]) -> Optional[PatentCard]:
+        patent = result.get("patent")
+        if not patent:
+            return None
+        inventors, truncated = cls._split_names(value=cls._clean(patent.get("inventor")))
+        return PatentCard(
+            title=cls._clean(patent.get("title")),
+            patent_code=cls._clean(patent.get("publication_number")),
+            priority_date=cls._convert_date(date=patent.get("priority_date")),
+            publication_date=cls._convert_date(date=patent.get("publication_date")),
+            original_assignee=cls._split_assignees(value=cls._clean(patent.get("assignee"))),
+            inventors=inventors,
+            inventors_truncated=truncated,
+            pdf_link=f"{PDF_BASE_URL}{patent['pdf']}" if patent.get("pdf") else None,
+        )
+
+    @classmethod
+    def from_script(cls, raw: Dict[str, Any]) -> PatentCard:
+        metadata = [cls._clean(value) for value in raw.get("metadata") or []]
+        metadata = [value for value in metadata if value and not cls.LANGUAGE_REGEX.match(value)]
+        dates = dict(cls.DATE_REGEX.findall(raw.get("dates") or ""))
+        inventors, truncated = cls._split_names(value=metadata[1] if len(metadata) > 1 else None)
+        return PatentCard(
+            title=cls._clean(raw.get("title")),
+            patent_code=metadata[0] if metadata else None,
+            priority_date=cls._convert_date(date=dates.get("Priority")),
+            publication_date=cls._convert_date(date=dates.get("Published") or dates.get("Granted")),
+            original_assignee=cls._split_assignees(value=metadata[2] if len(metadata) > 2 else None),
+            inventors=inventors,
+            inventors_truncated=truncated,
+            pdf_link=None,
+        )
+
+    @classmethod
+    def _split_names(cls, value: Optional[str]) -> Tuple[Optional[List[str]], bool]:
+        if not value:
+            return None, False
+        truncated = value.endswith(cls.TRUNCATION_MARKS)
+        for mark in cls.TRUNCATION_MARKS:
+            if value.endswith(mark):
+                value = value[:-len(mark)]
+        names = [" ".join(name.split()) for name in value.split(cls.NAMES_SEPARATOR)]
+        return [name for name in names if name], truncated
+
+    @classmethod
+    def _split_assignees(cls, value: Optional[str]) -> Optional[List[str]]:
+        names, _ = cls._split_names(value=value)
+        if not names:
+            return None
+        assignees = []
+        for name in names:
+            if assignees and cls.CORPORATE_SUFFIX_REGEX.match(name):
+                assignees[-1] = f"{assignees[-1]}, {name}"
+            else:
+                assignees.append(name)
+        return assignees
+
+    @classmethod
+    def _clean(cls, value: Optional[str]) -> Optional[str]:
+        if not value:
+            return None
+        return " ".join(html.unescape(cls.TAG_REGEX.sub("", value)).split()) or None
+
+    @staticmethod
+    def _convert_date(date: Optional[str]) -> Optional[str]:
+        if not date:
+            return None
+        for date_format in ("%Y-%m-%d", "%Y%m%d"):
+            try:
+                return datetime.strptime(date, date_format).strftime("%d.%m.%Y")
+            except ValueError:
+                continue
+        return None
@@ -0,0 +1,202 @@
+import csv
+import json
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Iterable, Iterator, Tuple
+
+from general_classes.enums import ResultFormatEnum
+from general_classes.file_services import StreamingXlsxWriter, ConsolidatedXlsxWriter
+from general_classes.logger import Message
+from general_classes.type_annotations import State
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+STATE_FIELDS = list(State.__annotations__)
+LIST_FIELDS = ("current_assignee", "inventors")
+BOOL_FIELDS = ("classification_codes_partial",)
+
+
+class ResultSink(ABC):
+
+    @abstractmethod
+    def append(self, state: State) -> None:
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+    def extend(self, states: Iterable[State]) -> None:
+        for state in states:
+            self.append(state=state)
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class XlsxResultSink(ResultSink):
+
+    def __init__(self, directory: str) -> None:
+        self._writer = StreamingXlsxWriter(directory=directory)
+
+    def append(self, state: State) -> None:
+        self._writer.append(state=state)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class JsonlResultSink(ResultSink):
+    FILE_NAME = "patents.jsonl"
+
+    def __init__(self, directory: str) -> None:
+        self._lock = threading.Lock()
+        self._file = open(os.path.join(directory, self.FILE_NAME), "w", encoding="utf-8")
+
+    @classmethod
+    def read(cls, directory: str) -> Iterator[State]:
+        path = os.path.join(directory, cls.FILE_NAME)
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield State(**json.loads(line))
+
+    def append(self, state: State) -> None:
+        line = json.dumps({field: state.get(field) for field in STATE_FIELDS}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(f"{line}\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class CsvResultSink(ResultSink):
+    FILE_NAME = "patents.csv"
+    LIST_SEPARATOR = "; "
+
+    def __init__(self, directory: str) -> None:
+        self._lock = threading.Lock()
+        self._file = open(os.path.join(directory, self.FILE_NAME), "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=STATE_FIELDS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def append(self, state: State) -> None:
+        row = {
+            field: self.LIST_SEPARATOR.join(state.get(field) or []) if field in LIST_FIELDS else state.get(field, "")
+            for field in STATE_FIELDS
+        }
+        with self._lock:
+            self._writer.writerow(row)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class ParquetResultSink(ResultSink):
+    FILE_NAME = "patents.parquet"
+    BATCH_SIZE = 1000
+
+    def __init__(self, directory: str, batch_size: int = BATCH_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._batch_size = batch_size
+        self._batch: List[State] = []
+        self._schema = pyarrow.schema([(field, self._field_type(field=field)) for field in STATE_FIELDS])
+        self._writer = pyarrow.parquet.ParquetWriter(os.path.join(directory, self.FILE_NAME), self._schema)
+
+    @staticmethod
+    def _field_type(field: str) -> "pyarrow.DataType":
+        if field in LIST_FIELDS:
+            return pyarrow.list_(pyarrow.string())
+        if field in BOOL_FIELDS:
+            return pyarrow.bool_()
+        return pyarrow.string()
+
+    def append(self, state: State) -> None:
+        with self._lock:
+            self._batch.append(state)
+            if len(self._batch) >= self._batch_size:
+                self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._writer.close()
+
+    def _flush(self) -> None:
+        if not self._batch:
+            return
+        columns = {field: [state.get(field) for state in self._batch] for field in STATE_FIELDS}
+        self._writer.write_table(pyarrow.Table.from_pydict(columns, schema=self._schema))
+        self._batch.clear()
+
+
+class ConsolidatedResultSink(ResultSink):
+
+    def __init__(self, writer: ConsolidatedXlsxWriter, author: str) -> None:
+        self._writer = writer
+        self._author = author
+
+    def append(self, state: State) -> None:
+        self._writer.append(author=self._author, states=[state])
+
+    def close(self) -> None:
+        pass
+
+
+class CompositeResultSink(ResultSink):
+
+    def __init__(self, sinks: List[ResultSink]) -> None:
+        self._sinks = sinks
+
+    def append(self, state: State) -> None:
+        for sink in self._sinks:
+            sink.append(state=state)
+
+    def close(self) -> None:
+        for sink in self._sinks:
+            sink.close()
+
+
+SINKS = {
+    ResultFormatEnum.XLSX: XlsxResultSink,
+    ResultFormatEnum.JSONL: JsonlResultSink,
+    ResultFormatEnum.CSV: CsvResultSink,
+    ResultFormatEnum.PARQUET: ParquetResultSink,
+}
+
+
+def parse_result_formats(argv: List[str], default: Tuple[ResultFormatEnum, ...]) -> Tuple[ResultFormatEnum, ...]:
+    prefix = "--formats="
+    values = [argument[len(prefix):] for argument in argv if argument.startswith(prefix)]
+    if not values:
+        return default
+    formats = []
+    for value in filter(None, (value.strip() for value in values[-1].split(","))):
+        try:
+            result_format = ResultFormatEnum(value.lower())
+        except ValueError:
+            Message.error_message(f"Неизвестный формат результата: {value}")
+            sys.exit(1)
+        if result_format == ResultFormatEnum.PARQUET and pyarrow is None:
+            Message.error_message("Запрошен формат parquet, но пакет pyarrow не установлен (pip install pyarrow).")
+            sys.exit(1)
+        formats.append(result_format)
+    return tuple(formats) or default
+
+
+def create_result_sink(directory: str, formats: Iterable[ResultFormatEnum]) -> CompositeResultSink:
+    return CompositeResultSink(sinks=[SINKS[result_format](directory=directory) for result_format in formats])
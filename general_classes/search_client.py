@@ -0,0 +1,83 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+from urllib.parse import quote, urlsplit, urljoin
+
+from general_classes.http_client import HttpClient
+from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.result_cards import ResultCardReader
+from general_classes.statistics import STATISTICS
+
+
+class PatentsSearchClient:
+    BASE_URL = "https://patents.google.com/"
+    QUERY_PATH = "xhr/query"
+    RESULTS_PER_PAGE = 100
+
+    def __init__(
+        self,
+        client: HttpClient,
+        base_url: str = BASE_URL,
+        max_workers: int = 4,
+        page_cache: Optional[PageCache] = None,
+    ) -> None:
+        self._client = client
+        self._page_cache = page_cache
+        self._base_url = base_url
+        self._max_workers = max_workers
+
+    @staticmethod
+    def build_query(request: str) -> str:
+        return f"q={quote(request)}"
+
+    @staticmethod
+    def query_from_link(link: str) -> str:
+        return urlsplit(link).query
+
+    def collect_links(self, query: str) -> Optional[List[Dict]]:
+        first_page = self._fetch_page(query=query, page=0)
+        if first_page is None:
+            return None
+        total_pages = first_page.get("total_num_pages", 1)
+        Message.info_message(
+            f"Всего результатов по API: {first_page.get('total_num_results', 0)}. Страниц: {total_pages}"
+        )
+        pages = [first_page]
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                pages.extend(executor.map(lambda page: self._fetch_page(query=query, page=page), range(1, total_pages)))
+        if any(page is None for page in pages):
+            Message.warning_message("Не все страницы результатов получены по API.")
+            return None
+        links = [
+            {"link": result["id"], "card": ResultCardReader.from_api(result=result)}
+            for page in pages
+            for result in self._iter_results(page=page)
+        ]
+        STATISTICS.increment("cards.collected", sum(1 for link in links if link["card"] is not None))
+        Message.info_message(f"Получено ссылок по API: {len(links)}")
+        return links
+
+    def _fetch_page(self, query: str, page: int) -> Optional[Dict]:
+        url_param = quote(f"{query}&num={self.RESULTS_PER_PAGE}&page={page}", safe="")
+        url = urljoin(self._base_url, f"{self.QUERY_PATH}?url={url_param}&exp=")
+        if self._page_cache is not None:
+            cached = self._page_cache.get(url=url)
+            if cached is not None:
+                return json.loads(cached)
+        response = self._client.get_json(url=url)
+        if response is None or "results" not in response:
+            return None
+        if self._page_cache is not None:
+            self._page_cache.put(url=url, content=json.dumps(response["results"]))
+        return response["results"]
+
+    @staticmethod
+    def _iter_results(page: Dict) -> List[Dict]:
+        return [
+            result
+            for cluster in page.get("cluster", [])
+            for result in cluster.get("result", [])
+            if result.get("id")
+        ]
@@ -0,0 +1,245 @@
+import json
+import os
+import re
+from typing import Optional, List
+from urllib.parse import urlsplit
+
+from selenium.webdriver.common.by import By
+
+from general_classes.browser_scripts import EXTRACT_PATENT_PAGE, EXPAND_CLASSIFICATIONS, SCRIPT_XPATHS, COUNT_KEYWORDS
+from general_classes.enums import (
+    ExtractionModeEnum, KeywordCountModeEnum, ClassificationDecisionEnum, XpathIdElements,
+)
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.html_extractor import PatentHtmlExtractor
+from general_classes.keyword_scorer import KeywordScore, KeywordScorer
+from general_classes.http_client import HttpPageFetcher
+from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.statistics import STATISTICS
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.type_annotations import PatentPage
+
+
+class StaticPageParserMixin:
+    STATIC_FIELDS = (
+        ("title", "_find_title"),
+        ("patent_code", "_find_patent_code"),
+        ("country", "_find_country"),
+        ("priority_date", "_find_priority_date"),
+        ("publication_date", "_find_publication_date"),
+        ("abstract", "_find_abstract"),
+    )
+    PAGE_FIELDS = (
+        "title", "patent_code", "classification_codes", "current_assignee",
+        "inventors", "country", "priority_date", "publication_date", "abstract", "pdf_link",
+    )
+    # The "View more classifications" list is only expanded when the visible codes cannot decide the
+    # patent; set this to expand accepted patents too when the output needs the full code list.
+    EXPAND_ACCEPTED_CLASSIFICATIONS = False
+    PATENT_CODE_REGEX = re.compile(r"/patent/([A-Z]{2}[A-Z0-9]+)(?:/|$)")
+    _extractor = PatentHtmlExtractor()
+
+    def _init_static_parser(
+        self,
+        fetcher: Optional[HttpPageFetcher] = None,
+        extraction_mode: ExtractionModeEnum = ExtractionModeEnum.ELEMENTS,
+        downloader: Optional[PdfDownloadManager] = None,
+        page_cache: Optional[PageCache] = None,
+        classification_matcher: Optional[ClassificationMatcher] = None,
+        keyword_scorer: Optional[KeywordScorer] = None,
+        keyword_count_mode: KeywordCountModeEnum = KeywordCountModeEnum.BROWSER,
+    ) -> None:
+        self._fetcher = fetcher
+        self._extraction_mode = extraction_mode
+        self._downloader = downloader
+        self._page_cache = page_cache
+        self._classification_matcher = classification_matcher
+        self._keyword_scorer = keyword_scorer
+        self._keyword_count_mode = keyword_count_mode
+        self._opened_link = ""
+        self._partial_page = False
+        self._script_extracted = False
+
+    def _load_page(self, link: str) -> Optional[PatentPage]:
+        self._opened_link = ""
+        self._partial_page = False
+        self._script_extracted = False
+        self._state["classification_codes_partial"] = False
+        page = self._load_cached_page(link=link)
+        if page is None:
+            page = self._fetch_static_page(link=link)
+        if page is not None:
+            self._complete_page(page=page, link=link)
+        if self._extraction_mode != ExtractionModeEnum.SCRIPT:
+            return page
+        if page is None:
+            page = self._extract_page_with_script(link=link)
+            self._complete_page(page=page, link=link)
+            return page
+        missing = [field for field in self.PAGE_FIELDS if page.get(field) is None]
+        if not missing:
+            STATISTICS.increment("extraction.static")
+            return page
+        STATISTICS.increment("extraction.script_fallbacks")
+        Message.info_message(f"В HTML нет полей {', '.join(missing)}, они извлекаются скриптом. URL: {link}")
+        script_page = self._extract_page_with_script(link=link)
+        for field in missing:
+            page[field] = script_page[field]
+        return page
+
+    def _complete_page(self, page: PatentPage, link: str) -> None:
+        # Parsers with other sources for missing fields (e.g. search result cards) extend this hook.
+        if page.get("patent_code") is not None:
+            return
+        match = self.PATENT_CODE_REGEX.search(urlsplit(link).path)
+        if match is not None:
+            page["patent_code"] = match.group(1)
+            STATISTICS.increment("extraction.fields_from_link")
+
+    def _fetch_static_page(self, link: str) -> Optional[PatentPage]:
+        if self._fetcher is None:
+            return None
+        html = self._fetcher.fetch(url=link)
+        if html is None:
+            Message.warning_message(f"Статическая страница не получена, используется браузер. URL: {link}")
+            return None
+        self._store_page(link=link, html=html)
+        return self._extractor.extract(html=html, url=link)
+
+    def _load_cached_page(self, link: str) -> Optional[PatentPage]:
+        if self._page_cache is None:
+            return None
+        html = self._page_cache.get(url=link)
+        if html is None:
+            return None
+        Message.info_message(f"Страница получена из кэша. URL: {link}")
+        return self._extractor.extract(html=html, url=link)
+
+    def _store_page(self, link: str, html: str) -> None:
+        if self._page_cache is not None:
+            self._page_cache.put(url=link, content=html)
+
+    def _store_browser_page(self, link: str) -> None:
+        if self._page_cache is None:
+            return
+        if self._partial_page:
+            STATISTICS.increment("cache.partial_pages_skipped")
+            Message.info_message(f"Список классификаторов не раскрыт, страница в кэш не записана. URL: {link}")
+            return
+        self._store_page(link=link, html=self._driver.page_source)
+
+    def _extract_page_with_script(self, link: str) -> PatentPage:
+        self._follow_the_link(link=link)
+        self._opened_link = link
+        self._script_extracted = True
+        STATISTICS.increment("extraction.script")
+        lazy = self._classification_matcher is not None
+        result = self._driver.execute_async_script(EXTRACT_PATENT_PAGE, SCRIPT_XPATHS, not lazy)
+        if lazy:
+            decision = self._classification_matcher.decide(codes=result["classification_codes"] or [])
+            if not self._skip_expansion(decision=decision):
+                result.update(self._driver.execute_async_script(EXPAND_CLASSIFICATIONS, SCRIPT_XPATHS))
+        if result["more_button"] is False:
+            Message.warning_message(f'Кнопка "View more classifications" не найдена. URL: {link}')
+        self._store_browser_page(link=link)
+        return self._extractor.from_script_result(result=result)
+
+    def _parse_static_page(self, page: PatentPage, patent_dir: str) -> None:
+        # After the in-page script has run, a missing field is really absent from the page,
+        # so it is not looked up again element by element.
+        extracted = self._script_extracted
+        codes = page["classification_codes"]
+        if codes is None and not extracted:
+            self._open_in_browser()
+            if not self._decided_by_visible_codes():
+                self._click_to_more_button()
+            self._find_classification_codes()
+        else:
+            self._save_static_codes(codes=codes or [], text=page["text"])
+
+        for field, finder in self.STATIC_FIELDS:
+            if page[field] is None and not extracted:
+                self._open_in_browser()
+                getattr(self, finder)()
+            else:
+                self._state[field] = page[field] if page[field] is not None else ""
+
+        if page["inventors"] is None and not extracted:
+            self._open_in_browser()
+            self._parse_people_section()
+        else:
+            self._state["current_assignee"] = page["current_assignee"] or []
+            self._state["inventors"] = page["inventors"] or []
+
+        if page["pdf_link"] is None and not extracted:
+            self._open_in_browser()
+            self._download_pdf_file(patent_dir=patent_dir)
+        else:
+            Message.info_message("Скачивание pdf файла...")
+            self._save_pdf_file(link=page["pdf_link"], patent_dir=patent_dir)
+
+        source = "браузер" if self._opened_link else "HTML"
+        Message.success_message(f"Патент разобран. Источник: {source}. URL: {self._state['link']}")
+
+    def _decided_by_visible_codes(self) -> bool:
+        if self._classification_matcher is None:
+            return False
+        codes = [element.text for element in self._find_elements(element=XpathIdElements.classification_element_codes)]
+        decision = self._classification_matcher.decide(codes=[code for code in codes if code])
+        if not self._skip_expansion(decision=decision):
+            return False
+        Message.info_message(f"Видимых классификаторов достаточно ({decision.value}), раскрытие списка пропущено")
+        return True
+
+    def _skip_expansion(self, decision: ClassificationDecisionEnum) -> bool:
+        skip = decision == ClassificationDecisionEnum.REJECT or (
+            decision == ClassificationDecisionEnum.ACCEPT and not self.EXPAND_ACCEPTED_CLASSIFICATIONS
+        )
+        if not skip:
+            STATISTICS.increment("classification.expansions")
+            return False
+        STATISTICS.increment("classification.expansions_avoided")
+        self._partial_page = True
+        self._state["classification_codes_partial"] = True
+        return True
+
+    def _save_static_codes(self, codes: List[str], text: Optional[str]) -> None:
+        self._state["classification_codes"] = ", ".join(codes)
+        Message.success_message("Кода патентного классификатора сохранены.")
+
+    def _schedule_pdf_download(self, link: str, patent_dir: str) -> str:
+        target = os.path.join(patent_dir, os.path.basename(urlsplit(link).path))
+        self._downloader.submit(url=link, target=target)
+        Message.success_message("Pdf файл поставлен в очередь на скачивание.")
+        return target
+
+    def _score_keywords(self, page_text: Optional[str]) -> KeywordScore:
+        if page_text is not None or not self._keyword_scorer.enabled:
+            return self._keyword_scorer.score(text=page_text or "")
+        if self._keyword_count_mode == KeywordCountModeEnum.BROWSER:
+            return self._score_keywords_in_browser()
+        html = self._driver.find_element(by=By.TAG_NAME, value="html").text
+        return self._keyword_scorer.score(text=html)
+
+    def _score_keywords_in_browser(self, with_offsets: bool = False) -> KeywordScore:
+        result = self._driver.execute_script(
+            COUNT_KEYWORDS,
+            self._keyword_scorer.script_patterns(),
+            self._keyword_scorer.threshold,
+            True,
+            with_offsets,
+        )
+        transferred = len(json.dumps(result))
+        STATISTICS.increment("keywords.browser_counts")
+        STATISTICS.increment("keywords.bytes_transferred", transferred)
+        STATISTICS.increment("keywords.bytes_saved", max(result["text_length"] - transferred, 0))
+        return self._keyword_scorer.from_script_result(result=result)
+
+    def _open_in_browser(self) -> None:
+        STATISTICS.increment("extraction.element_lookups")
+        link = self._state["link"]
+        if self._opened_link != link:
+            Message.warning_message(f"На странице нет всех полей, открываю браузер. URL: {link}")
+            self._follow_the_link(link=link)
+            self._opened_link = link
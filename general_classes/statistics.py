@@ -0,0 +1,200 @@
+import json
+import os
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from general_classes.logger import Message
+
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+
+    def __init__(self, buckets: tuple = HISTOGRAM_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[int]:
+        result, total = [], 0
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip([str(bucket) for bucket in self.buckets] + ["+Inf"], self.cumulative())),
+        }
+
+
+class RunStatistics:
+    PROMETHEUS_PREFIX = "patents_"
+    PROMETHEUS_NAME_REGEX = re.compile(r"[^a-zA-Z0-9_]")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._timings = defaultdict(float)
+        self._maxima = defaultdict(int)
+        self._histograms: Dict[str, Dict[Tuple[Tuple[str, str], ...], Histogram]] = defaultdict(dict)
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._timings[name] += seconds
+
+    def set_max(self, name: str, value: int) -> None:
+        with self._lock:
+            self._maxima[name] = max(self._maxima[name], value)
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None) -> None:
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            histograms = self._histograms[name]
+            if key not in histograms:
+                histograms[key] = Histogram()
+            histograms[key].observe(seconds)
+
+    def register_gauge(self, name: str, callback: Callable[[], float]) -> None:
+        with self._lock:
+            self._gauges[name] = callback
+
+    def get_counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def get_max(self, name: str) -> int:
+        with self._lock:
+            return self._maxima.get(name, 0)
+
+    def get_time(self, name: str) -> float:
+        with self._lock:
+            return self._timings.get(name, 0.0)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {"counters": dict(self._counters), "timings": dict(self._timings), "maxima": dict(self._maxima)}
+
+    def metrics(self) -> Dict[str, Dict]:
+        with self._lock:
+            metrics = {
+                "counters": dict(self._counters),
+                "timings": dict(self._timings),
+                "maxima": dict(self._maxima),
+                "histograms": {
+                    name: {
+                        self._format_labels(key=key): histogram.to_dict()
+                        for key, histogram in histograms.items()
+                    }
+                    for name, histograms in self._histograms.items()
+                },
+            }
+            gauges = dict(self._gauges)
+        metrics["gauges"] = {name: callback() for name, callback in gauges.items()}
+        return metrics
+
+    def to_prometheus(self) -> str:
+        metrics = self.metrics()
+        lines = []
+        for name, value in sorted(metrics["counters"].items()):
+            metric = self._prometheus_name(name=name, suffix="_total")
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in sorted(metrics["timings"].items()):
+            metric = self._prometheus_name(name=name, suffix="_seconds_total")
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:.6f}"]
+        for name, value in sorted(metrics["maxima"].items()):
+            metric = self._prometheus_name(name=name)
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        for name, value in sorted(metrics["gauges"].items()):
+            metric = self._prometheus_name(name=name)
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        for name, histograms in sorted(metrics["histograms"].items()):
+            metric = self._prometheus_name(name=name, suffix="_seconds")
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, histogram in sorted(histograms.items()):
+                for bucket, count in histogram["buckets"].items():
+                    bucket_labels = f'{labels},le="{bucket}"' if labels else f'le="{bucket}"'
+                    lines.append(f"{metric}_bucket{{{bucket_labels}}} {count}")
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{metric}_sum{suffix} {histogram['sum']:.6f}")
+                lines.append(f"{metric}_count{suffix} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.metrics(), file, ensure_ascii=False, indent=2)
+        Message.info_message(f"Метрики выполнения сохранены. Путь к файлу: {path}")
+
+    def report(self) -> None:
+        snapshot = self.snapshot()
+        if not snapshot["counters"] and not snapshot["timings"] and not snapshot["maxima"]:
+            return
+        Message.info_message("Статистика выполнения:")
+        for name, value in sorted({**snapshot["counters"], **snapshot["maxima"]}.items()):
+            Message.info_message(f"{name}: {value}")
+        for name, value in sorted(snapshot["timings"].items()):
+            Message.info_message(f"{name}: {value:.2f} сек.")
+
+    @classmethod
+    def _format_labels(cls, key: Tuple[Tuple[str, str], ...]) -> str:
+        return ",".join(f'{label}="{cls._escape_label_value(value=str(value))}"' for label, value in key)
+
+    @staticmethod
+    def _escape_label_value(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def _prometheus_name(self, name: str, suffix: str = "") -> str:
+        return f"{self.PROMETHEUS_PREFIX}{self.PROMETHEUS_NAME_REGEX.sub('_', name)}{suffix}"
+
+
+def process_tree_rss(pid: int) -> int:
+    if not os.path.isdir("/proc"):
+        return 0
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as file:
+                parent = int(file.read().rsplit(")", maxsplit=1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[parent].append(int(entry))
+
+    seen: Set[int] = set()
+    stack = [pid]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status", "r") as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+STATISTICS = RunStatistics()
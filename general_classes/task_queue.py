@@ -0,0 +1,464 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import urllib3
+from urllib3.exceptions import HTTPError
+
+from general_classes.enums import JobStatusEnum, LedgerStageEnum
+from general_classes.logger import Message
+from general_classes.rate_governor import RateGovernor, RemotePermits
+
+LeasedTask = Tuple[LedgerStageEnum, str, Any]
+ChildTasks = Dict[LedgerStageEnum, List[Tuple[str, Any]]]
+
+
+class TaskQueueError(Exception):
+    pass
+
+
+class TaskQueue(ABC):
+
+    @abstractmethod
+    def settings(self) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def lease(self, owner: str, visibility_timeout: float) -> Optional[LeasedTask]:
+        ...
+
+    @abstractmethod
+    def extend_lease(self, stage: LedgerStageEnum, key: str, owner: str, visibility_timeout: float) -> bool:
+        ...
+
+    @abstractmethod
+    def complete(
+        self,
+        stage: LedgerStageEnum,
+        key: str,
+        owner: str,
+        result: Any = None,
+        children: Optional[ChildTasks] = None,
+        priorities: Optional[Dict[LedgerStageEnum, int]] = None,
+    ) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, stage: LedgerStageEnum, key: str, owner: str) -> bool:
+        ...
+
+    @abstractmethod
+    def unfinished(self) -> int:
+        ...
+
+    @abstractmethod
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+    def report(self) -> None:
+        for stage, statuses in sorted(self.summary().items()):
+            counts = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+            Message.info_message(f"Общая очередь задач. Этап {stage}: {counts}")
+
+
+# Only the coordinator opens the database, so it has to live on a local disk of the coordinator
+# host: network filesystems (NFS, SMB) do not give reliable SQLite locks. Workers on other hosts
+# reach the queue through TaskQueueHttpServer and RemoteTaskQueue.
+class SqliteTaskQueue(TaskQueue):
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            stage TEXT NOT NULL,
+            key TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL,
+            payload TEXT,
+            result TEXT,
+            lease_owner TEXT,
+            lease_expires REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (stage, key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS tasks_lease ON tasks (status, priority, lease_expires)",
+        """
+        CREATE TABLE IF NOT EXISTS settings (
+            name TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+        """,
+    )
+    BUSY_TIMEOUT = 60.0
+    NETWORK_FILESYSTEMS = ("nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p")
+
+    def __init__(self, path: str, max_attempts: int = 3) -> None:
+        self._path = path
+        self._max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=self.BUSY_TIMEOUT, check_same_thread=False, isolation_level=None
+        )
+        self._warn_if_network_filesystem()
+        self._connection.execute("PRAGMA journal_mode=DELETE")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        for statement in self.SCHEMA:
+            self._connection.execute(statement)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM tasks")
+            self._connection.execute("DELETE FROM settings")
+        Message.info_message(f"Общая очередь задач очищена. Путь: {self._path}")
+
+    def set_settings(self, settings: Dict[str, Any]) -> None:
+        with self._lock, self._transaction():
+            self._connection.executemany(
+                "INSERT INTO settings (name, value) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+                [(name, json.dumps(value)) for name, value in settings.items()],
+            )
+
+    def settings(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._connection.execute("SELECT name, value FROM settings").fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    def put(self, stage: LedgerStageEnum, tasks: Iterable[Tuple[str, Any]], priority: int = 0) -> int:
+        with self._lock, self._transaction():
+            return self._insert(stage=stage, tasks=tasks, priority=priority)
+
+    def lease(self, owner: str, visibility_timeout: float) -> Optional[LeasedTask]:
+        now = time.time()
+        with self._lock, self._transaction():
+            self._connection.execute(
+                "UPDATE tasks SET status = ?, lease_owner = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (JobStatusEnum.FAILED.value, now, JobStatusEnum.IN_PROGRESS.value, now, self._max_attempts),
+            )
+            row = self._connection.execute(
+                "SELECT stage, key, payload FROM tasks "
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                "ORDER BY priority DESC, rowid LIMIT 1",
+                (JobStatusEnum.PENDING.value, JobStatusEnum.IN_PROGRESS.value, now),
+            ).fetchone()
+            if row is None:
+                return None
+            stage, key, payload = row
+            self._connection.execute(
+                "UPDATE tasks SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE stage = ? AND key = ?",
+                (JobStatusEnum.IN_PROGRESS.value, owner, now + visibility_timeout, now, stage, key),
+            )
+        return LedgerStageEnum(stage), key, json.loads(payload)
+
+    def extend_lease(self, stage: LedgerStageEnum, key: str, owner: str, visibility_timeout: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                "WHERE stage = ? AND key = ? AND status = ? AND lease_owner = ?",
+                (now + visibility_timeout, now, stage.value, key, JobStatusEnum.IN_PROGRESS.value, owner),
+            )
+        return bool(cursor.rowcount)
+
+    def complete(
+        self,
+        stage: LedgerStageEnum,
+        key: str,
+        owner: str,
+        result: Any = None,
+        children: Optional[ChildTasks] = None,
+        priorities: Optional[Dict[LedgerStageEnum, int]] = None,
+    ) -> bool:
+        with self._lock, self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE tasks SET status = ?, result = ?, lease_owner = NULL, updated_at = ? "
+                "WHERE stage = ? AND key = ? AND status = ? AND lease_owner = ?",
+                (
+                    JobStatusEnum.DONE.value,
+                    json.dumps(result),
+                    time.time(),
+                    stage.value,
+                    key,
+                    JobStatusEnum.IN_PROGRESS.value,
+                    owner,
+                ),
+            )
+            if not cursor.rowcount:
+                Message.warning_message(f"Аренда задачи истекла, результат отброшен. Этап: {stage.value}. Ключ: {key}")
+                return False
+            for child_stage, tasks in (children or {}).items():
+                self._insert(stage=child_stage, tasks=tasks, priority=(priorities or {}).get(child_stage, 0))
+        return True
+
+    def fail(self, stage: LedgerStageEnum, key: str, owner: str) -> bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, lease_owner = NULL, "
+                "updated_at = ? WHERE stage = ? AND key = ? AND status = ? AND lease_owner = ?",
+                (
+                    self._max_attempts,
+                    JobStatusEnum.FAILED.value,
+                    JobStatusEnum.PENDING.value,
+                    time.time(),
+                    stage.value,
+                    key,
+                    JobStatusEnum.IN_PROGRESS.value,
+                    owner,
+                ),
+            )
+        if not cursor.rowcount:
+            Message.warning_message(f"Аренда задачи истекла, ошибка не учтена. Этап: {stage.value}. Ключ: {key}")
+            return False
+        return True
+
+    def requeue_failed(self) -> int:
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE tasks SET status = ?, attempts = 0, updated_at = ? WHERE status = ?",
+                (JobStatusEnum.PENDING.value, time.time(), JobStatusEnum.FAILED.value),
+            )
+        Message.info_message(f"Возвращено в общую очередь задач с ошибкой: {cursor.rowcount}")
+        return cursor.rowcount
+
+    def unfinished(self) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM tasks WHERE status IN (?, ?)",
+                (JobStatusEnum.PENDING.value, JobStatusEnum.IN_PROGRESS.value),
+            ).fetchone()
+        return row[0]
+
+    def payloads(self, stage: LedgerStageEnum) -> List[Any]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT payload FROM tasks WHERE stage = ? ORDER BY rowid", (stage.value,)
+            ).fetchall()
+        return [json.loads(payload) for payload, in rows]
+
+    def results(self, stage: LedgerStageEnum) -> List[Tuple[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, result FROM tasks WHERE stage = ? AND status = ? ORDER BY rowid",
+                (stage.value, JobStatusEnum.DONE.value),
+            ).fetchall()
+        return [(key, json.loads(result)) for key, result in rows]
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT stage, status, COUNT(*) FROM tasks GROUP BY stage, status"
+            ).fetchall()
+        result = {}
+        for stage, status, count in rows:
+            result.setdefault(stage, {})[status] = count
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _warn_if_network_filesystem(self) -> None:
+        if not os.path.isfile("/proc/mounts"):
+            return
+        directory = os.path.realpath(os.path.dirname(os.path.abspath(self._path)))
+        mount_point, filesystem = "", ""
+        with open("/proc/mounts", "r") as file:
+            for line in file:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                point = parts[1].replace("\\040", " ")
+                inside = directory == point or directory.startswith(point.rstrip("/") + "/")
+                if inside and len(point) > len(mount_point):
+                    mount_point, filesystem = point, parts[2]
+        if filesystem in self.NETWORK_FILESYSTEMS:
+            Message.warning_message(
+                f"Общая очередь задач находится на сетевой файловой системе {filesystem}. "
+                f"Блокировки SQLite на ней ненадёжны, используйте локальный диск. Путь: {self._path}"
+            )
+
+    def _insert(self, stage: LedgerStageEnum, tasks: Iterable[Tuple[str, Any]], priority: int) -> int:
+        now = time.time()
+        cursor = self._connection.executemany(
+            "INSERT OR IGNORE INTO tasks (stage, key, priority, status, payload, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (stage.value, key, priority, JobStatusEnum.PENDING.value, json.dumps(payload), now)
+                for key, payload in tasks
+            ],
+        )
+        return cursor.rowcount
+
+    def _transaction(self) -> "_ImmediateTransaction":
+        return _ImmediateTransaction(connection=self._connection)
+
+
+class _ImmediateTransaction:
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __enter__(self) -> None:
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, *args) -> None:
+        self._connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+
+
+class TaskQueueService:
+
+    def __init__(self, queue: SqliteTaskQueue, governor: RateGovernor) -> None:
+        self._queue = queue
+        self._governor = governor
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "settings": self._queue.settings,
+            "lease": self._lease,
+            "extend_lease": self._extend_lease,
+            "complete": self._complete,
+            "fail": self._fail,
+            "unfinished": self._queue.unfinished,
+            "summary": self._queue.summary,
+            "reserve_permit": self._governor.reserve,
+            "report_rate": self._report_rate,
+        }
+
+    def supports(self, method: str) -> bool:
+        return method in self._methods
+
+    def call(self, method: str, params: Dict[str, Any]) -> Any:
+        return self._methods[method](**params)
+
+    def _lease(self, owner: str, visibility_timeout: float) -> Optional[List]:
+        task = self._queue.lease(owner=owner, visibility_timeout=visibility_timeout)
+        if task is None:
+            return None
+        stage, key, payload = task
+        return [stage.value, key, payload]
+
+    def _extend_lease(self, stage: str, key: str, owner: str, visibility_timeout: float) -> bool:
+        return self._queue.extend_lease(
+            stage=LedgerStageEnum(stage), key=key, owner=owner, visibility_timeout=visibility_timeout
+        )
+
+    def _complete(self, stage: str, key: str, owner: str, result: Any, children: Dict, priorities: Dict) -> bool:
+        return self._queue.complete(
+            stage=LedgerStageEnum(stage),
+            key=key,
+            owner=owner,
+            result=result,
+            children={
+                LedgerStageEnum(child_stage): [tuple(task) for task in tasks]
+                for child_stage, tasks in children.items()
+            },
+            priorities={LedgerStageEnum(child_stage): priority for child_stage, priority in priorities.items()},
+        )
+
+    def _fail(self, stage: str, key: str, owner: str) -> bool:
+        return self._queue.fail(stage=LedgerStageEnum(stage), key=key, owner=owner)
+
+    def _report_rate(self, elapsed: Optional[float] = None, failure: Optional[str] = None) -> float:
+        if failure is not None:
+            self._governor.report_failure(reason=failure)
+        elif elapsed is not None:
+            self._governor.report_response(elapsed=elapsed)
+        return self._governor.rate
+
+
+class RemoteTaskQueue(TaskQueue, RemotePermits):
+    TOKEN_HEADER = "X-Queue-Token"
+
+    def __init__(self, base_url: str, token: Optional[str] = None, pool_size: int = 8, timeout: float = 30.0) -> None:
+        self._base_url = base_url.rstrip("/")
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers[self.TOKEN_HEADER] = token
+        self._pool = urllib3.PoolManager(
+            num_pools=1,
+            maxsize=pool_size,
+            block=True,
+            headers=headers,
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            retries=urllib3.Retry(total=None, connect=5, read=0, status=0, redirect=0, backoff_factor=1.0),
+        )
+
+    def settings(self) -> Dict[str, Any]:
+        return self._call(method="settings")
+
+    def lease(self, owner: str, visibility_timeout: float) -> Optional[LeasedTask]:
+        task = self._call(method="lease", owner=owner, visibility_timeout=visibility_timeout)
+        if task is None:
+            return None
+        stage, key, payload = task
+        return LedgerStageEnum(stage), key, payload
+
+    def extend_lease(self, stage: LedgerStageEnum, key: str, owner: str, visibility_timeout: float) -> bool:
+        return self._call(
+            method="extend_lease", stage=stage.value, key=key, owner=owner, visibility_timeout=visibility_timeout
+        )
+
+    def complete(
+        self,
+        stage: LedgerStageEnum,
+        key: str,
+        owner: str,
+        result: Any = None,
+        children: Optional[ChildTasks] = None,
+        priorities: Optional[Dict[LedgerStageEnum, int]] = None,
+    ) -> bool:
+        completed = self._call(
+            method="complete",
+            stage=stage.value,
+            key=key,
+            owner=owner,
+            result=result,
+            children={child_stage.value: tasks for child_stage, tasks in (children or {}).items()},
+            priorities={child_stage.value: priority for child_stage, priority in (priorities or {}).items()},
+        )
+        if not completed:
+            Message.warning_message(f"Аренда задачи истекла, результат отброшен. Этап: {stage.value}. Ключ: {key}")
+        return completed
+
+    def fail(self, stage: LedgerStageEnum, key: str, owner: str) -> bool:
+        failed = self._call(method="fail", stage=stage.value, key=key, owner=owner)
+        if not failed:
+            Message.warning_message(f"Аренда задачи истекла, ошибка не учтена. Этап: {stage.value}. Ключ: {key}")
+        return failed
+
+    def unfinished(self) -> int:
+        return self._call(method="unfinished")
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        try:
+            return self._call(method="summary")
+        except TaskQueueError as error:
+            Message.warning_message(f"Не удалось получить состояние общей очереди задач. Ошибка: {error}")
+            return {}
+
+    def reserve_permit(self) -> float:
+        return self._call(method="reserve_permit")
+
+    def report_rate(self, elapsed: Optional[float] = None, failure: Optional[str] = None) -> float:
+        return self._call(method="report_rate", elapsed=elapsed, failure=failure)
+
+    def close(self) -> None:
+        self._pool.clear()
+
+    def _call(self, method: str, **params) -> Any:
+        url = f"{self._base_url}/{method}"
+        try:
+            response = self._pool.request("POST", url, body=json.dumps(params).encode("utf-8"))
+        except HTTPError as error:
+            raise TaskQueueError(f"Координатор недоступен. URL: {url}. Ошибка: {error}") from error
+        if response.status != 200:
+            raise TaskQueueError(f"Неверный статус ответа координатора: {response.status}. URL: {url}")
+        return json.loads(response.data.decode("utf-8"))["result"]
@@ -1,4 +1,4 @@
-from typing import TypedDict, List
+from typing import TypedDict, List, Optional, Dict
 
 
 class State(TypedDict, total=False):
@@ -9,12 +9,52 @@ class State(TypedDict, total=False):
     priority_date: str
     publication_date: str
     classification_codes: str
+    classification_codes_partial: bool
     patent_code: str
     country: str
     path_to_pdf_file: str
+    pdf_link: str
     abstract: str
 
 
+class PatentCard(TypedDict, total=False):
+    title: Optional[str]
+    patent_code: Optional[str]
+    priority_date: Optional[str]
+    publication_date: Optional[str]
+    original_assignee: Optional[List[str]]
+    inventors: Optional[List[str]]
+    inventors_truncated: bool
+    pdf_link: Optional[str]
+
+
 class JsonDict(TypedDict, total=False):
     name: str
     links: List[str]
+    cards: Dict[str, PatentCard]
+
+
+class PatentPage(TypedDict, total=False):
+    title: Optional[str]
+    patent_code: Optional[str]
+    classification_codes: Optional[List[str]]
+    current_assignee: Optional[List[str]]
+    inventors: Optional[List[str]]
+    country: Optional[str]
+    priority_date: Optional[str]
+    publication_date: Optional[str]
+    abstract: Optional[str]
+    pdf_link: Optional[str]
+    text: Optional[str]
+
+
+class FixturePatent(TypedDict):
+    patent_code: str
+    title: str
+    abstract: str
+    inventors: List[str]
+    current_assignee: List[str]
+    priority_date: str
+    publication_date: str
+    classification_codes: List[str]
+    hidden_classification_codes: List[str]
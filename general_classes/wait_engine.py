@@ -0,0 +1,97 @@
+import time
+from enum import Enum
+from typing import Dict, Optional, List
+
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as ec
+from selenium.webdriver.support.ui import WebDriverWait
+
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS
+
+
+class PageReadinessWaiter:
+    LEGACY_IMPLICIT_WAIT = 6
+    DEFAULT_READY_TIMEOUT = 15
+    DEFAULT_TIMEOUTS = {
+        "result_in_page_button": 3.0,
+        "one_hundred_results_per_page": 3.0,
+        "num_result": 3.0,
+    }
+
+    def __init__(
+        self,
+        driver: webdriver.Chrome,
+        ready_timeout: float = DEFAULT_READY_TIMEOUT,
+        timeouts: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self._driver = driver
+        self._driver.implicitly_wait(time_to_wait=0)
+        self._ready_timeout = ready_timeout
+        self._timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
+
+    def wait_until_ready(self, signal: Enum) -> bool:
+        started_at = time.monotonic()
+        try:
+            WebDriverWait(self._driver, self._ready_timeout).until(
+                ec.presence_of_element_located((By.XPATH, signal.value))
+            )
+            return True
+        except TimeoutException:
+            Message.warning_message(f"Страница не загрузилась за {self._ready_timeout} сек. Сигнал: {signal.name}")
+            STATISTICS.increment(f"wait.ready_timeouts.{signal.name}")
+            return False
+        finally:
+            elapsed = time.monotonic() - started_at
+            STATISTICS.add_time(f"wait.ready.{signal.name}", elapsed)
+            STATISTICS.observe("wait.ready", elapsed, labels={"element": signal.name})
+
+    def wait_for_attribute_change(
+        self, element: Enum, attribute: str, previous: Optional[str], timeout: float = 5.0
+    ) -> bool:
+        def changed(driver: webdriver.Chrome) -> bool:
+            found = driver.find_elements(by=By.XPATH, value=element.value)
+            return bool(found) and found[0].get_attribute(attribute) != previous
+
+        started_at = time.monotonic()
+        try:
+            WebDriverWait(
+                self._driver, timeout, poll_frequency=0.1, ignored_exceptions=(StaleElementReferenceException,)
+            ).until(changed)
+            return True
+        except TimeoutException:
+            STATISTICS.increment(f"wait.change_timeouts.{element.name}")
+            return False
+        finally:
+            STATISTICS.add_time(f"wait.change.{element.name}", time.monotonic() - started_at)
+
+    def find_element(self, element: Enum, xpath: Optional[str] = None) -> WebElement:
+        found = self.find_elements(element=element, xpath=xpath)
+        if not found:
+            raise NoSuchElementException(f"Элемент {element.name} не найден")
+        return found[0]
+
+    def find_elements(self, element: Enum, xpath: Optional[str] = None) -> List[WebElement]:
+        xpath = xpath or element.value
+        timeout = self._timeouts.get(element.name, 0)
+        started_at = time.monotonic()
+        found = self._driver.find_elements(by=By.XPATH, value=xpath)
+        if not found and timeout:
+            try:
+                found = WebDriverWait(self._driver, timeout, poll_frequency=0.1).until(
+                    ec.presence_of_all_elements_located((By.XPATH, xpath))
+                )
+            except TimeoutException:
+                found = []
+        elapsed = time.monotonic() - started_at
+        STATISTICS.add_time(f"wait.lookup.{element.name}", elapsed)
+        STATISTICS.observe("xpath.lookup", elapsed, labels={"element": element.name})
+        if not found:
+            STATISTICS.increment(f"wait.misses.{element.name}")
+            STATISTICS.observe("xpath.stall", elapsed, labels={"element": element.name})
+            STATISTICS.add_time(f"wait.stall.{element.name}", elapsed)
+            STATISTICS.add_time("wait.saved_stall", max(self.LEGACY_IMPLICIT_WAIT - elapsed, 0))
+        return found
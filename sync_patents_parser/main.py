@@ -1,6 +1,5 @@
-import re
+import os
 import sys
-import time
 from datetime import datetime
 from typing import Tuple
 
@@ -8,9 +7,19 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
-from general_classes.enums import DirTypeEnum, FileTypeEnum
+from general_classes.archive_writer import StreamingArchiveWriter
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import DirTypeEnum, FileTypeEnum, ExtractionModeEnum, ResultFormatEnum
 from general_classes.file_services import MakeDirManager, XlsxFileWriter, LinksJsonFileReader
+from general_classes.http_client import HttpClient, HttpPageFetcher
+from general_classes.keyword_scorer import KeywordScorer
+from general_classes.local_server import MetricsHttpServer
 from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.rate_governor import RATE_GOVERNOR
+from general_classes.result_sinks import create_result_sink, parse_result_formats
+from general_classes.statistics import STATISTICS
 from sync_patents_parser.file_services import LinksJsonFileWriter
 from sync_patents_parser.selenium_multiparser import SeleniumMultiParser
 
@@ -20,9 +29,20 @@ PATENTS_JSON = FileTypeEnum.PATENTS_JSON.value
 TEMP_DIR = DirTypeEnum.TEMP_DIR.value
 LINKS_DIR = DirTypeEnum.LINKS_DIR.value
 RESULT_DIR = DirTypeEnum.RESULT_DIR.value
+CACHE_DIR = DirTypeEnum.CACHE_DIR.value
+METRICS_JSON = FileTypeEnum.METRICS_JSON.value
 
 DEFAULT_KEYWORD_COUNT = 10
 REQUIRED_WORD = "assignee"
+USE_HTTP_FETCHER = True
+EXTRACTION_MODE = ExtractionModeEnum.SCRIPT
+USE_PDF_DOWNLOADER = True
+PDF_DOWNLOAD_WORKERS = 4
+USE_PAGE_CACHE = True
+REQUESTS_PER_SECOND = 4.0
+RESULT_FORMATS = parse_result_formats(argv=sys.argv, default=(ResultFormatEnum.XLSX, ResultFormatEnum.JSONL))
+METRICS_PORT = None
+WRITE_METRICS_JSON = True
 
 
 def init_settings(temp_dir: str, path_to_driver: str) -> Tuple[Options, Service]:
@@ -41,9 +61,13 @@ if __name__ == "__main__":
         'Введите поисковый запрос формата "((((H04L9)) OR (crypt))) '
         f'{REQUIRED_WORD}:raytheon country:US language:ENGLISH)": '
     ).strip()
-    keyword = input('Введите ключевое слово для поиска на странице: ')
+    keyword = input(
+        'Введите ключевые слова для поиска на странице через запятую, '
+        'при необходимости с весом (формат "crypt:2, secure key"; слова ищутся как обычный текст, '
+        'без регулярных выражений; пустой ввод отключает проверку): '
+    )
     min_keyword_count = input(
-        f'Введите мин.количество ключевых слов на странице(по умолчанию {DEFAULT_KEYWORD_COUNT}): '
+        f'Введите мин.суммарный вес ключевых слов на странице(по умолчанию {DEFAULT_KEYWORD_COUNT}): '
     )
     result_zip_file_name = input('Введите желаемое название архива с результатом: ')
 
@@ -54,21 +78,35 @@ if __name__ == "__main__":
     split_params = request.split(REQUIRED_WORD)
     request_params_before = split_params[0].strip().replace(" ", "+")
     request_params_after = split_params[1].strip().split(" ", maxsplit=1)[1].replace(" ", "+")
-    classifications_code = re.search(r'[^(][a-zA-Z\d]+[^)]', request_params_before)
+    classifications_codes = ClassificationMatcher.codes_in_text(text=request_params_before.upper())
 
-    if not classifications_code:
+    if not classifications_codes:
         Message.error_message("Неверный формат поискового запроса. Не найден код классификатора")
         sys.exit()
 
+    extra_classifications_codes = input(
+        'Введите дополнительные коды классификаторов через запятую, диапазоны через "-", '
+        'исключения с "!" (например "G06F21/60-G06F21/64, !H04L9/32"), или оставьте пустым: '
+    )
+
     start_time = datetime.now()
+    RATE_GOVERNOR.configure(requests_per_second=REQUESTS_PER_SECOND)
+    metrics_server = MetricsHttpServer(port=METRICS_PORT).start() if METRICS_PORT else None
 
     DEFAULT_KEYWORD_COUNT = int(min_keyword_count) if min_keyword_count.isdigit() else DEFAULT_KEYWORD_COUNT
-    valid_classifications_code = classifications_code.group(0)
-    Message.info_message(f'Код классификатора: {valid_classifications_code}')
+    classification_matcher = ClassificationMatcher.from_spec(
+        spec=", ".join(classifications_codes + [extra_classifications_codes])
+    )
+    Message.info_message(f'Коды классификаторов: {classification_matcher.describe()}')
+    if not KeywordScorer.from_prompt(raw=keyword, threshold=0).enabled:
+        Message.warning_message("Ключевые слова не заданы, проверка по ключевым словам отключена.")
     dir_manager = MakeDirManager()
     temporary_dir = dir_manager.make_temp_browser_dir(directory=TEMP_DIR)
     options, service = init_settings(temp_dir=temporary_dir, path_to_driver=path_to_chrome_driver)
     chrome = webdriver.Chrome(options=options, service=service)
+    http_client = HttpClient(pool_size=PDF_DOWNLOAD_WORKERS)
+    page_cache = PageCache(directory=dir_manager.make_link_dir(name=CACHE_DIR)) if USE_PAGE_CACHE else None
+    downloader = PdfDownloadManager(client=http_client, max_workers=PDF_DOWNLOAD_WORKERS) if USE_PDF_DOWNLOADER else None
     parser = SeleniumMultiParser(
         driver=chrome,
         tmp_dir=temporary_dir,
@@ -77,32 +115,35 @@ if __name__ == "__main__":
         request_params_after=request_params_after,
         keyword=keyword,
         min_keyword_count=DEFAULT_KEYWORD_COUNT,
-        valid_classifications_code=valid_classifications_code,
+        classification_matcher=classification_matcher,
+        fetcher=HttpPageFetcher(client=http_client) if USE_HTTP_FETCHER else None,
+        extraction_mode=EXTRACTION_MODE,
+        downloader=downloader,
+        page_cache=page_cache,
     )
     links_dir = dir_manager.make_link_dir(name=LINKS_DIR)
     writer = LinksJsonFileWriter(directory=links_dir)
     reader = LinksJsonFileReader()
+    archive_writer = None
 
     try:
         list_main_links = parser.collect_main_links()
         path_to_main_links = writer.write_links_to_file(file_name=MAIN_JSON, data=list_main_links)
-        time.sleep(10)
 
         main_links = reader.parse_file(path_to_links=path_to_main_links)
         parser.set_links(links=main_links)
         list_inventors_links = parser.collect_inventors_links()
         path_to_inventors_links = writer.write_links_to_file(file_name=INVENTORS_JSON, data=list_inventors_links)
-        time.sleep(10)
 
         inventors_links = reader.parse_file(path_to_links=path_to_inventors_links)
         parser.set_links(links=inventors_links)
         list_patents_links = parser.collect_patents_inventors_links()
         path_to_json_links = writer.write_links_to_file(file_name=PATENTS_JSON, data=list_patents_links)
-        time.sleep(10)
 
         patents_links = reader.parse_file(path_to_links=path_to_json_links)
         patents_links_len = len(patents_links)
         directory_name = dir_manager.make_result_dir(name=RESULT_DIR)
+        archive_writer = StreamingArchiveWriter(name=result_zip_file_name, root_dir=directory_name)
         for element in patents_links:
             dir_name = element["name"]
             links = element["links"]
@@ -114,17 +155,33 @@ if __name__ == "__main__":
             Message.info_message(f"Текущий автор: {dir_name}")
             parser.parse_patents_links(patent_dir=dir_patent)
             state = parser.get_state()
-            writer = XlsxFileWriter(directory=dir_author, state=state)
-            writer.execute_write()
+            with create_result_sink(directory=dir_author, formats=RESULT_FORMATS) as sink:
+                sink.extend(states=state)
+            if state:
+                pending = downloader.futures_under(directory=dir_patent) if downloader is not None else []
+                archive_writer.add_directory(directory=dir_author, pending=pending)
             patents_links_len -= 1
 
-        writer.delete_empty_directory(dir_name=RESULT_DIR)
-        time.sleep(5)
-        writer.zipped_files(dir_name=RESULT_DIR, zip_file_name=result_zip_file_name)
+        if downloader is not None:
+            downloader.wait()
+        archive_writer.finalize()
+        XlsxFileWriter.delete_empty_directory(dir_name=RESULT_DIR)
     except FileExistsError as Error:
         Message.error_message(f"Ошибка в работе программы. Ошибка: {Error}.")
     finally:
+        if downloader is not None:
+            downloader.close()
+        if archive_writer is not None:
+            archive_writer.abort()
         execution_time = datetime.now() - start_time
         Message.info_message(f"Время выполнения: {execution_time}")
+        if page_cache is not None:
+            page_cache.report()
+        RATE_GOVERNOR.report()
+        STATISTICS.report()
+        if WRITE_METRICS_JSON:
+            STATISTICS.dump_json(path=os.path.join(links_dir, METRICS_JSON))
+        if metrics_server is not None:
+            metrics_server.stop()
         parser.close_browser()
         Message.success_message("============== Завершение работы программы. ==============")
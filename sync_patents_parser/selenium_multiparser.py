@@ -1,6 +1,4 @@
-import random
-import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from urllib.parse import urljoin
 
 from selenium import webdriver
@@ -11,14 +9,22 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
 
-from general_classes.enums import XpathRightPartElements, SearchItems, UniqueNames
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import (
+    XpathRightPartElements, SearchItems, UniqueNames, ExtractionModeEnum, ReadySignalElements,
+)
+from general_classes.http_client import HttpPageFetcher
 from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.rate_governor import RATE_GOVERNOR
 from general_classes.type_annotations import JsonDict
 from selenium_parser import SeleniumParser
 
 
 class SeleniumMultiParser(SeleniumParser):
     BASE_URL = "https://patents.google.com/"
+    MAX_EMPTY_PAGES = 3
 
     def __init__(
         self,
@@ -26,12 +32,19 @@ class SeleniumMultiParser(SeleniumParser):
         tmp_dir: str,
         keyword: str,
         min_keyword_count: int,
-        valid_classifications_code: str,
+        classification_matcher: ClassificationMatcher,
         request: str,
         request_params_before: str,
-        request_params_after: str
+        request_params_after: str,
+        fetcher: Optional[HttpPageFetcher] = None,
+        extraction_mode: ExtractionModeEnum = ExtractionModeEnum.ELEMENTS,
+        downloader: Optional[PdfDownloadManager] = None,
+        page_cache: Optional[PageCache] = None,
     ) -> None:
-        super().__init__(driver, tmp_dir, keyword, min_keyword_count, valid_classifications_code)
+        super().__init__(
+            driver, tmp_dir, keyword, min_keyword_count, classification_matcher, fetcher, extraction_mode,
+            downloader, page_cache,
+        )
         self._request = request
         self._request_params_before = request_params_before
         self._request_params_after = request_params_after.replace(",", "%2C")
@@ -41,7 +54,7 @@ class SeleniumMultiParser(SeleniumParser):
         self._patents_links_list = []
 
     def collect_main_links(self) -> List:
-        self._follow_the_link(link=self.BASE_URL)
+        self._follow_the_link(link=self.BASE_URL, ready_signal=ReadySignalElements.search_form)
         self._fill_form(request=self._request)
         if not self._check_result():
             raise ValueError("Ошибка. Результатов по введённому запросу не найдено")
@@ -70,8 +83,6 @@ class SeleniumMultiParser(SeleniumParser):
             Message.info_message(f"Текущая ссылка: {link}")
             self._follow_the_link(link=link)
             self._find_inventors_links(link=link)
-            if len_inventors_links % 10 == 0:
-                time.sleep(random.randint(5, 10))
             len_inventors_links -= 1
         valid_links = self._inventors_links_converter(data=self._inventors_links_list)
         self._inventors_links_list.clear()
@@ -100,7 +111,7 @@ class SeleniumMultiParser(SeleniumParser):
             inventor = element["name"]
             Message.info_message(f"Осталось спарсить ссылок: {len_patents_links}")
             Message.info_message(f"Текущая ссылка: {link}")
-            self._follow_the_link(link=link)
+            self._follow_the_link(link=link, ready_signal=ReadySignalElements.search_results)
             len_patents_links -= 1
             if not self._check_result():
                 Message.warning_message(f"Патенты у автора {inventor} не найдена")
@@ -115,12 +126,11 @@ class SeleniumMultiParser(SeleniumParser):
         return self._patents_links_list
 
     def _fill_form(self, request: str) -> None:
-        form = self._driver.find_element(
-            by=By.XPATH, value=SearchItems.search_form.value
-        )
+        form = self._find_element(element=SearchItems.search_form)
         form.send_keys(request)
         form.send_keys(Keys.ENTER)
         Message.info_message("Ввод запроса в форму...")
+        self._waiter.wait_until_ready(signal=ReadySignalElements.search_results)
 
     def _add_links_to_list(self, list_: List, all_result: bool = False) -> None:
         links_number = self._find_total_items_result()
@@ -128,25 +138,37 @@ class SeleniumMultiParser(SeleniumParser):
             self._add_more_result_per_page()
         Message.info_message(f"Всего результатов на странице: {links_number}")
         total_added = 0
+        empty_pages = 0
         while total_added < links_number:
-            time.sleep(1)
-            links_elements = self._driver.find_elements(
-                by=By.XPATH, value=SearchItems.result_items.value
-            )
+            links_elements = self._find_elements(element=SearchItems.result_items)
             links_to_str = [
                 {"link": element.get_attribute("data-result")} for element in links_elements
             ]
+            if not links_to_str:
+                empty_pages += 1
+                RATE_GOVERNOR.report_failure(reason="пустая страница результатов")
+                if empty_pages >= self.MAX_EMPTY_PAGES:
+                    Message.warning_message("Страница результатов пуста, сбор ссылок остановлен.")
+                    break
+                RATE_GOVERNOR.acquire()
+                continue
+            empty_pages = 0
             len_links_to_str = len(links_to_str)
             total_added += len_links_to_str
             Message.info_message(f"Добавлено ссылок: {len_links_to_str}. Всего добавлено: {total_added}")
             list_.extend(links_to_str)
-            self._click_to_next_button(xpath=SearchItems.next_button.value)
+            if total_added < links_number:
+                RATE_GOVERNOR.acquire()
+                if self._click_to_next_button(xpath=SearchItems.next_button.value):
+                    self._waiter.wait_for_attribute_change(
+                        element=SearchItems.result_items,
+                        attribute="data-result",
+                        previous=links_to_str[0]["link"],
+                    )
 
     def _find_total_items_result(self) -> int:
         try:
-            result = self._driver.find_element(
-                by=By.XPATH, value=SearchItems.num_result.value
-            )
+            result = self._find_element(element=SearchItems.num_result)
         except NoSuchElementException:
             Message.warning_message('Элемент "Всего результатов" не найден')
             result = "0"
@@ -154,9 +176,9 @@ class SeleniumMultiParser(SeleniumParser):
         return int(res_number[0])
 
     def _add_more_result_per_page(self) -> None:
-        more_result_button = self._driver.find_element(by=By.XPATH, value=SearchItems.result_in_page_button.value)
+        more_result_button = self._find_element(element=SearchItems.result_in_page_button)
         self._driver.execute_script("arguments[0].click();", more_result_button)
-        max_result_button = self._driver.find_element(by=By.XPATH, value=SearchItems.one_hundred_results_per_page.value)
+        max_result_button = self._find_element(element=SearchItems.one_hundred_results_per_page)
         self._driver.execute_script("arguments[0].click();", max_result_button)
 
     def _patents_links_converter(self, data: List) -> List:
@@ -167,28 +189,25 @@ class SeleniumMultiParser(SeleniumParser):
 
     def _check_result(self) -> bool:
         try:
-            self._driver.find_element(
-                by=By.XPATH, value=SearchItems.no_result_message.value
-            )
+            self._find_element(element=SearchItems.no_result_message)
             return False
         except NoSuchElementException:
             return True
 
-    def _click_to_next_button(self, xpath: str) -> None:
+    def _click_to_next_button(self, xpath: str) -> bool:
         try:
             button = WebDriverWait(self._driver, 5).until(
                 ec.element_to_be_clickable((By.XPATH, xpath))
             )
             button.click()
             Message.info_message("Переход на следующую страницу...")
+            return True
         except TimeoutException:
             Message.warning_message('Кнопка "следующая страница" не найдена.')
-            ...
+            return False
 
     def _find_inventors_links(self, link: str) -> None:
-        people_section = self._driver.find_elements(
-            by=By.XPATH, value=XpathRightPartElements.inventors_link.value
-        )
+        people_section = self._find_elements(element=XpathRightPartElements.inventors_link)
         if not people_section:
             Message.warning_message(f"Секция people_section не найдена. URL: {link}")
         else:
@@ -1,19 +1,33 @@
 import os
 import re
+import time
 from datetime import datetime
-from typing import List, Dict
+from enum import Enum
+from typing import List, Dict, Optional
 
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
-from general_classes.enums import XpathIdElements, XpathRightPartElements, UniqueNames
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import (
+    XpathIdElements, XpathRightPartElements, UniqueNames, ExtractionModeEnum, ReadySignalElements,
+    KeywordCountModeEnum,
+)
+from general_classes.http_client import HttpPageFetcher
+from general_classes.keyword_scorer import KeywordScorer
 from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.rate_governor import RATE_GOVERNOR
+from general_classes.static_page_parser import StaticPageParserMixin
+from general_classes.statistics import STATISTICS
 from general_classes.type_annotations import State
+from general_classes.wait_engine import PageReadinessWaiter
 
 
-class SeleniumParser:
+class SeleniumParser(StaticPageParserMixin):
 
     def __init__(
         self,
@@ -21,14 +35,28 @@ class SeleniumParser:
         tmp_dir: str,
         keyword: str,
         min_keyword_count: int,
-        valid_classifications_code: str,
+        classification_matcher: ClassificationMatcher,
+        fetcher: Optional[HttpPageFetcher] = None,
+        extraction_mode: ExtractionModeEnum = ExtractionModeEnum.ELEMENTS,
+        downloader: Optional[PdfDownloadManager] = None,
+        page_cache: Optional[PageCache] = None,
+        keyword_count_mode: KeywordCountModeEnum = KeywordCountModeEnum.BROWSER,
+        selector_timeouts: Optional[Dict[str, float]] = None,
     ) -> None:
         self._driver = driver
         self._tmp_dir = tmp_dir
         self._keyword = keyword
         self._min_keyword_count = min_keyword_count
-        self._valid_classifications_code = valid_classifications_code
-        self._driver.implicitly_wait(time_to_wait=6)
+        self._init_static_parser(
+            fetcher=fetcher,
+            extraction_mode=extraction_mode,
+            downloader=downloader,
+            page_cache=page_cache,
+            classification_matcher=classification_matcher,
+            keyword_scorer=KeywordScorer.from_prompt(raw=keyword, threshold=min_keyword_count),
+            keyword_count_mode=keyword_count_mode,
+        )
+        self._waiter = PageReadinessWaiter(driver=self._driver, timeouts=selector_timeouts)
         self._driver.maximize_window()
         self._state = State()
         self._url_regex = re.compile(r"^(http|https)://([\w.]+/?)\S*$")
@@ -40,15 +68,29 @@ class SeleniumParser:
 
     def parse_patents_links(self, patent_dir: str) -> None:
         for link in self._links:
+            page = self._load_page(link=link)
+            if page is not None:
+                self._state["link"] = link
+                try:
+                    self._parse_static_page(page=page, patent_dir=patent_dir)
+                except ValueError:
+                    continue
+                self._add_state_to_result_list()
+                continue
+
+            STATISTICS.increment("extraction.elements")
             self._follow_the_link(link=link)
             self._state["link"] = link
             Message.success_message("Ссылка сохранена")
-            self._click_to_more_button()
+            if not self._decided_by_visible_codes():
+                self._click_to_more_button()
 
             try:
                 self._find_classification_codes()
             except ValueError:
                 continue
+            finally:
+                self._store_browser_page(link=link)
 
             self._find_title()
             self._parse_people_section()
@@ -70,14 +112,30 @@ class SeleniumParser:
         self._driver.close()
         self._driver.quit()
 
-    def _follow_the_link(self, link: str) -> None:
+    def _follow_the_link(self, link: str, ready_signal: ReadySignalElements = ReadySignalElements.patent_result) -> None:
+        RATE_GOVERNOR.run(
+            load=lambda: self._load_link(link=link, ready_signal=ready_signal),
+            failure_reason=f"страница не загрузилась: {link}",
+        )
+
+    def _load_link(self, link: str, ready_signal: ReadySignalElements) -> bool:
+        started_at = time.monotonic()
         self._driver.get(url=link)
+        STATISTICS.observe("driver.get", time.monotonic() - started_at)
+        ready = self._waiter.wait_until_ready(signal=ready_signal)
+        STATISTICS.add_time("browser.page_load", time.monotonic() - started_at)
+        STATISTICS.increment("browser.page_loads")
+        return ready
+
+    def _find_element(self, element: Enum, xpath: Optional[str] = None) -> WebElement:
+        return self._waiter.find_element(element=element, xpath=xpath)
+
+    def _find_elements(self, element: Enum, xpath: Optional[str] = None) -> List[WebElement]:
+        return self._waiter.find_elements(element=element, xpath=xpath)
 
     def _click_to_more_button(self) -> None:
         try:
-            button = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.more_classifications_button.value
-            )
+            button = self._find_element(element=XpathIdElements.more_classifications_button)
             self._driver.execute_script("arguments[0].click();", button)
         except NoSuchElementException:
             Message.warning_message(
@@ -86,9 +144,7 @@ class SeleniumParser:
 
     def _find_classification_codes(self) -> None:
         try:
-            classification_element = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.classification_elements.value
-            )
+            classification_element = self._find_element(element=XpathIdElements.classification_elements)
         except NoSuchElementException:
             self._state["classification_codes"] = ""
             Message.warning_message(
@@ -98,9 +154,7 @@ class SeleniumParser:
             self._parse_classification_elements(element=classification_element)
 
     def _parse_classification_elements(self, element: WebElement) -> None:
-        find_code_elements = element.find_elements(
-            by=By.XPATH, value=XpathIdElements.classification_element_codes.value
-        )
+        find_code_elements = self._find_elements(element=XpathIdElements.classification_element_codes)
         codes = [i.text for i in find_code_elements if i.text]
         self._validate_patent(list_of_code=codes)
         if not codes:
@@ -112,36 +166,44 @@ class SeleniumParser:
             self._state["classification_codes"] = ", ".join(codes)
             Message.success_message("Кода патентного классификатора сохранены.")
 
-    def _validate_patent(self, list_of_code: List[str]) -> None:
+    def _save_static_codes(self, codes: List[str], text: str) -> None:
+        self._validate_patent(list_of_code=codes, page_text=text)
+        super()._save_static_codes(codes=codes, text=text)
+
+    def _validate_patent(self, list_of_code: List[str], page_text: Optional[str] = None) -> None:
         Message.info_message('Проверка валидности патента...')
-        check_valid_code = [True if self._valid_classifications_code in code else False for code in list_of_code]
-        if any(check_valid_code):
-            Message.success_message(
-                f"Патент прошел проверку. Найден ключевой классификатор: {self._valid_classifications_code}"
+        denied_code = self._classification_matcher.find_denied(codes=list_of_code)
+        if denied_code is not None:
+            Message.warning_message(
+                f"Найден исключённый классификатор: {denied_code}. "
+                f'Патент записан не будет. URL: {self._state["link"]}'
             )
-            ...
+            STATISTICS.increment("patents.rejected.denied_code")
+            raise ValueError
+        allowed_code = self._classification_matcher.find_allowed(codes=list_of_code)
+        if allowed_code is not None:
+            STATISTICS.increment("patents.accepted.classification")
+            Message.success_message(f"Патент прошел проверку. Найден ключевой классификатор: {allowed_code}")
         else:
-            Message.warning_message(f"Не найден ключевой классификатор: {self._valid_classifications_code}")
-            html = self._driver.find_element(by=By.TAG_NAME, value='html').text
-            count_keywords = len(re.findall(self._keyword, html, flags=re.IGNORECASE))
-            valid_flag = count_keywords >= self._min_keyword_count
-            if not valid_flag:
+            Message.warning_message(f"Не найден ключевой классификатор: {self._classification_matcher.describe()}")
+            keyword_score = self._score_keywords(page_text=page_text)
+            if not keyword_score.passed:
+                STATISTICS.increment("patents.rejected.keywords")
                 Message.warning_message(
-                    f'Недостаточно ключевых слов в патенте. Найдено: {count_keywords}. '
-                    f'Мин.значение: {self._min_keyword_count}. '
+                    f"Недостаточно ключевых слов в патенте. Найдено: {keyword_score.describe()}. "
+                    f"Мин.значение: {self._min_keyword_count}. "
                     f'Патент записан не будет. URL: {self._state["link"]}'
                 )
                 raise ValueError
+            STATISTICS.increment("patents.accepted.keywords")
             Message.success_message(
-                f"Патент прошел проверку. Найдено ключевых слов: {count_keywords}. "
+                f"Патент прошел проверку. Найдено ключевых слов: {keyword_score.describe()}. "
                 f"Мин.значение: {self._min_keyword_count}."
             )
 
     def _find_title(self) -> None:
         try:
-            title = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.patent_title.value
-            )
+            title = self._find_element(element=XpathIdElements.patent_title)
             self._state["title"] = title.text
             Message.success_message("Название патента сохранено")
         except NoSuchElementException:
@@ -151,9 +213,7 @@ class SeleniumParser:
             )
 
     def _parse_people_section(self) -> None:
-        people_section = self._driver.find_elements(
-            by=By.XPATH, value=XpathRightPartElements.important_people_section.value
-        )
+        people_section = self._find_elements(element=XpathRightPartElements.important_people_section)
         if not people_section:
             self._state["current_assignee"] = []
             self._state["inventors"] = []
@@ -197,9 +257,7 @@ class SeleniumParser:
 
     def _find_priority_date(self) -> None:
         try:
-            priority_date = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.date_priority.value
-            )
+            priority_date = self._find_element(element=XpathRightPartElements.date_priority)
             date_to_datetime = datetime.strptime(priority_date.text, "%Y-%m-%d")
             self._state["priority_date"] = date_to_datetime.strftime("%d.%m.%Y")
             Message.success_message("Дата приоритета сохранена")
@@ -211,9 +269,7 @@ class SeleniumParser:
 
     def _find_patent_code(self) -> None:
         try:
-            patent_code = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.patent_code.value
-            )
+            patent_code = self._find_element(element=XpathIdElements.patent_code)
             self._state["patent_code"] = patent_code.text
             Message.success_message("Номер патента сохранён")
         except NoSuchElementException:
@@ -228,7 +284,7 @@ class SeleniumParser:
             patent_code=patent_code
         )
         try:
-            publication_date = self._driver.find_element(by=By.XPATH, value=xpath)
+            publication_date = self._find_element(element=XpathRightPartElements.date_publication_template, xpath=xpath)
             date_to_datetime = datetime.strptime(publication_date.text, "%Y-%m-%d")
             self._state["publication_date"] = date_to_datetime.strftime("%d.%m.%Y")
             Message.success_message("Дата публикации сохранена")
@@ -240,9 +296,7 @@ class SeleniumParser:
 
     def _find_abstract(self) -> None:
         try:
-            abstract = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.abstract.value
-            )
+            abstract = self._find_element(element=XpathRightPartElements.abstract)
             Message.success_message("Абстракт сохранён")
             self._state["abstract"] = abstract.text
         except NoSuchElementException:
@@ -251,9 +305,7 @@ class SeleniumParser:
 
     def _find_country(self) -> None:
         try:
-            country = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.country.value
-            )
+            country = self._find_element(element=XpathRightPartElements.country)
             self._state["country"] = country.text
             Message.success_message("Страна сохранена")
         except NoSuchElementException:
@@ -262,10 +314,12 @@ class SeleniumParser:
 
     def _download_pdf_file(self, patent_dir: str) -> None:
         Message.info_message("Скачивание pdf файла...")
-        element = self._driver.find_element(
-            by=By.XPATH, value=XpathRightPartElements.pdf.value
-        )
+        element = self._find_element(element=XpathRightPartElements.pdf)
         link = element.get_attribute("href")
+        self._save_pdf_file(link=link, patent_dir=patent_dir)
+
+    def _save_pdf_file(self, link: Optional[str], patent_dir: str) -> None:
+        self._state["pdf_link"] = link or ""
         if link is None:
             Message.warning_message(
                 f'Ссылка для скачивания PDF не найдена. URL: {self._state["link"]}'
@@ -275,13 +329,16 @@ class SeleniumParser:
             target = os.path.join(patent_dir, f"{self._state['patent_code']}.html")
             with open(target, "w", encoding="utf-8") as file:
                 file.write(html)
+            Message.success_message("Файл успешно скачен.")
+        elif self._downloader is not None:
+            target = self._schedule_pdf_download(link=link, patent_dir=patent_dir)
         else:
             self._execute_download(link=link)
             file_name = os.listdir(self._tmp_dir)[0]
             file_path = os.path.join(self._tmp_dir, file_name)
             target = os.path.join(patent_dir, file_name)
             os.replace(file_path, target)
-        Message.success_message("Файл успешно скачен.")
+            Message.success_message("Файл успешно скачен.")
         self._state["path_to_pdf_file"] = "/".join(target.split("/")[-3:])
         Message.success_message("Путь к файлу сохранён.")
 
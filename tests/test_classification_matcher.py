@@ -0,0 +1,82 @@
+import pytest
+
+from general_classes.classification_matcher import ClassificationCode, ClassificationMatcher
+from general_classes.enums import ClassificationDecisionEnum
+
+
+def test_parse_normalizes_code():
+    assert str(ClassificationCode.parse(" h04l 9/00 ")) == "H04L9"
+    assert str(ClassificationCode.parse("G06F0021/602")) == "G06F21/602"
+    assert ClassificationCode.parse("H04/32") is None
+    assert ClassificationCode.parse("not a code") is None
+
+
+def test_ancestors_cover_every_level():
+    assert ClassificationCode.parse("H04L9/0819").ancestors() == [
+        "H", "H04", "H04L", "H04L9", "H04L9/08", "H04L9/081", "H04L9/0819",
+    ]
+
+
+@pytest.mark.parametrize("code, allowed", [
+    ("H04L9/0819", True),
+    ("H04L9/32", True),
+    ("H04L9", True),
+    ("H04L12/22", False),
+    ("H04W12/02", True),
+    ("G06F", False),
+])
+def test_allow_matches_code_and_its_descendants(code, allowed):
+    matcher = ClassificationMatcher.from_spec(spec="H04L9, H04W")
+
+    assert (matcher.find_allowed(codes=[code]) is not None) == allowed
+
+
+@pytest.mark.parametrize("code, allowed", [
+    ("G06F21/60", True),
+    ("G06F21/602", True),
+    ("G06F21/64", True),
+    ("G06F21/6418", True),
+    ("G06F21/70", False),
+    ("G06F21/55", False),
+    ("G06F22", False),
+    ("H04L9/32", False),
+])
+def test_allow_range_includes_both_bounds_and_their_subgroups(code, allowed):
+    matcher = ClassificationMatcher.from_spec(spec="G06F21/60-G06F21/64")
+
+    assert (matcher.find_allowed(codes=[code]) is not None) == allowed
+
+
+def test_overlapping_ranges_are_merged():
+    matcher = ClassificationMatcher.from_spec(spec="H04L9-H04L12, H04L11-H04L29, A01B")
+
+    assert matcher.describe() == "A01B, H04L9-H04L29"
+    assert matcher.find_allowed(codes=["H04L27/26"]) == "H04L27/26"
+
+
+def test_deny_rules_reject_and_defer_acceptance():
+    matcher = ClassificationMatcher.from_spec(spec="H04L9, !H04L9/32")
+
+    assert matcher.has_deny_rules
+    assert matcher.find_denied(codes=["H04L9/0819", "H04L9/3247"]) == "H04L9/3247"
+    assert matcher.decide(codes=["H04L9/0819", "H04L9/3247"]) == ClassificationDecisionEnum.REJECT
+    assert matcher.decide(codes=["H04L9/0819"]) == ClassificationDecisionEnum.UNDECIDED
+
+
+def test_decision_without_deny_rules():
+    matcher = ClassificationMatcher.from_spec(spec="H04L9")
+
+    assert matcher.decide(codes=["G06F21/602", "H04L9/0819"]) == ClassificationDecisionEnum.ACCEPT
+    assert matcher.decide(codes=["G06F21/602"]) == ClassificationDecisionEnum.UNDECIDED
+
+
+def test_invalid_entries_are_skipped_and_empty_spec_is_rejected():
+    assert ClassificationMatcher.from_spec(spec="H04L9, bogus, A01-").describe() == "H04L9"
+    with pytest.raises(ValueError):
+        ClassificationMatcher.from_spec(spec="!H04L9, bogus")
+
+
+def test_codes_in_text():
+    text = "Classified as H04L9/0819 and G06F21/602; see also section (H) and H04L9/0819 again."
+
+    assert ClassificationMatcher.codes_in_text(text=text) == ["H04L9/0819", "G06F21/602", "H"]
@@ -0,0 +1,53 @@
+import pytest
+
+from general_classes.enums import JobStatusEnum, LedgerStageEnum
+from general_classes.job_ledger import JobLedger
+
+
+@pytest.fixture()
+def ledger_path(tmp_path):
+    return str(tmp_path / "ledger.sqlite3")
+
+
+def test_finished_job_survives_restart_with_payload(ledger_path):
+    ledger = JobLedger(path=ledger_path)
+    ledger.start(stage=LedgerStageEnum.PATENTS, key="US1")
+    ledger.finish(stage=LedgerStageEnum.PATENTS, key="US1", payload={"title": "Secure key"})
+    ledger.close()
+
+    ledger = JobLedger(path=ledger_path)
+    assert ledger.is_done(stage=LedgerStageEnum.PATENTS, key="US1")
+    assert ledger.payload(stage=LedgerStageEnum.PATENTS, key="US1") == {"title": "Secure key"}
+    assert ledger.status(stage=LedgerStageEnum.AUTHORS, key="US1") is None
+    ledger.close()
+
+
+def test_requeue_returns_interrupted_and_failed_jobs(ledger_path):
+    ledger = JobLedger(path=ledger_path)
+    for key in ("done", "interrupted", "failed"):
+        ledger.start(stage=LedgerStageEnum.AUTHORS, key=key)
+    ledger.finish(stage=LedgerStageEnum.AUTHORS, key="done")
+    ledger.fail(stage=LedgerStageEnum.AUTHORS, key="failed")
+    ledger.close()
+
+    ledger = JobLedger(path=ledger_path)
+    assert ledger.requeue_in_progress() == 2
+    assert {
+        key: ledger.status(stage=LedgerStageEnum.AUTHORS, key=key) for key in ("done", "interrupted", "failed")
+    } == {
+        "done": JobStatusEnum.DONE,
+        "interrupted": JobStatusEnum.PENDING,
+        "failed": JobStatusEnum.PENDING,
+    }
+    assert ledger.summary() == {"authors": {"done": 1, "pending": 2}}
+    ledger.close()
+
+
+def test_reset_forgets_every_job(ledger_path):
+    ledger = JobLedger(path=ledger_path)
+    ledger.finish(stage=LedgerStageEnum.MAIN_LINKS, key="request", payload=["patent/US1/en"])
+    ledger.reset()
+
+    assert not ledger.is_done(stage=LedgerStageEnum.MAIN_LINKS, key="request")
+    assert ledger.summary() == {}
+    ledger.close()
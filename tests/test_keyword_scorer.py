@@ -0,0 +1,66 @@
+from general_classes.keyword_scorer import KeywordScorer
+
+TEXT = "A secure   key exchange. The crypt module stores the secure\nkey; crypt again, and one more key."
+
+
+def test_from_prompt_parses_weights():
+    scorer = KeywordScorer.from_prompt(raw=" crypt:2, secure  key ,, ratio:x", threshold=3)
+
+    assert [(pattern["keyword"], pattern["weight"]) for pattern in scorer.script_patterns()] == [
+        ("secure key", 1.0), ("ratio:x", 1.0), ("crypt", 2.0),
+    ]
+
+
+def test_weighted_score_without_early_exit():
+    scorer = KeywordScorer.from_prompt(raw="crypt:2, secure key, key", threshold=100)
+
+    score = scorer.score(text=TEXT, early_exit=False)
+
+    assert score.counts == {"crypt": 2, "secure key": 2, "key": 1}
+    assert score.score == 7
+    assert not score.passed and not score.stopped_early
+
+
+def test_early_exit_stops_at_threshold():
+    scorer = KeywordScorer.from_prompt(raw="crypt:2, secure key", threshold=3)
+
+    score = scorer.score(text=TEXT)
+
+    assert score.passed and score.stopped_early
+    assert score.counts == {"crypt": 1, "secure key": 1}
+
+
+def test_keywords_are_matched_as_plain_text():
+    scorer = KeywordScorer.from_prompt(raw="c++, a.b", threshold=1)
+
+    assert scorer.score(text="written in c++", early_exit=False).counts == {"c++": 1, "a.b": 0}
+    assert scorer.score(text="cc and axb", early_exit=False).score == 0
+
+
+def test_script_patterns_escape_javascript_specials():
+    scorer = KeywordScorer.from_prompt(raw="secure c++/key", threshold=1)
+
+    assert scorer.script_patterns()[0]["source"] == r"secure\s+c\+\+\/key"
+
+
+def test_from_script_result_restores_keyword_order():
+    scorer = KeywordScorer.from_prompt(raw="crypt:2, secure key", threshold=3)
+
+    score = scorer.from_script_result(result={
+        "counts": [1, 2],
+        "score": 5,
+        "stopped_early": True,
+        "offsets": [["secure key", 2], ["crypt", 30]],
+    })
+
+    assert score.counts == {"crypt": 2, "secure key": 1}
+    assert score.offsets == [("secure key", 2), ("crypt", 30)]
+    assert score.passed
+
+
+def test_empty_keywords_disable_the_check():
+    scorer = KeywordScorer.from_prompt(raw=" , :2", threshold=10)
+
+    assert not scorer.enabled
+    assert scorer.script_patterns() == []
+    assert scorer.score(text=TEXT).passed
@@ -0,0 +1,77 @@
+import os
+
+from general_classes import page_cache
+from general_classes.page_cache import PageCache
+
+URLS = [f"https://patents.example/patent/US900000{number}B2/en" for number in range(4)]
+CONTENT = "<html>" + "patent text " * 200 + "</html>"
+
+
+def cache_files(directory) -> dict:
+    return {
+        name: os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.endswith(PageCache.FILE_SUFFIX)
+    }
+
+
+def entry_size(tmp_path) -> int:
+    cache = PageCache(directory=str(tmp_path / "probe"))
+    cache.put(url=URLS[0], content=CONTENT)
+    return sum(cache_files(tmp_path / "probe").values())
+
+
+def test_canonical_url_ignores_query_order_and_fragment():
+    assert PageCache.canonical_url("HTTPS://Patents.example/patent/US1/en/?b=2&a=1#claims") == (
+        "https://patents.example/patent/US1/en?a=1&b=2"
+    )
+
+
+def test_roundtrip_and_expiry(tmp_path, monkeypatch):
+    cache = PageCache(directory=str(tmp_path), ttl=60)
+    cache.put(url=URLS[0], content=CONTENT)
+    stored_at = page_cache.time.time()
+
+    assert cache.get(url=f"{URLS[0]}/") == CONTENT
+    monkeypatch.setattr(page_cache.time, "time", lambda: stored_at + 61)
+    assert cache.get(url=URLS[0]) is None
+    assert cache_files(tmp_path) == {}
+
+
+def test_corrupted_entry_is_a_miss(tmp_path):
+    cache = PageCache(directory=str(tmp_path))
+    cache.put(url=URLS[0], content=CONTENT)
+    for root, _, names in os.walk(tmp_path):
+        for name in names:
+            with open(os.path.join(root, name), "wb") as file:
+                file.write(b"broken")
+
+    assert cache.get(url=URLS[0]) is None
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    size = entry_size(tmp_path)
+    cache = PageCache(directory=str(tmp_path / "cache"), max_bytes=size * 3 + size // 2)
+    for url in URLS[:3]:
+        cache.put(url=url, content=CONTENT)
+
+    assert cache.get(url=URLS[0]) == CONTENT
+    cache.put(url=URLS[3], content=CONTENT)
+
+    assert cache.get(url=URLS[1]) is None
+    for url in (URLS[0], URLS[2], URLS[3]):
+        assert cache.get(url=url) == CONTENT
+    assert len(cache_files(tmp_path / "cache")) == 3
+
+
+def test_index_is_rebuilt_and_trimmed_on_start(tmp_path):
+    size = entry_size(tmp_path)
+    directory = str(tmp_path / "cache")
+    cache = PageCache(directory=directory)
+    for url in URLS:
+        cache.put(url=url, content=CONTENT)
+
+    PageCache(directory=directory, max_bytes=size * 2 + size // 2)
+
+    assert len(cache_files(directory)) == 2
@@ -0,0 +1,98 @@
+import os
+import re
+from functools import partial
+from http.server import BaseHTTPRequestHandler
+from typing import List, Optional
+from urllib.parse import urljoin
+
+from general_classes.http_client import HttpClient
+from general_classes.local_server import LocalHttpServer
+from general_classes.pdf_downloader import PdfDownloadManager
+
+PDF = bytes(range(256)) * 1024
+RANGE_REGEX = re.compile(r"bytes=(\d+)-$")
+
+
+class PdfRequestHandler(BaseHTTPRequestHandler):
+
+    def __init__(self, *args, ranges: List[Optional[str]], honor_range: bool, failures: int = 0, **kwargs) -> None:
+        self._ranges = ranges
+        self._honor_range = honor_range
+        self._failures = failures
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        requested = self.headers.get("Range")
+        self._ranges.append(requested)
+        if len(self._ranges) <= self._failures:
+            self.send_error(503)
+            return
+        match = RANGE_REGEX.match(requested or "")
+        if match is None or not self._honor_range:
+            self._send(status=200, body=PDF)
+            return
+        offset = int(match.group(1))
+        if offset >= len(PDF):
+            self.send_error(416)
+            return
+        self._send(status=206, body=PDF[offset:], content_range=f"bytes {offset}-{len(PDF) - 1}/{len(PDF)}")
+
+    def _send(self, status: int, body: bytes, content_range: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        if content_range is not None:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        ...
+
+
+def download(tmp_path, honor_range: bool, part: bytes) -> List[Optional[str]]:
+    ranges = []
+    handler = partial(PdfRequestHandler, ranges=ranges, honor_range=honor_range)
+    target = str(tmp_path / "US1.pdf")
+    with open(f"{target}{PdfDownloadManager.PART_SUFFIX}", "wb") as file:
+        file.write(part)
+    with LocalHttpServer(handler=handler) as server:
+        with PdfDownloadManager(client=HttpClient(pool_size=2, retries=0, governor=None)) as downloader:
+            assert downloader.submit(url=urljoin(server.base_url, "US1.pdf"), target=target).result() == target
+    with open(target, "rb") as file:
+        assert file.read() == PDF
+    assert not os.path.exists(f"{target}{PdfDownloadManager.PART_SUFFIX}")
+    return ranges
+
+
+def test_resumes_partial_file_with_range_request(tmp_path):
+    assert download(tmp_path, honor_range=True, part=PDF[:100000]) == ["bytes=100000-"]
+
+
+def test_restarts_when_server_ignores_range(tmp_path):
+    assert download(tmp_path, honor_range=False, part=PDF[:100000]) == ["bytes=100000-"]
+
+
+def test_restarts_when_partial_file_is_too_long(tmp_path):
+    assert download(tmp_path, honor_range=True, part=PDF + b"tail") == [f"bytes={len(PDF) + 4}-", None]
+
+
+def test_downloads_from_scratch_with_empty_partial_file(tmp_path):
+    assert download(tmp_path, honor_range=True, part=b"") == [None]
+
+
+def test_failed_download_can_be_submitted_again(tmp_path):
+    ranges = []
+    handler = partial(PdfRequestHandler, ranges=ranges, honor_range=True, failures=1)
+    target = str(tmp_path / "US1.pdf")
+    with LocalHttpServer(handler=handler) as server:
+        url = urljoin(server.base_url, "US1.pdf")
+        client = HttpClient(pool_size=2, retries=0, governor=None)
+        with PdfDownloadManager(client=client, max_attempts=1) as downloader:
+            assert downloader.submit(url=url, target=target).result() is None
+            linked = str(tmp_path / "copy.pdf")
+            assert downloader.submit(url=url, target=linked).result() == linked
+            assert downloader.submit(url=url, target=target).result() == target
+            assert len(downloader.futures_under(directory=str(tmp_path))) == 2
+
+    assert len(ranges) == 2
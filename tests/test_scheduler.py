@@ -0,0 +1,117 @@
+import threading
+
+from thread_patents_parser.scheduler import WorkQueue, ResourceTimeoutError, run_worker, start_stage
+
+
+def closed_queue(items, max_attempts: int = 3) -> WorkQueue:
+    queue = WorkQueue(max_attempts=max_attempts)
+    for item in items:
+        queue.put(item)
+    queue.close()
+    return queue
+
+
+def test_larger_items_are_taken_first():
+    queue = WorkQueue()
+    for item, size in (("small", 1), ("large", 5), ("medium", 3), ("second small", 1)):
+        queue.put(item, size=size)
+    queue.close()
+
+    taken = []
+    while (work_item := queue.get(worker="w1")) is not None:
+        taken.append(work_item.item)
+        queue.task_done()
+
+    assert taken == ["large", "medium", "small", "second small"]
+
+
+def test_idle_worker_takes_items_while_other_is_busy():
+    queue = closed_queue(items=["slow", "a", "b", "c"])
+    others_done = threading.Event()
+    processed = {}
+
+    def target(links) -> None:
+        for item in links:
+            processed[item] = threading.current_thread().name
+            if item == "slow":
+                assert others_done.wait(timeout=5)
+            elif len(processed) == 4:
+                others_done.set()
+
+    start_stage(target, queue, 2, name="Stage").join(timeout=10)
+
+    slow_worker = processed.pop("slow")
+    assert set(processed) == {"a", "b", "c"}
+    assert set(processed.values()) == {"Stage 1", "Stage 2"} - {slow_worker}
+
+
+def test_failed_item_goes_to_another_worker():
+    queue = closed_queue(items=["bad", "good"])
+    work_item = queue.get(worker="w1")
+    queue.retry(work_item=work_item, worker="w1")
+
+    assert queue.get(worker="w1").item == "good"
+    assert queue.get(worker="w2").item == "bad"
+
+
+def test_failed_item_returns_to_same_worker_when_nothing_else_is_left():
+    queue = closed_queue(items=["bad"])
+    queue.retry(work_item=queue.get(worker="w1"), worker="w1")
+
+    assert queue.get(worker="w1").item == "bad"
+
+
+def test_item_is_dropped_after_max_attempts():
+    queue = closed_queue(items=["bad"], max_attempts=2)
+    for worker in ("w1", "w2"):
+        queue.retry(work_item=queue.get(worker=worker), worker=worker)
+
+    assert len(queue) == 0
+    assert queue.get(worker="w3") is None
+
+
+def test_resource_timeout_requeues_without_counting_an_attempt():
+    queue = closed_queue(items=["patent"], max_attempts=1)
+    processed = []
+
+    def target(links) -> None:
+        for item in links:
+            if not processed:
+                processed.append(None)
+                raise ResourceTimeoutError("браузер не выдан")
+            processed.append(item)
+
+    run_worker(target, queue, 1)
+
+    assert processed == [None, "patent"]
+
+
+def test_worker_stops_after_restart_budget():
+    queue = closed_queue(items=[f"bad {number}" for number in range(5)], max_attempts=1)
+    calls = []
+
+    def target(links) -> None:
+        for item in links:
+            calls.append(item)
+            raise ValueError(item)
+
+    run_worker(target, queue, 2)
+
+    assert calls == ["bad 0", "bad 1", "bad 2"]
+    assert len(queue) == 2
+
+
+def test_restart_budget_is_restored_after_completed_items():
+    items = ["bad 0", "good 1", "bad 2", "good 3", "bad 4", "good 5", "bad 6"]
+    queue = closed_queue(items=items, max_attempts=1)
+    calls = []
+
+    def target(links) -> None:
+        for item in links:
+            calls.append(item)
+            if item.startswith("bad"):
+                raise ValueError(item)
+
+    run_worker(target, queue, 1)
+
+    assert calls == items
@@ -0,0 +1,84 @@
+import pytest
+
+from general_classes.http_client import HttpClient
+from general_classes.local_server import SearchStubHttpServer
+from general_classes.search_client import PatentsSearchClient
+from thread_patents_parser.functions_performed import parse_patents_inventors_links
+from thread_patents_parser.inventors_links_parser import InventorQueryBuilder
+
+MAIN_LINKS = [f"patent/US{9000000 + number}B2/en" for number in range(250)]
+INVENTOR_LINKS = {
+    "Jane Doe": ["patent/US9000001B2/en", "patent/US9000007B2/en"],
+    "Ivan Petrov": ["patent/US9000002B2/en"],
+}
+REQUEST = "(H04L9) assignee:raytheon country:US language:ENGLISH"
+
+
+@pytest.fixture()
+def stub():
+    with SearchStubHttpServer(links=MAIN_LINKS, inventors=INVENTOR_LINKS) as server:
+        yield server
+
+
+@pytest.fixture()
+def search_client(stub):
+    client = HttpClient(pool_size=4, retries=0, governor=None)
+    return PatentsSearchClient(client=client, base_url=stub.base_url, max_workers=2)
+
+
+def test_collects_every_page_in_order(stub, search_client):
+    links = search_client.collect_links(query=PatentsSearchClient.build_query(request=REQUEST))
+
+    assert [element["link"] for element in links] == MAIN_LINKS
+    assert sorted(int(query["page"][0]) for query in stub.queries) == [0, 1, 2]
+
+
+def test_sends_num_page_and_original_query(stub, search_client):
+    search_client.collect_links(query=PatentsSearchClient.build_query(request=REQUEST))
+
+    for query in stub.queries:
+        assert query["num"] == [str(PatentsSearchClient.RESULTS_PER_PAGE)]
+        assert query["q"] == [REQUEST]
+
+
+def test_filters_by_inventor_query(stub, search_client):
+    builder = InventorQueryBuilder(request_params_before="(H04L9)", request_params_after="country:US+language:ENGLISH")
+    link = builder.convert(data=[builder.build(name="Jane Doe")])[0]["link"]
+
+    links = search_client.collect_links(query=PatentsSearchClient.query_from_link(link=link))
+
+    assert [element["link"] for element in links] == INVENTOR_LINKS["Jane Doe"]
+    assert stub.queries[0]["inventor"] == ["Jane Doe"]
+
+
+def test_stops_after_first_page_without_results(stub, search_client):
+    links = search_client.collect_links(query="q=nothing&inventor=Nobody")
+
+    assert links == []
+    assert len(stub.queries) == 1
+
+
+def test_unreachable_api_returns_none():
+    with SearchStubHttpServer(links=MAIN_LINKS) as server:
+        base_url = server.base_url
+    client = PatentsSearchClient(client=HttpClient(pool_size=1, retries=0, timeout=1.0, governor=None), base_url=base_url)
+
+    assert client.collect_links(query=PatentsSearchClient.build_query(request=REQUEST)) is None
+
+
+class UnusedPool:
+
+    def lend(self):
+        raise AssertionError("Браузер не должен запрашиваться, если API ответил")
+
+
+def test_inventor_links_from_api_do_not_lend_browser(search_client):
+    builder = InventorQueryBuilder(request_params_before="(H04L9)", request_params_after="country:US+language:ENGLISH")
+    element = builder.convert(data=[builder.build(name="Jane Doe")])[0]
+
+    result = parse_patents_inventors_links(element, UnusedPool(), search_client)
+
+    assert [inventor["name"] for inventor in result] == ["Jane_Doe"]
+    assert sorted(result[0]["links"]) == sorted(
+        f"{PatentsSearchClient.BASE_URL}{link}" for link in INVENTOR_LINKS["Jane Doe"]
+    )
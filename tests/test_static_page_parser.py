@@ -0,0 +1,122 @@
+import os
+import shutil
+from urllib.parse import urljoin
+
+import pytest
+
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import ExtractionModeEnum
+from general_classes.html_extractor import PatentHtmlExtractor
+from general_classes.http_client import HttpClient, HttpPageFetcher
+from general_classes.local_server import FixtureHttpServer
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.static_page_parser import StaticPageParserMixin
+from general_classes.type_annotations import State
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+PATENT_PATH = "patent/US9876543B2/en"
+STATE_FIELDS = (
+    "title", "patent_code", "country", "priority_date", "publication_date",
+    "abstract", "inventors", "current_assignee", "classification_codes",
+)
+EXPECTED_STATE = {
+    "title": "Secure key exchange for a network channel",
+    "patent_code": "US9876543B2",
+    "country": "United States",
+    "priority_date": "17.04.2013",
+    "publication_date": "23.01.2018",
+    "abstract": "A secure crypt module derives a session key for the network channel & signs it.",
+    "inventors": ["Jane Q. Doe", "Ivan Petrov"],
+    "current_assignee": ["Raytheon Company"],
+    "classification_codes": "H04L9/0819, H04L9/3247, G06F21/602, H04L2209/80",
+}
+
+
+@pytest.fixture(scope="module")
+def fixture_server():
+    with FixtureHttpServer(directory=FIXTURES_DIR) as server:
+        yield server
+
+
+@pytest.fixture()
+def fetcher():
+    return HttpPageFetcher(client=HttpClient(pool_size=2, retries=0, governor=None))
+
+
+def test_static_extraction_matches_recorded_state(fixture_server, fetcher):
+    link = urljoin(fixture_server.base_url, PATENT_PATH)
+    page = PatentHtmlExtractor().extract(html=fetcher.fetch(url=link), url=link)
+
+    assert page["pdf_link"] == urljoin(fixture_server.base_url, "/pdf/US9876543B2.pdf")
+    assert ", ".join(page["classification_codes"]) == EXPECTED_STATE["classification_codes"]
+    for field in STATE_FIELDS[:-1]:
+        assert page[field] == EXPECTED_STATE[field], field
+    assert "session key" in page["text"]
+
+
+def test_static_extraction_reports_missing_fields(fixture_server):
+    with open(os.path.join(FIXTURES_DIR, f"{PATENT_PATH}.html"), "r", encoding="utf-8") as file:
+        html = file.read()
+    html = html.replace("<p>United States</p>", "").replace('class="important-people"', 'class="people"')
+
+    page = PatentHtmlExtractor().extract(html=html, url=urljoin(fixture_server.base_url, PATENT_PATH))
+
+    assert page["country"] is None
+    assert page["inventors"] is None and page["current_assignee"] is None
+    assert page["title"] == EXPECTED_STATE["title"]
+
+
+class StaticOnlyParser(StaticPageParserMixin):
+
+    def __init__(self, fetcher: HttpPageFetcher) -> None:
+        self._state = State()
+        self._init_static_parser(fetcher=fetcher)
+
+
+def test_patent_code_missing_from_html_is_taken_from_link(fixture_server, fetcher, monkeypatch):
+    extract = PatentHtmlExtractor.extract
+
+    def extract_without_code(extractor, html, url):
+        page = extract(extractor, html=html, url=url)
+        page["patent_code"] = None
+        return page
+
+    monkeypatch.setattr(PatentHtmlExtractor, "extract", extract_without_code)
+    page = StaticOnlyParser(fetcher=fetcher)._load_page(link=urljoin(fixture_server.base_url, PATENT_PATH))
+
+    assert page["patent_code"] == EXPECTED_STATE["patent_code"]
+    assert page["title"] == EXPECTED_STATE["title"]
+
+
+@pytest.mark.skipif(shutil.which("chromedriver") is None, reason="chromedriver не установлен")
+def test_static_state_matches_selenium_state(fixture_server, fetcher, tmp_path):
+    from thread_patents_parser.functions_performed import create_driver
+    from thread_patents_parser.patents_links_parser import SeleniumPatentsParser
+
+    link = urljoin(fixture_server.base_url, PATENT_PATH)
+    driver = create_driver(path_to_chrome_driver="chromedriver", tmp_dir=str(tmp_path))
+    downloader = PdfDownloadManager(client=HttpClient(pool_size=2, retries=0, governor=None))
+    try:
+        states = {}
+        for name, page_fetcher in (("static", fetcher), ("selenium", None)):
+            patent_dir = tmp_path / name
+            patent_dir.mkdir()
+            parser = SeleniumPatentsParser(
+                driver=driver,
+                tmp_dir=str(tmp_path),
+                classification_matcher=ClassificationMatcher.from_spec(spec="H04L9"),
+                keyword="crypt",
+                min_keyword_count=1,
+                fetcher=page_fetcher,
+                extraction_mode=ExtractionModeEnum.ELEMENTS,
+                downloader=downloader,
+            )
+            parser.set_links(links=[link])
+            parser.parse_patents_links(patent_dir=str(patent_dir))
+            states[name] = parser.get_state()[0]
+    finally:
+        downloader.close()
+        driver.quit()
+
+    for field in STATE_FIELDS:
+        assert states["static"][field] == states["selenium"][field] == EXPECTED_STATE[field], field
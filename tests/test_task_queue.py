@@ -0,0 +1,100 @@
+import pytest
+
+from general_classes.enums import LedgerStageEnum
+from general_classes.local_server import TaskQueueHttpServer
+from general_classes.rate_governor import RateGovernor
+from general_classes.task_queue import SqliteTaskQueue, TaskQueueService, RemoteTaskQueue, TaskQueueError
+
+TOKEN = "secret"
+
+
+@pytest.fixture()
+def queue(tmp_path):
+    task_queue = SqliteTaskQueue(path=str(tmp_path / "tasks.sqlite3"), max_attempts=2)
+    yield task_queue
+    task_queue.close()
+
+
+@pytest.fixture()
+def governor():
+    return RateGovernor(requests_per_second=5.0, burst=1)
+
+
+@pytest.fixture()
+def server(queue, governor):
+    service = TaskQueueService(queue=queue, governor=governor)
+    with TaskQueueHttpServer(service=service, token=TOKEN, host="127.0.0.1", port=0) as queue_server:
+        yield queue_server
+
+
+@pytest.fixture()
+def remote(server):
+    client = RemoteTaskQueue(base_url=server.base_url, token=TOKEN, pool_size=2)
+    yield client
+    client.close()
+
+
+def test_remote_lease_complete_adds_children(queue, remote):
+    queue.set_settings(settings={"keyword": "crypt"})
+    queue.put(stage=LedgerStageEnum.MAIN_LINKS, tasks=[("request", {"request": "H04L9"})])
+
+    assert remote.settings() == {"keyword": "crypt"}
+    stage, key, payload = remote.lease(owner="host:1", visibility_timeout=60.0)
+    assert (stage, key, payload) == (LedgerStageEnum.MAIN_LINKS, "request", {"request": "H04L9"})
+    assert remote.extend_lease(stage=stage, key=key, owner="host:1", visibility_timeout=60.0)
+    assert not remote.extend_lease(stage=stage, key=key, owner="host:2", visibility_timeout=60.0)
+
+    assert remote.complete(
+        stage=stage,
+        key=key,
+        owner="host:1",
+        result={"count": 1},
+        children={LedgerStageEnum.INVENTORS: [("link", {"link": "patent/US1/en"})]},
+        priorities={LedgerStageEnum.INVENTORS: 1},
+    )
+    assert queue.results(stage=LedgerStageEnum.MAIN_LINKS) == [("request", {"count": 1})]
+    assert remote.lease(owner="host:1", visibility_timeout=60.0)[:2] == (LedgerStageEnum.INVENTORS, "link")
+
+
+def test_remote_fail_returns_task_then_drops_it(queue, remote):
+    queue.put(stage=LedgerStageEnum.AUTHORS, tasks=[("jane doe", {"name": "Jane Doe"})])
+
+    for _ in range(2):
+        stage, key, _ = remote.lease(owner="host:1", visibility_timeout=60.0)
+        remote.fail(stage=stage, key=key, owner="host:1")
+
+    assert remote.lease(owner="host:1", visibility_timeout=60.0) is None
+    assert remote.unfinished() == 0
+    assert remote.summary() == {"authors": {"failed": 1}}
+
+
+def test_permits_are_shared_between_clients(server):
+    first = RemoteTaskQueue(base_url=server.base_url, token=TOKEN, pool_size=1)
+    second = RemoteTaskQueue(base_url=server.base_url, token=TOKEN, pool_size=1)
+
+    delays = [client.reserve_permit() for client in (first, second, first, second)]
+
+    assert delays[0] == pytest.approx(0.0, abs=0.05)
+    assert delays == sorted(delays)
+    assert delays[-1] == pytest.approx(0.6, abs=0.1)
+
+
+def test_failure_report_lowers_global_rate(remote, governor):
+    assert remote.report_rate(failure="статус ответа 429") == pytest.approx(2.5)
+    assert governor.rate == pytest.approx(2.5)
+
+
+def test_rejects_wrong_token(server):
+    with pytest.raises(TaskQueueError):
+        RemoteTaskQueue(base_url=server.base_url, token="wrong").settings()
+
+
+def test_only_current_lease_owner_can_finish_task(queue):
+    queue.put(stage=LedgerStageEnum.AUTHORS, tasks=[("jane doe", {"name": "Jane Doe"})])
+    stage, key, _ = queue.lease(owner="host:1:first", visibility_timeout=-1.0)
+    assert queue.lease(owner="host:1:second", visibility_timeout=60.0)[:2] == (stage, key)
+
+    assert not queue.complete(stage=stage, key=key, owner="host:1:first", result={"count": 1})
+    assert not queue.fail(stage=stage, key=key, owner="host:1:first")
+    assert queue.complete(stage=stage, key=key, owner="host:1:second", result={"count": 2})
+    assert queue.results(stage=LedgerStageEnum.AUTHORS) == [("jane doe", {"count": 2})]
@@ -1,22 +1,30 @@
 import time
-from typing import List, Dict
+from enum import Enum
+from typing import List, Dict, Optional
 
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 
-from general_classes.enums import SearchItems
+from general_classes.browser_scripts import EXTRACT_RESULT_CARDS
+from general_classes.enums import SearchItems, ReadySignalElements
 from general_classes.logger import Message
+from general_classes.rate_governor import RATE_GOVERNOR
+from general_classes.result_cards import ResultCardReader
+from general_classes.search_client import PatentsSearchClient
+from general_classes.statistics import STATISTICS
+from general_classes.wait_engine import PageReadinessWaiter
 
 
 class SeleniumBaseParser:
+    READY_SIGNAL = ReadySignalElements.patent_result
 
-    def __init__(self, driver: webdriver.Chrome) -> None:
+    def __init__(self, driver: webdriver.Chrome, selector_timeouts: Optional[Dict[str, float]] = None) -> None:
         self._driver = driver
-        self._driver.implicitly_wait(time_to_wait=6)
-        self._driver.maximize_window()
+        self._waiter = PageReadinessWaiter(driver=self._driver, timeouts=selector_timeouts)
         self._links = []
 
     def close_browser(self) -> None:
@@ -26,12 +34,51 @@ class SeleniumBaseParser:
     def set_links(self, links: List[Dict]) -> None:
         self._links = links
 
-    def _follow_the_link(self, link: str) -> None:
+    def _follow_the_link(self, link: str, ready_signal: Optional[ReadySignalElements] = None) -> None:
+        RATE_GOVERNOR.run(
+            load=lambda: self._load_link(link=link, ready_signal=ready_signal or self.READY_SIGNAL),
+            failure_reason=f"страница не загрузилась: {link}",
+        )
+
+    def _load_link(self, link: str, ready_signal: ReadySignalElements) -> bool:
+        started_at = time.monotonic()
         self._driver.get(url=link)
+        STATISTICS.observe("driver.get", time.monotonic() - started_at)
+        ready = self._waiter.wait_until_ready(signal=ready_signal)
+        STATISTICS.add_time("browser.page_load", time.monotonic() - started_at)
+        STATISTICS.increment("browser.page_loads")
+        return ready
+
+    def _find_element(self, element: Enum, xpath: Optional[str] = None) -> WebElement:
+        return self._waiter.find_element(element=element, xpath=xpath)
+
+    def _find_elements(self, element: Enum, xpath: Optional[str] = None) -> List[WebElement]:
+        return self._waiter.find_elements(element=element, xpath=xpath)
 
 
 class SeleniumLinksParser(SeleniumBaseParser):
     BASE_URL = "https://patents.google.com/"
+    MAX_EMPTY_PAGES = 3
+    READY_SIGNAL = ReadySignalElements.search_results
+
+    def __init__(self, driver: webdriver.Chrome, search_client: Optional[PatentsSearchClient] = None) -> None:
+        super().__init__(driver)
+        self._search_client = search_client
+
+    def _collect_links_from_api(self, query: str) -> Optional[List[Dict]]:
+        if self._search_client is None:
+            return None
+        links = self._search_client.collect_links(query=query)
+        if links is None:
+            Message.warning_message("Сбор ссылок по API не удался, используется пагинация в браузере.")
+        return links
+
+    def _collect_links_from_browser(self, link: str) -> List[Dict]:
+        self._follow_the_link(link=link)
+        links = []
+        if self._check_result():
+            self._add_links_to_list(list_=links)
+        return links
 
     def _add_links_to_list(self, list_: List, all_result: bool = False) -> None:
         links_number = self._find_total_items_result()
@@ -39,53 +86,70 @@ class SeleniumLinksParser(SeleniumBaseParser):
             self._add_more_result_per_page()
         Message.info_message(f"Всего результатов на странице: {links_number}")
         total_added = 0
+        empty_pages = 0
         while total_added < links_number:
-            time.sleep(1)
-            links_elements = self._driver.find_elements(
-                by=By.XPATH, value=SearchItems.result_items.value
-            )
-            links_to_str = [
-                {"link": element.get_attribute("data-result")} for element in links_elements
-            ]
+            links_to_str = self._read_result_cards()
+            if not links_to_str:
+                empty_pages += 1
+                RATE_GOVERNOR.report_failure(reason="пустая страница результатов")
+                if empty_pages >= self.MAX_EMPTY_PAGES:
+                    Message.warning_message("Страница результатов пуста, сбор ссылок остановлен.")
+                    break
+                RATE_GOVERNOR.acquire()
+                continue
+            empty_pages = 0
             len_links_to_str = len(links_to_str)
             total_added += len_links_to_str
             Message.info_message(
                 f"Добавлено ссылок: {len_links_to_str}. Всего добавлено: {total_added}"
             )
             list_.extend(links_to_str)
-            self._click_to_next_button(xpath=SearchItems.next_button.value)
+            if total_added < links_number:
+                RATE_GOVERNOR.acquire()
+                if self._click_to_next_button(xpath=SearchItems.next_button.value):
+                    self._waiter.wait_for_attribute_change(
+                        element=SearchItems.result_items,
+                        attribute="data-result",
+                        previous=links_to_str[0]["link"],
+                    )
+
+    def _read_result_cards(self) -> List[Dict]:
+        links_elements = self._find_elements(element=SearchItems.result_items)
+        cards = self._driver.execute_script(EXTRACT_RESULT_CARDS, SearchItems.result_cards.value) or []
+        if len(cards) != len(links_elements):
+            Message.warning_message("Карточки результатов не распознаны, сохраняются только ссылки.")
+            return [{"link": element.get_attribute("data-result")} for element in links_elements]
+        STATISTICS.increment("cards.collected", len(cards))
+        return [{"link": card["link"], "card": ResultCardReader.from_script(raw=card)} for card in cards]
 
     def _check_result(self) -> bool:
         try:
-            self._driver.find_element(
-                by=By.XPATH, value=SearchItems.no_result_message.value
-            )
+            self._find_element(element=SearchItems.no_result_message)
             return False
         except NoSuchElementException:
             return True
 
     def _add_more_result_per_page(self) -> None:
-        more_result_button = self._driver.find_element(by=By.XPATH, value=SearchItems.result_in_page_button.value)
+        more_result_button = self._find_element(element=SearchItems.result_in_page_button)
         self._driver.execute_script("arguments[0].click();", more_result_button)
-        max_result_button = self._driver.find_element(by=By.XPATH, value=SearchItems.one_hundred_results_per_page.value)
+        max_result_button = self._find_element(element=SearchItems.one_hundred_results_per_page)
         self._driver.execute_script("arguments[0].click();", max_result_button)
 
-    def _click_to_next_button(self, xpath: str) -> None:
+    def _click_to_next_button(self, xpath: str) -> bool:
         try:
             button = WebDriverWait(self._driver, 5).until(
                 ec.element_to_be_clickable((By.XPATH, xpath))
             )
             button.click()
             Message.info_message("Переход на следующую страницу...")
+            return True
         except TimeoutException:
             Message.warning_message('Кнопка "следующая страница" не найдена.')
-            ...
+            return False
 
     def _find_total_items_result(self) -> int:
         try:
-            result = self._driver.find_element(
-                by=By.XPATH, value=SearchItems.num_result.value
-            )
+            result = self._find_element(element=SearchItems.num_result)
         except NoSuchElementException:
             Message.warning_message('Элемент "Всего результатов" не найден')
             result = "0"
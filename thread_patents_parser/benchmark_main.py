@@ -0,0 +1,148 @@
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+from general_classes.benchmark import (
+    BenchmarkRunner, count_webdriver_calls, parse_latency, save_baseline, load_baseline, compare_with_baseline,
+)
+from general_classes.benchmark_fixtures import PatentFixtures
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import ExtractionModeEnum, BrowserProfileEnum
+from general_classes.file_services import MakeDirManager
+from general_classes.http_client import HttpClient, HttpPageFetcher
+from general_classes.local_server import PatentsStandInServer
+from general_classes.logger import Message
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.rate_governor import RATE_GOVERNOR
+from general_classes.search_client import PatentsSearchClient
+from general_classes.statistics import STATISTICS
+from thread_patents_parser.benchmark_scenarios import (
+    StandInContext, ApiMainQueryScenario, ApiInventorExpansionScenario, HttpDetailParseScenario, DownloadScenario,
+    BrowserMainQueryScenario, BrowserInventorExpansionScenario, BrowserDetailParseScenario,
+)
+from thread_patents_parser.distributed import parse_option
+from thread_patents_parser.driver_pool import WebDriverPool
+from thread_patents_parser.functions_performed import create_driver
+
+HTTP_MODE = "http"
+BROWSER_MODE = "browser"
+BENCHMARK_REQUEST = "(H04L9) assignee:raytheon country:US language:ENGLISH"
+REQUEST_PARAMS_BEFORE = "(H04L9)"
+REQUEST_PARAMS_AFTER = "country:US+language:ENGLISH"
+CLASSIFICATION_SPEC = "H04L9"
+KEYWORD = "crypt, secure key:2"
+MIN_KEYWORD_COUNT = 3
+EXTRACTION_MODE = ExtractionModeEnum.SCRIPT
+BROWSER_PROFILE = BrowserProfileEnum.SCRAPING
+DEFAULT_PATENTS_COUNT = 200
+DEFAULT_INVENTORS_COUNT = 60
+DEFAULT_THREADS_COUNT = 4
+DEFAULT_ITERATIONS = 3
+DEFAULT_LATENCY = "search:0.2,api:0.05,patent:0.3,pdf:0.1"
+PDF_DOWNLOAD_WORKERS = 4
+BENCHMARK_REQUESTS_PER_SECOND = 1000.0
+REGRESSION_TOLERANCE = 0.1
+
+
+if __name__ == '__main__':
+    path_to_chrome_driver = 'chromedriver'
+    mode = parse_option(argv=sys.argv, name="mode", default=HTTP_MODE)
+    if mode not in (HTTP_MODE, BROWSER_MODE):
+        Message.error_message(f"Неизвестный режим бенчмарка: {mode}. Доступные режимы: {HTTP_MODE}, {BROWSER_MODE}")
+        sys.exit()
+    settings = {
+        "mode": mode,
+        "patents": int(parse_option(argv=sys.argv, name="patents", default=str(DEFAULT_PATENTS_COUNT))),
+        "inventors": int(parse_option(argv=sys.argv, name="inventors", default=str(DEFAULT_INVENTORS_COUNT))),
+        "threads": int(parse_option(argv=sys.argv, name="threads", default=str(DEFAULT_THREADS_COUNT))),
+        "iterations": int(parse_option(argv=sys.argv, name="iterations", default=str(DEFAULT_ITERATIONS))),
+        "latency": parse_latency(value=parse_option(argv=sys.argv, name="latency", default=DEFAULT_LATENCY)),
+    }
+    baseline_path = parse_option(argv=sys.argv, name="baseline")
+    save_path = parse_option(argv=sys.argv, name="save")
+
+    start_time = datetime.now()
+    RATE_GOVERNOR.configure(requests_per_second=BENCHMARK_REQUESTS_PER_SECOND)
+    work_dir = tempfile.mkdtemp(prefix="patents_benchmark_")
+    fixtures = PatentFixtures(
+        patents_count=settings["patents"],
+        inventors_count=settings["inventors"],
+        recorded_dir=parse_option(argv=sys.argv, name="recorded"),
+    )
+    classification_matcher = ClassificationMatcher.from_spec(spec=CLASSIFICATION_SPEC)
+    http_client = HttpClient(pool_size=settings["threads"] * 2)
+    downloader = PdfDownloadManager(client=http_client, max_workers=PDF_DOWNLOAD_WORKERS)
+    pool = None
+    try:
+        with PatentsStandInServer(fixtures=fixtures, latency=settings["latency"]) as server:
+            context = StandInContext(
+                fixtures=fixtures,
+                base_url=server.base_url,
+                request=BENCHMARK_REQUEST,
+                request_params_before=REQUEST_PARAMS_BEFORE,
+                request_params_after=REQUEST_PARAMS_AFTER,
+                work_dir=work_dir,
+            )
+            if mode == HTTP_MODE:
+                search_client = PatentsSearchClient(client=http_client, base_url=server.base_url)
+                scenarios = [
+                    ApiMainQueryScenario(
+                        context=context, search_client=search_client, iterations=settings["iterations"]
+                    ),
+                    ApiInventorExpansionScenario(context=context, search_client=search_client),
+                    HttpDetailParseScenario(
+                        context=context,
+                        fetcher=HttpPageFetcher(client=http_client),
+                        classification_matcher=classification_matcher,
+                    ),
+                ]
+            else:
+                browser_dir = MakeDirManager.make_temp_browser_dir(directory=os.path.join(work_dir, "browser"))
+                pool = WebDriverPool(
+                    factory=lambda: count_webdriver_calls(driver=create_driver(
+                        path_to_chrome_driver=path_to_chrome_driver,
+                        tmp_dir=browser_dir,
+                        profile=BROWSER_PROFILE,
+                    )),
+                    size=settings["threads"],
+                ).start()
+                scenarios = [
+                    BrowserMainQueryScenario(context=context, pool=pool, iterations=settings["iterations"]),
+                    BrowserInventorExpansionScenario(context=context, pool=pool),
+                    BrowserDetailParseScenario(
+                        context=context,
+                        pool=pool,
+                        classification_matcher=classification_matcher,
+                        keyword=KEYWORD,
+                        min_keyword_count=MIN_KEYWORD_COUNT,
+                        extraction_mode=EXTRACTION_MODE,
+                        downloader=downloader,
+                    ),
+                ]
+            scenarios.append(DownloadScenario(context=context, downloader=downloader))
+            results = BenchmarkRunner(threads_count=settings["threads"]).run(scenarios=scenarios)
+
+        if save_path:
+            save_baseline(path=save_path, results=results, settings=settings)
+        if baseline_path:
+            regressions = compare_with_baseline(
+                results=results,
+                baseline=load_baseline(path=baseline_path),
+                settings=settings,
+                tolerance=REGRESSION_TOLERANCE,
+            )
+            if not regressions:
+                Message.success_message("Ухудшений относительно базовой линии не найдено.")
+    except (FileNotFoundError, KeyError, IndexError, TypeError, ValueError) as Error:
+        Message.error_message(f"Ошибка в работе бенчмарка. Ошибка: {Error}.")
+    finally:
+        downloader.close()
+        if pool is not None:
+            pool.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+        execution_time = datetime.now() - start_time
+        Message.info_message(f"Время выполнения: {execution_time}")
+        STATISTICS.report()
+        Message.success_message("============== Завершение работы бенчмарка. ==============")
@@ -0,0 +1,213 @@
+import os
+from math import ceil
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from general_classes.benchmark import BenchmarkScenario
+from general_classes.benchmark_fixtures import PatentFixtures
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import ExtractionModeEnum
+from general_classes.file_services import MakeDirManager
+from general_classes.html_extractor import PatentHtmlExtractor
+from general_classes.http_client import HttpPageFetcher
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.search_client import PatentsSearchClient
+from thread_patents_parser.driver_pool import WebDriverPool
+from thread_patents_parser.inventors_links_parser import InventorQueryBuilder
+from thread_patents_parser.main_links_parser import SeleniumMainLinksParser
+from thread_patents_parser.patents_links_parser import SeleniumPatentsInventorsLinksParser, SeleniumPatentsParser
+
+BROWSER_RESULTS_PER_PAGE = 10
+
+
+def stand_in_parser(parser_class: type, base_url: str) -> type:
+    return type(f"StandIn{parser_class.__name__}", (parser_class,), {"BASE_URL": base_url})
+
+
+class StandInContext:
+
+    def __init__(
+        self,
+        fixtures: PatentFixtures,
+        base_url: str,
+        request: str,
+        request_params_before: str,
+        request_params_after: str,
+        work_dir: str,
+    ) -> None:
+        self.fixtures = fixtures
+        self.base_url = base_url
+        self.request = request
+        self.work_dir = work_dir
+        self.query_builder = InventorQueryBuilder(
+            request_params_before=request_params_before,
+            request_params_after=request_params_after,
+        )
+
+    def patent_links(self) -> List[str]:
+        return [urljoin(self.base_url, PatentFixtures.link(patent=patent)) for patent in self.fixtures.patents]
+
+    def inventor_links(self) -> List[Dict]:
+        return [
+            {"name": query["name"], "link": urljoin(self.base_url, query["query"])}
+            for query in (self.query_builder.build(name=name) for name in self.fixtures.inventors)
+        ]
+
+    def pdf_links(self) -> List[str]:
+        return [urljoin(self.base_url, f"pdf/{patent['patent_code']}.pdf") for patent in self.fixtures.patents]
+
+
+class ApiMainQueryScenario(BenchmarkScenario):
+    name = "main_query"
+
+    def __init__(self, context: StandInContext, search_client: PatentsSearchClient, iterations: int = 3) -> None:
+        self._context = context
+        self._search_client = search_client
+        self._iterations = iterations
+
+    def units(self) -> List[int]:
+        return list(range(self._iterations))
+
+    def run_unit(self, unit: int) -> int:
+        links = self._search_client.collect_links(query=PatentsSearchClient.build_query(request=self._context.request))
+        return max(ceil(len(links or []) / PatentsSearchClient.RESULTS_PER_PAGE), 1)
+
+
+class ApiInventorExpansionScenario(BenchmarkScenario):
+    name = "inventor_expansion"
+
+    def __init__(self, context: StandInContext, search_client: PatentsSearchClient) -> None:
+        self._context = context
+        self._search_client = search_client
+
+    def units(self) -> List[Dict]:
+        return self._context.inventor_links()
+
+    def run_unit(self, unit: Dict) -> int:
+        links = self._search_client.collect_links(query=PatentsSearchClient.query_from_link(link=unit["link"]))
+        return max(ceil(len(links or []) / PatentsSearchClient.RESULTS_PER_PAGE), 1)
+
+
+class HttpDetailParseScenario(BenchmarkScenario):
+    name = "detail_parse"
+
+    def __init__(
+        self,
+        context: StandInContext,
+        fetcher: HttpPageFetcher,
+        classification_matcher: ClassificationMatcher,
+    ) -> None:
+        self._context = context
+        self._fetcher = fetcher
+        self._classification_matcher = classification_matcher
+        self._extractor = PatentHtmlExtractor()
+
+    def units(self) -> List[str]:
+        return self._context.patent_links()
+
+    def run_unit(self, unit: str) -> int:
+        html = self._fetcher.fetch(url=unit)
+        if html is None:
+            return 0
+        page = self._extractor.extract(html=html, url=unit)
+        self._classification_matcher.decide(codes=page["classification_codes"] or [])
+        return 1
+
+
+class DownloadScenario(BenchmarkScenario):
+    name = "download"
+
+    def __init__(self, context: StandInContext, downloader: PdfDownloadManager) -> None:
+        self._context = context
+        self._downloader = downloader
+        self._directory = os.path.join(context.work_dir, self.name)
+        os.makedirs(self._directory, exist_ok=True)
+
+    def units(self) -> List[str]:
+        return self._context.pdf_links()
+
+    def run_unit(self, unit: str) -> int:
+        target = os.path.join(self._directory, os.path.basename(unit))
+        return 1 if self._downloader.submit(url=unit, target=target).result() is not None else 0
+
+
+class BrowserMainQueryScenario(BenchmarkScenario):
+    name = "main_query"
+
+    def __init__(self, context: StandInContext, pool: WebDriverPool, iterations: int = 3) -> None:
+        self._context = context
+        self._pool = pool
+        self._iterations = iterations
+        self._parser_class = stand_in_parser(parser_class=SeleniumMainLinksParser, base_url=context.base_url)
+
+    def units(self) -> List[int]:
+        return list(range(self._iterations))
+
+    def run_unit(self, unit: int) -> int:
+        with self._pool.lend() as chrome:
+            links = self._parser_class(driver=chrome, request=self._context.request).collect_links()
+        return max(ceil(len(links) / PatentsSearchClient.RESULTS_PER_PAGE), 1) + 1
+
+
+class BrowserInventorExpansionScenario(BenchmarkScenario):
+    name = "inventor_expansion"
+
+    def __init__(self, context: StandInContext, pool: WebDriverPool) -> None:
+        self._context = context
+        self._pool = pool
+        self._parser_class = stand_in_parser(
+            parser_class=SeleniumPatentsInventorsLinksParser, base_url=context.base_url
+        )
+
+    def units(self) -> List[Dict]:
+        return self._context.inventor_links()
+
+    def run_unit(self, unit: Dict) -> int:
+        with self._pool.lend() as chrome:
+            parser = self._parser_class(driver=chrome)
+            parser.set_links(links=[unit])
+            result = parser.collect_links()
+        links_count = sum(len(element["links"]) for element in result)
+        return max(ceil(links_count / BROWSER_RESULTS_PER_PAGE), 1)
+
+
+class BrowserDetailParseScenario(BenchmarkScenario):
+    name = "detail_parse"
+
+    def __init__(
+        self,
+        context: StandInContext,
+        pool: WebDriverPool,
+        classification_matcher: ClassificationMatcher,
+        keyword: str,
+        min_keyword_count: int,
+        extraction_mode: ExtractionModeEnum,
+        downloader: Optional[PdfDownloadManager] = None,
+    ) -> None:
+        self._context = context
+        self._pool = pool
+        self._classification_matcher = classification_matcher
+        self._keyword = keyword
+        self._min_keyword_count = min_keyword_count
+        self._extraction_mode = extraction_mode
+        self._downloader = downloader
+        self._tmp_dir = MakeDirManager.make_temp_browser_dir(directory=os.path.join(context.work_dir, "browser"))
+        _, self._patent_dir = MakeDirManager.make_author_dirs(name=self.name, directory=context.work_dir)
+
+    def units(self) -> List[str]:
+        return self._context.patent_links()
+
+    def run_unit(self, unit: str) -> int:
+        with self._pool.lend() as chrome:
+            parser = SeleniumPatentsParser(
+                driver=chrome,
+                tmp_dir=self._tmp_dir,
+                classification_matcher=self._classification_matcher,
+                keyword=self._keyword,
+                min_keyword_count=self._min_keyword_count,
+                extraction_mode=self._extraction_mode,
+                downloader=self._downloader,
+            )
+            parser.set_links(links=[unit])
+            parser.parse_patents_links(patent_dir=self._patent_dir)
+        return 1
@@ -1,45 +1,52 @@
-from typing import List, Dict
-from selenium import webdriver
+from typing import List, Dict, Optional
 
+from general_classes.enums import ExtractionModeEnum
 from general_classes.file_services import MakeDirManager, XlsxFileWriter
+from general_classes.http_client import HttpPageFetcher
 from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.pdf_downloader import PdfDownloadManager
 from thread_patents_parser.concrete_pattents_parser.pattents_links_parser import SeleniumPatentsParser, LOCK
-from thread_patents_parser.functions_performed import init_service, init_settings
+from thread_patents_parser.driver_pool import WebDriverPool
 
 RESULT_ARRAY = []
 
 
 def collect_patent(
     links: List[Dict],
-    path_to_chrome_driver: str,
+    pool: WebDriverPool,
     tmp_dir: str,
     directory: str,
     name: str,
+    fetcher: Optional[HttpPageFetcher] = None,
+    extraction_mode: ExtractionModeEnum = ExtractionModeEnum.ELEMENTS,
+    downloader: Optional[PdfDownloadManager] = None,
+    page_cache: Optional[PageCache] = None,
 ) -> None:
     Message.info_message("Сбор патентов автора...")
-    service = init_service(path_to_driver=path_to_chrome_driver)
-    options = init_settings(temp_dir=tmp_dir)
-    chrome = webdriver.Chrome(service=service, options=options)
-    parser = SeleniumPatentsParser(
-        driver=chrome,
-        tmp_dir=tmp_dir,
-        name=name
-    )
-    patents_links_len = len(links)
-    for element in links:
-        link = element["link"]
-        parser.set_links(links=[link])
-        # dir_author, dir_patent = MakeDirManager.make_author_dirs(
-        #     name=name, directory=directory
-        # )
-        Message.info_message(f"Осталось ссылок: {patents_links_len}")
-        Message.info_message(f"Текущий ссылка: {link}")
-        parser.parse_patents_links(patent_dir=directory)
-        state = parser.get_state()
-        LOCK.acquire()
-        RESULT_ARRAY.append(state)
-        LOCK.release()
-        patents_links_len -= 1
+    with pool.lend() as chrome:
+        parser = SeleniumPatentsParser(
+            driver=chrome,
+            tmp_dir=tmp_dir,
+            name=name,
+            fetcher=fetcher,
+            extraction_mode=extraction_mode,
+            downloader=downloader,
+            page_cache=page_cache,
+        )
+        for element in links:
+            link = element["link"]
+            parser.set_links(links=[link])
+            # dir_author, dir_patent = MakeDirManager.make_author_dirs(
+            #     name=name, directory=directory
+            # )
+            Message.info_message(f"Осталось ссылок: {len(links)}")
+            Message.info_message(f"Текущий ссылка: {link}")
+            parser.parse_patents_links(patent_dir=directory)
+            state = parser.get_state()
+            LOCK.acquire()
+            RESULT_ARRAY.append(state)
+            LOCK.release()
     Message.success_message("Сбор патентов авторов завершен.")
 
 
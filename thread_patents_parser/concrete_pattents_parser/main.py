@@ -1,29 +1,23 @@
-import threading
-import time
 from datetime import datetime
-from typing import List, Callable
+from functools import partial
 
-from general_classes.file_services import MakeDirManager, XlsxFileWriter, LinksJsonFileReader
+from general_classes.archive_writer import StreamingArchiveWriter
+from general_classes.file_services import MakeDirManager
+from general_classes.http_client import HttpClient, HttpPageFetcher
 from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.search_client import PatentsSearchClient
+from general_classes.statistics import STATISTICS
 from thread_patents_parser.concrete_pattents_parser.functions_performed import collect_patent, write_result_to_file
-from thread_patents_parser.functions_performed import divide_into_parts, collect_main_links
-from thread_patents_parser.main import DEFAULT_THREADS_COUNT, LINKS_DIR, TEMP_DIR, RESULT_DIR, MAIN_JSON
-
-
-def execute_threading_command(target_func: Callable, links: List,  *args) -> None:
-    parts = divide_into_parts(array=links, parts=DEFAULT_THREADS_COUNT)
-    threads = []
-    for number in range(DEFAULT_THREADS_COUNT):
-        thread = threading.Thread(
-            target=target_func,
-            args=(parts[number], *args),
-            name=f'Thread {number + 1}'
-        )
-        thread.start()
-        threads.append(thread)
-    Message.info_message(f'Создание {DEFAULT_THREADS_COUNT} потоков...')
-    for thread in threads:
-        thread.join()
+from thread_patents_parser.driver_pool import WebDriverPool
+from thread_patents_parser.functions_performed import collect_main_links, create_driver, report_browser_profile
+from thread_patents_parser.main import (
+    DEFAULT_THREADS_COUNT, LINKS_DIR, TEMP_DIR, RESULT_DIR, MAIN_JSON, USE_HTTP_FETCHER, EXTRACTION_MODE,
+    USE_SEARCH_API, BROWSER_PROFILE, WRITE_LINKS_JSON, USE_PDF_DOWNLOADER, PDF_DOWNLOAD_WORKERS,
+    USE_PAGE_CACHE, CACHE_DIR, ARCHIVE_VOLUME_BYTES,
+)
+from thread_patents_parser.scheduler import execute_threading_command
 
 
 if __name__ == '__main__':
@@ -34,37 +28,72 @@ if __name__ == '__main__':
     start_time = datetime.now()
     DEFAULT_THREADS_COUNT = int(threads_count) if threads_count.isdigit() else DEFAULT_THREADS_COUNT
     dir_manager = MakeDirManager()
+    http_client = HttpClient(pool_size=DEFAULT_THREADS_COUNT)
+    fetcher = HttpPageFetcher(client=http_client) if USE_HTTP_FETCHER else None
+    page_cache = PageCache(directory=dir_manager.make_link_dir(name=CACHE_DIR)) if USE_PAGE_CACHE else None
+    search_client = PatentsSearchClient(client=http_client, page_cache=page_cache) if USE_SEARCH_API else None
+    downloader = PdfDownloadManager(client=http_client, max_workers=PDF_DOWNLOAD_WORKERS) if USE_PDF_DOWNLOADER else None
 
+    pool = None
     try:
         links_dir = dir_manager.make_link_dir(name=LINKS_DIR)
         temporary_dir = dir_manager.make_temp_browser_dir(directory=TEMP_DIR)
-        path_to_main_links = collect_main_links(
-            path_to_chrome_driver=path_to_chrome_driver,
+        pool = WebDriverPool(
+            factory=partial(
+                create_driver,
+                path_to_chrome_driver=path_to_chrome_driver,
+                tmp_dir=temporary_dir,
+                profile=BROWSER_PROFILE,
+            ),
+            size=DEFAULT_THREADS_COUNT,
+        ).start()
+        patents_links = collect_main_links(
+            pool=pool,
             request=request,
-            directory=links_dir,
-            file_name=MAIN_JSON
+            file_name=MAIN_JSON,
+            directory=links_dir if WRITE_LINKS_JSON else None,
+            search_client=search_client,
         )
-        time.sleep(10)
-
-        patents_links = LinksJsonFileReader.parse_file(path_to_links=path_to_main_links)
         result_dir_name = dir_manager.make_result_dir(name=RESULT_DIR)
+        archive_writer = StreamingArchiveWriter(
+            name=inventors_name,
+            root_dir=result_dir_name,
+            max_volume_bytes=ARCHIVE_VOLUME_BYTES,
+        )
         dir_author, dir_patent = MakeDirManager.make_author_dirs(
             name=inventors_name, directory=result_dir_name
         )
         execute_threading_command(
             collect_patent,
             patents_links,
-            path_to_chrome_driver,
+            DEFAULT_THREADS_COUNT,
+            pool,
             temporary_dir,
             dir_patent,
             inventors_name,
+            fetcher,
+            EXTRACTION_MODE,
+            downloader,
+            page_cache,
         )
         write_result_to_file(name=dir_author)
-        time.sleep(5)
-        XlsxFileWriter.zipped_files(dir_name=RESULT_DIR, zip_file_name=inventors_name)
+        pending = downloader.futures_under(directory=dir_patent) if downloader is not None else []
+        archive_writer.add_directory(directory=dir_author, pending=pending)
+        if downloader is not None:
+            downloader.wait()
+        archive_writer.finalize()
     except (FileNotFoundError, KeyError, IndexError, TypeError) as Error:
         Message.error_message(f"Ошибка в работе программы. Ошибка: {Error}.")
     finally:
+        if downloader is not None:
+            downloader.close()
+        if pool is not None:
+            pool.sample_memory()
+            pool.close()
+            report_browser_profile(profile=BROWSER_PROFILE)
         execution_time = datetime.now() - start_time
         Message.info_message(f"Время выполнения: {execution_time}")
+        if page_cache is not None:
+            page_cache.report()
+        STATISTICS.report()
         Message.success_message("============== Завершение работы программы. ==============")
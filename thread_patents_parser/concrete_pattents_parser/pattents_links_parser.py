@@ -2,37 +2,57 @@ import os
 import re
 import threading
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from selenium import webdriver
 from selenium.common import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
-from general_classes.enums import XpathRightPartElements, UniqueNames, XpathIdElements
+from general_classes.enums import XpathRightPartElements, UniqueNames, XpathIdElements, ExtractionModeEnum
+from general_classes.http_client import HttpPageFetcher
 from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.static_page_parser import StaticPageParserMixin
 from general_classes.type_annotations import State
 from thread_patents_parser.base import SeleniumBaseParser
 
 LOCK = threading.Lock()
 
 
-class SeleniumPatentsParser(SeleniumBaseParser):
+class SeleniumPatentsParser(StaticPageParserMixin, SeleniumBaseParser):
 
     def __init__(
         self,
         driver: webdriver.Chrome,
         tmp_dir: str,
-        name: str
+        name: str,
+        fetcher: Optional[HttpPageFetcher] = None,
+        extraction_mode: ExtractionModeEnum = ExtractionModeEnum.ELEMENTS,
+        downloader: Optional[PdfDownloadManager] = None,
+        page_cache: Optional[PageCache] = None,
     ) -> None:
         super().__init__(driver)
         self._tmp_dir = tmp_dir
         self._state = State()
         self._url_regex = re.compile(r"^(http|https)://([\w.]+/?)\S*$")
         self._inventor_name = name
+        self._init_static_parser(
+            fetcher=fetcher,
+            extraction_mode=extraction_mode,
+            downloader=downloader,
+            page_cache=page_cache,
+        )
 
     def parse_patents_links(self, patent_dir: str) -> None:
         for link in self._links:
+            page = self._load_page(link=link)
+            if page is not None:
+                self._state["link"] = link
+                self._parse_static_page(page=page, patent_dir=patent_dir)
+                continue
+
             self._follow_the_link(link=link)
             self._state["link"] = link
             Message.success_message(f"Ссылка сохранена")
@@ -60,18 +80,14 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _click_to_more_button(self) -> None:
         try:
-            button = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.more_classifications_button.value
-            )
+            button = self._find_element(element=XpathIdElements.more_classifications_button)
             self._driver.execute_script("arguments[0].click();", button)
         except NoSuchElementException:
             Message.warning_message(f'Кнопка "View more classifications" не найдена. URL: {self._state["link"]}')
 
     def _find_classification_codes(self) -> None:
         try:
-            classification_element = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.classification_elements.value
-            )
+            classification_element = self._find_element(element=XpathIdElements.classification_elements)
         except NoSuchElementException:
             self._state["classification_codes"] = ""
             Message.warning_message(f'Коды патентных классификаторов не найдены. URL: {self._state["link"]}')
@@ -79,9 +95,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             self._parse_classification_elements(element=classification_element)
 
     def _parse_classification_elements(self, element: WebElement) -> None:
-        find_code_elements = element.find_elements(
-            by=By.XPATH, value=XpathIdElements.classification_element_codes.value
-        )
+        find_code_elements = self._find_elements(element=XpathIdElements.classification_element_codes)
         codes = [i.text for i in find_code_elements if i.text]
         if not codes:
             self._state["classification_codes"] = ""
@@ -92,9 +106,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_title(self) -> None:
         try:
-            title = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.patent_title.value
-            )
+            title = self._find_element(element=XpathIdElements.patent_title)
             self._state["title"] = title.text
             Message.success_message("Название патента сохранено")
         except NoSuchElementException:
@@ -102,9 +114,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             Message.warning_message(f'Название патента не найдено. URL: {self._state["link"]}')
 
     def _parse_people_section(self) -> None:
-        people_section = self._driver.find_elements(
-            by=By.XPATH, value=XpathRightPartElements.important_people_section.value
-        )
+        people_section = self._find_elements(element=XpathRightPartElements.important_people_section)
         if not people_section:
             self._state["current_assignee"] = []
             self._state["inventors"] = []
@@ -144,9 +154,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_priority_date(self) -> None:
         try:
-            priority_date = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.date_priority.value
-            )
+            priority_date = self._find_element(element=XpathRightPartElements.date_priority)
             date_to_datetime = datetime.strptime(priority_date.text, "%Y-%m-%d") if priority_date.text else ''
             self._state["priority_date"] = date_to_datetime.strftime("%d.%m.%Y") if date_to_datetime else ''
             Message.success_message("Дата приоритета сохранена")
@@ -156,9 +164,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_patent_code(self) -> None:
         try:
-            patent_code = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.patent_code.value
-            )
+            patent_code = self._find_element(element=XpathIdElements.patent_code)
             self._state["patent_code"] = patent_code.text
             Message.success_message("Номер патента сохранён")
         except NoSuchElementException:
@@ -171,7 +177,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             patent_code=patent_code
         )
         try:
-            publication_date = self._driver.find_element(by=By.XPATH, value=xpath)
+            publication_date = self._find_element(element=XpathRightPartElements.date_publication_template, xpath=xpath)
             date_to_datetime = datetime.strptime(publication_date.text, "%Y-%m-%d")
             self._state["publication_date"] = date_to_datetime.strftime("%d.%m.%Y")
             Message.success_message("Дата публикации сохранена")
@@ -181,9 +187,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_abstract(self) -> None:
         try:
-            abstract = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.abstract.value
-            )
+            abstract = self._find_element(element=XpathRightPartElements.abstract)
             Message.success_message("Абстракт сохранён")
             self._state["abstract"] = abstract.text
         except NoSuchElementException:
@@ -192,9 +196,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_country(self) -> None:
         try:
-            country = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.country.value
-            )
+            country = self._find_element(element=XpathRightPartElements.country)
             self._state["country"] = country.text
             Message.success_message("Страна сохранена")
         except NoSuchElementException:
@@ -203,11 +205,12 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _download_pdf_file(self, patent_dir: str) -> None:
         Message.info_message("Скачивание pdf файла...")
-        element = self._driver.find_element(
-            by=By.XPATH, value=XpathRightPartElements.pdf.value
-        )
+        element = self._find_element(element=XpathRightPartElements.pdf)
         link = element.get_attribute("href")
-        LOCK.acquire()
+        self._save_pdf_file(link=link, patent_dir=patent_dir)
+
+    def _save_pdf_file(self, link: Optional[str], patent_dir: str) -> None:
+        self._state["pdf_link"] = link or ""
         if link is None:
             Message.warning_message(f'Ссылка для скачивания PDF не найдена. URL: {self._state["link"]}')
             Message.info_message("Скачивание html файла...")
@@ -215,14 +218,18 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             target = os.path.join(patent_dir, f"{self._state['patent_code']}.html")
             with open(target, "w", encoding="utf-8") as file:
                 file.write(html)
+            Message.success_message("Файл успешно скачен.")
+        elif self._downloader is not None:
+            target = self._schedule_pdf_download(link=link, patent_dir=patent_dir)
         else:
+            LOCK.acquire()
             self._execute_download(link=link)
             file_name = os.listdir(self._tmp_dir)[0]
             file_path = os.path.join(self._tmp_dir, file_name)
             target = os.path.join(patent_dir, file_name)
             os.replace(file_path, target)
-        LOCK.release()
-        Message.success_message("Файл успешно скачен.")
+            LOCK.release()
+            Message.success_message("Файл успешно скачен.")
         self._state["path_to_pdf_file"] = "/".join(target.split("/")[-3:])
         Message.success_message("Путь к файлу сохранён.")
 
@@ -0,0 +1,303 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from general_classes.archive_writer import StreamingArchiveWriter
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import ExtractionModeEnum, LedgerStageEnum, ResultFormatEnum, FileTypeEnum
+from general_classes.file_services import MakeDirManager, ConsolidatedXlsxWriter
+from general_classes.http_client import HttpPageFetcher
+from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.patent_registry import PatentRegistry
+from general_classes.rate_governor import RATE_GOVERNOR
+from general_classes.result_sinks import ConsolidatedResultSink, JsonlResultSink
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.search_client import PatentsSearchClient
+from general_classes.statistics import STATISTICS
+from general_classes.task_queue import SqliteTaskQueue, TaskQueue, TaskQueueError, ChildTasks
+from thread_patents_parser.driver_pool import WebDriverPool
+from thread_patents_parser.file_services import LinksJsonFileWriter
+from thread_patents_parser.functions_performed import (
+    parse_main_links, parse_inventors_links, parse_patents_inventors_links, parse_author_patents,
+)
+
+STAGE_PRIORITIES = {
+    LedgerStageEnum.MAIN_LINKS: 0,
+    LedgerStageEnum.INVENTORS: 1,
+    LedgerStageEnum.PATENTS_LINKS: 2,
+    LedgerStageEnum.AUTHORS: 3,
+}
+
+
+def inventor_key(link: str) -> str:
+    return PatentsSearchClient.query_from_link(link=link).lower()
+
+
+def parse_option(argv: List[str], name: str, default: Optional[str] = None) -> Optional[str]:
+    prefix = f"--{name}="
+    values = [argument[len(prefix):] for argument in argv if argument.startswith(prefix)]
+    return values[-1] if values else default
+
+
+class DistributedCoordinator:
+
+    def __init__(self, task_queue: SqliteTaskQueue, poll_interval: float = 10.0) -> None:
+        self._queue = task_queue
+        self._poll_interval = poll_interval
+
+    def start(self, request: str, settings: Dict[str, Any]) -> None:
+        self._queue.put(
+            stage=LedgerStageEnum.MAIN_LINKS,
+            tasks=[(request, {"request": request})],
+            priority=STAGE_PRIORITIES[LedgerStageEnum.MAIN_LINKS],
+        )
+        self._queue.set_settings(settings=settings)
+        Message.info_message("Задание опубликовано в общей очереди. Ожидание исполнителей...")
+
+    def wait(self) -> None:
+        while True:
+            unfinished = self._queue.unfinished()
+            if not unfinished:
+                break
+            Message.info_message(f"Незавершённых задач в общей очереди: {unfinished}")
+            time.sleep(self._poll_interval)
+        Message.success_message("Все задачи общей очереди завершены.")
+
+    def write_links(self, directory: str) -> None:
+        for stage, file_type in (
+            (LedgerStageEnum.INVENTORS, FileTypeEnum.MAIN_JSON),
+            (LedgerStageEnum.PATENTS_LINKS, FileTypeEnum.INVENTORS_JSON),
+            (LedgerStageEnum.AUTHORS, FileTypeEnum.PATENTS_JSON),
+        ):
+            LinksJsonFileWriter.write_links_to_file(
+                file_name=file_type.value,
+                data=self._queue.payloads(stage=stage),
+                directory=directory,
+            )
+
+    def assemble(
+        self,
+        result_dir: str,
+        consolidated_writer: Optional[ConsolidatedXlsxWriter],
+        archive_writer: StreamingArchiveWriter,
+    ) -> int:
+        patents_count = 0
+        archived = set()
+        for _, result in self._queue.results(stage=LedgerStageEnum.AUTHORS):
+            author, count = result["name"], result["count"]
+            patents_count += count
+            dir_author = os.path.join(result_dir, author)
+            if consolidated_writer is not None and count:
+                sink = ConsolidatedResultSink(writer=consolidated_writer, author=author)
+                sink.extend(states=JsonlResultSink.read(directory=dir_author))
+            if count and dir_author not in archived and os.path.isdir(dir_author):
+                archived.add(dir_author)
+                archive_writer.add_directory(directory=dir_author)
+        if consolidated_writer is not None:
+            consolidated_writer.close()
+            archive_writer.add_file(path=consolidated_writer.path)
+        Message.info_message(f"Общее количество патентов: {patents_count}")
+        return patents_count
+
+
+class DistributedWorker:
+
+    def __init__(
+        self,
+        task_queue: TaskQueue,
+        pool: WebDriverPool,
+        settings: Dict[str, Any],
+        tmp_dir: str,
+        fetcher: Optional[HttpPageFetcher] = None,
+        search_client: Optional[PatentsSearchClient] = None,
+        downloader: Optional[PdfDownloadManager] = None,
+        page_cache: Optional[PageCache] = None,
+        registry: Optional[PatentRegistry] = None,
+        visibility_timeout: float = 600.0,
+        poll_interval: float = 5.0,
+        stall_timeout: Optional[float] = None,
+        max_lease_age: float = 3600.0,
+    ) -> None:
+        self._queue = task_queue
+        self._pool = pool
+        self._settings = settings
+        self._tmp_dir = tmp_dir
+        self._fetcher = fetcher
+        self._search_client = search_client
+        self._downloader = downloader
+        self._page_cache = page_cache
+        self._registry = registry
+        self._visibility_timeout = visibility_timeout
+        self._poll_interval = poll_interval
+        self._stall_timeout = stall_timeout if stall_timeout is not None else visibility_timeout
+        self._max_lease_age = max_lease_age
+        self._leases: Dict[int, Tuple[LedgerStageEnum, str, float, str]] = {}
+        self._progress: Dict[int, float] = {}
+        self._released: Set[Tuple[LedgerStageEnum, str, float, str]] = set()
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopped = threading.Event()
+        self._classification_matcher = ClassificationMatcher.from_spec(spec=settings["classification_spec"])
+        self._handlers: Dict[LedgerStageEnum, Callable[[Dict], Tuple[Any, ChildTasks]]] = {
+            LedgerStageEnum.MAIN_LINKS: self._main_links,
+            LedgerStageEnum.INVENTORS: self._inventors_links,
+            LedgerStageEnum.PATENTS_LINKS: self._patents_links,
+            LedgerStageEnum.AUTHORS: self._author_patents,
+        }
+
+    @staticmethod
+    def wait_for_settings(task_queue: TaskQueue, poll_interval: float = 5.0) -> Dict[str, Any]:
+        Message.info_message("Ожидание задания от координатора...")
+        while True:
+            try:
+                settings = task_queue.settings()
+            except TaskQueueError as error:
+                Message.warning_message(f"Координатор пока недоступен. Ошибка: {error}")
+                settings = None
+            if settings:
+                return settings
+            time.sleep(poll_interval)
+
+    def run(self, threads_count: int) -> None:
+        Message.info_message(f"Исполнитель {self._owner} запущен. Потоков: {threads_count}")
+        heartbeat = threading.Thread(target=self._heartbeat, name="Lease heartbeat", daemon=True)
+        heartbeat.start()
+        consumers = [
+            threading.Thread(target=self._consume, name=f"Worker {number + 1}")
+            for number in range(threads_count)
+        ]
+        for consumer in consumers:
+            consumer.start()
+        for consumer in consumers:
+            consumer.join()
+        self._stopped.set()
+        heartbeat.join()
+        Message.success_message(f"Исполнитель {self._owner} завершил работу. Очередь пуста.")
+
+    def _heartbeat(self) -> None:
+        while not self._stopped.wait(timeout=self._visibility_timeout / 3):
+            now = time.monotonic()
+            for thread_id, lease in list(self._leases.items()):
+                stage, key, leased_at, owner = lease
+                if lease in self._released:
+                    continue
+                progress_at = max(
+                    leased_at, RATE_GOVERNOR.last_activity(thread_id), self._progress.get(thread_id, 0.0)
+                )
+                if now - leased_at > self._max_lease_age:
+                    reason = f"задача выполняется дольше {self._max_lease_age:.0f} сек."
+                elif now - progress_at > self._stall_timeout:
+                    reason = f"нет запросов дольше {self._stall_timeout:.0f} сек."
+                else:
+                    try:
+                        self._queue.extend_lease(
+                            stage=stage, key=key, owner=owner, visibility_timeout=self._visibility_timeout
+                        )
+                    except TaskQueueError as error:
+                        Message.warning_message(f"Не удалось продлить аренду задачи. Ключ: {key}. Ошибка: {error}")
+                    continue
+                self._released.add(lease)
+                STATISTICS.increment("distributed.leases_released")
+                Message.warning_message(
+                    f"Аренда задачи больше не продлевается: {reason} Этап: {stage.value}. Ключ: {key}"
+                )
+
+    def _touch(self) -> None:
+        self._progress[threading.get_ident()] = time.monotonic()
+
+    def _consume(self) -> None:
+        while True:
+            owner = f"{self._owner}:{uuid.uuid4().hex}"
+            try:
+                task = self._queue.lease(owner=owner, visibility_timeout=self._visibility_timeout)
+                if task is None and not self._queue.unfinished():
+                    return
+            except TaskQueueError as error:
+                Message.error_message(f"Общая очередь задач недоступна, поток остановлен. Ошибка: {error}")
+                return
+            if task is None:
+                time.sleep(self._poll_interval)
+                continue
+            stage, key, payload = task
+            STATISTICS.increment(f"distributed.leased.{stage.value}")
+            thread_id = threading.get_ident()
+            self._leases[thread_id] = (stage, key, time.monotonic(), owner)
+            try:
+                result, children = self._handlers[stage](payload)
+            except Exception as error:
+                Message.error_message(f"Ошибка задачи. Этап: {stage.value}. Ключ: {key}. Ошибка: {error!r}")
+                STATISTICS.increment(f"distributed.failed.{stage.value}")
+                self._report_failure(stage=stage, key=key, owner=owner)
+                continue
+            finally:
+                self._released.discard(self._leases.pop(thread_id))
+            try:
+                self._queue.complete(
+                    stage=stage,
+                    key=key,
+                    owner=owner,
+                    result=result,
+                    children=children,
+                    priorities=STAGE_PRIORITIES,
+                )
+            except TaskQueueError as error:
+                Message.error_message(f"Результат задачи не передан координатору. Ключ: {key}. Ошибка: {error}")
+
+    def _report_failure(self, stage: LedgerStageEnum, key: str, owner: str) -> None:
+        try:
+            self._queue.fail(stage=stage, key=key, owner=owner)
+        except TaskQueueError as error:
+            Message.error_message(f"Ошибка задачи не передана координатору. Ключ: {key}. Ошибка: {error}")
+
+    def _main_links(self, payload: Dict) -> Tuple[Any, ChildTasks]:
+        links = parse_main_links(self._pool, payload["request"], self._search_client)
+        return None, {LedgerStageEnum.INVENTORS: [(element["link"], element) for element in links]}
+
+    def _inventors_links(self, payload: Dict) -> Tuple[Any, ChildTasks]:
+        links = parse_inventors_links(
+            payload,
+            self._pool,
+            self._settings["request_params_before"],
+            self._settings["request_params_after"],
+        )
+        return None, {
+            LedgerStageEnum.PATENTS_LINKS: [(inventor_key(link=element["link"]), element) for element in links]
+        }
+
+    def _patents_links(self, payload: Dict) -> Tuple[Any, ChildTasks]:
+        links = parse_patents_inventors_links(payload, self._pool, self._search_client)
+        return None, {LedgerStageEnum.AUTHORS: [(inventor_key(link=payload["link"]), element) for element in links]}
+
+    def _author_patents(self, payload: Dict) -> Tuple[Any, ChildTasks]:
+        dir_author, dir_patent = MakeDirManager.make_author_dirs(
+            name=payload["name"], directory=self._settings["result_dir"]
+        )
+        patents_count = parse_author_patents(
+            payload,
+            dir_author,
+            dir_patent,
+            self._pool,
+            self._tmp_dir,
+            self._classification_matcher,
+            self._settings["keyword"],
+            self._settings["min_keyword_count"],
+            self._fetcher,
+            ExtractionModeEnum(self._settings["extraction_mode"]),
+            self._downloader,
+            self._page_cache,
+            None,
+            self._registry,
+            self._settings["use_cards"],
+            tuple(ResultFormatEnum(value) for value in self._settings["result_formats"]),
+        )
+        if self._downloader is not None:
+            pending = set(self._downloader.futures_under(directory=dir_patent))
+            while pending:
+                done, pending = wait(pending, timeout=self._poll_interval)
+                if done:
+                    self._touch()
+        return {"name": payload["name"], "count": patents_count}, {}
@@ -0,0 +1,264 @@
+import os
+import sys
+from datetime import datetime
+from functools import partial
+
+from general_classes.archive_writer import StreamingArchiveWriter
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import DirTypeEnum, FileTypeEnum, ExtractionModeEnum, BrowserProfileEnum, ResultFormatEnum
+from general_classes.file_services import MakeDirManager, XlsxFileWriter, ConsolidatedXlsxWriter
+from general_classes.http_client import HttpClient, HttpPageFetcher
+from general_classes.keyword_scorer import KeywordScorer
+from general_classes.local_server import MetricsHttpServer, TaskQueueHttpServer
+from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.patent_registry import PatentRegistry
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.rate_governor import RATE_GOVERNOR
+from general_classes.result_sinks import parse_result_formats
+from general_classes.search_client import PatentsSearchClient
+from general_classes.statistics import STATISTICS
+from general_classes.task_queue import SqliteTaskQueue, TaskQueueService, RemoteTaskQueue
+from thread_patents_parser.distributed import DistributedCoordinator, DistributedWorker, parse_option
+from thread_patents_parser.driver_pool import WebDriverPool
+from thread_patents_parser.functions_performed import create_driver, report_browser_profile
+
+TASKS_DB: str = FileTypeEnum.TASKS_DB.value
+METRICS_JSON: str = FileTypeEnum.METRICS_JSON.value
+TEMP_DIR: str = DirTypeEnum.TEMP_DIR.value
+LINKS_DIR: str = DirTypeEnum.LINKS_DIR.value
+RESULT_DIR: str = DirTypeEnum.RESULT_DIR.value
+CACHE_DIR: str = DirTypeEnum.CACHE_DIR.value
+
+COORDINATOR_MODE = "coordinator"
+WORKER_MODE = "worker"
+DEFAULT_THREADS_COUNT = 8
+DEFAULT_KEYWORD_COUNT = 10
+REQUIRED_WORD = "assignee"
+USE_HTTP_FETCHER = True
+USE_SEARCH_API = True
+EXTRACTION_MODE = ExtractionModeEnum.SCRIPT
+BROWSER_PROFILE = BrowserProfileEnum.SCRAPING
+WRITE_LINKS_JSON = True
+USE_PDF_DOWNLOADER = True
+PDF_DOWNLOAD_WORKERS = 4
+USE_PAGE_CACHE = True
+REQUESTS_PER_SECOND = 4.0
+RESUME = "--resume" in sys.argv
+USE_PATENT_REGISTRY = True
+USE_RESULT_CARDS = True
+WRITE_CONSOLIDATED_XLSX = True
+ARCHIVE_VOLUME_BYTES = None
+RESULT_FORMATS = parse_result_formats(argv=sys.argv, default=(ResultFormatEnum.XLSX, ResultFormatEnum.JSONL))
+TASK_MAX_ATTEMPTS = 3
+VISIBILITY_TIMEOUT = 600.0
+STALL_TIMEOUT = 600.0
+MAX_LEASE_AGE = 3600.0
+POLL_INTERVAL = 5.0
+DEFAULT_LISTEN = "0.0.0.0:8765"
+WRITE_METRICS_JSON = True
+if WRITE_CONSOLIDATED_XLSX and ResultFormatEnum.JSONL not in RESULT_FORMATS:
+    RESULT_FORMATS += (ResultFormatEnum.JSONL,)
+
+
+def run_coordinator(task_queue: SqliteTaskQueue, dir_manager: MakeDirManager) -> None:
+    request = input(
+        'Введите поисковый запрос формата "((((H04L9)) OR (crypt))) '
+        f'{REQUIRED_WORD}:raytheon country:US language:ENGLISH)": '
+    ).strip()
+    keyword = input(
+        'Введите ключевые слова для поиска на странице через запятую, '
+        'при необходимости с весом (формат "crypt:2, secure key"; слова ищутся как обычный текст, '
+        'без регулярных выражений; пустой ввод отключает проверку): '
+    )
+    min_keyword_count = input(
+        f'Введите мин.суммарный вес ключевых слов на странице(по умолчанию {DEFAULT_KEYWORD_COUNT}): '
+    )
+
+    if REQUIRED_WORD not in request:
+        Message.error_message(f"Неверный формат поискового запроса. Слово {REQUIRED_WORD} в запросе обязательно.")
+        sys.exit()
+
+    split_params = request.split(REQUIRED_WORD)
+    request_params_before = split_params[0].strip().replace(" ", "+")
+    request_params_after = split_params[1].strip().split(" ", maxsplit=1)[1].replace(" ", "+")
+    classifications_codes = ClassificationMatcher.codes_in_text(text=request_params_before.upper())
+
+    if not classifications_codes:
+        Message.error_message("Неверный формат поискового запроса. Не найден код классификатора")
+        sys.exit()
+
+    extra_classifications_codes = input(
+        'Введите дополнительные коды классификаторов через запятую, диапазоны через "-", '
+        'исключения с "!" (например "G06F21/60-G06F21/64, !H04L9/32"), или оставьте пустым: '
+    )
+    result_zip_file_name = input('Введите желаемое название архива с результатом: ')
+
+    classification_spec = ", ".join(classifications_codes + [extra_classifications_codes])
+    Message.info_message(f'Коды классификаторов: {ClassificationMatcher.from_spec(spec=classification_spec).describe()}')
+    if not KeywordScorer.from_prompt(raw=keyword, threshold=0).enabled:
+        Message.warning_message("Ключевые слова не заданы, проверка по ключевым словам отключена.")
+    result_dir_name = dir_manager.make_result_dir(name=RESULT_DIR)
+    coordinator = DistributedCoordinator(task_queue=task_queue, poll_interval=POLL_INTERVAL)
+    if RESUME and task_queue.settings():
+        task_queue.requeue_failed()
+    else:
+        task_queue.reset()
+        coordinator.start(
+            request=request,
+            settings={
+                "request_params_before": request_params_before,
+                "request_params_after": request_params_after,
+                "classification_spec": classification_spec,
+                "keyword": keyword,
+                "min_keyword_count": int(min_keyword_count) if min_keyword_count.isdigit() else DEFAULT_KEYWORD_COUNT,
+                "extraction_mode": EXTRACTION_MODE.value,
+                "use_cards": USE_RESULT_CARDS,
+                "result_formats": [result_format.value for result_format in RESULT_FORMATS],
+                "result_dir": result_dir_name,
+            },
+        )
+    coordinator.wait()
+
+    if WRITE_LINKS_JSON:
+        coordinator.write_links(directory=dir_manager.make_link_dir(name=LINKS_DIR))
+    archive_writer = StreamingArchiveWriter(
+        name=result_zip_file_name,
+        root_dir=result_dir_name,
+        max_volume_bytes=ARCHIVE_VOLUME_BYTES,
+    )
+    consolidated_writer = ConsolidatedXlsxWriter(directory=result_dir_name) if WRITE_CONSOLIDATED_XLSX else None
+    try:
+        coordinator.assemble(
+            result_dir=result_dir_name,
+            consolidated_writer=consolidated_writer,
+            archive_writer=archive_writer,
+        )
+        archive_writer.finalize()
+    finally:
+        archive_writer.abort()
+    XlsxFileWriter.delete_empty_directory(dir_name=RESULT_DIR)
+
+
+def run_worker(
+    task_queue: RemoteTaskQueue,
+    dir_manager: MakeDirManager,
+    path_to_chrome_driver: str,
+    threads_count: int,
+) -> None:
+    settings = DistributedWorker.wait_for_settings(task_queue=task_queue, poll_interval=POLL_INTERVAL)
+    settings["result_dir"] = parse_option(argv=sys.argv, name="result-dir", default=settings["result_dir"])
+    RATE_GOVERNOR.attach(remote=task_queue)
+
+    http_client = HttpClient(pool_size=threads_count)
+    fetcher = HttpPageFetcher(client=http_client) if USE_HTTP_FETCHER else None
+    page_cache = PageCache(directory=dir_manager.make_link_dir(name=CACHE_DIR)) if USE_PAGE_CACHE else None
+    search_client = PatentsSearchClient(client=http_client, page_cache=page_cache) if USE_SEARCH_API else None
+    downloader = PdfDownloadManager(client=http_client, max_workers=PDF_DOWNLOAD_WORKERS) if USE_PDF_DOWNLOADER else None
+    registry = PatentRegistry() if USE_PATENT_REGISTRY else None
+    pool = None
+    try:
+        temporary_dir = dir_manager.make_temp_browser_dir(directory=TEMP_DIR)
+        pool = WebDriverPool(
+            factory=partial(
+                create_driver,
+                path_to_chrome_driver=path_to_chrome_driver,
+                tmp_dir=temporary_dir,
+                profile=BROWSER_PROFILE,
+            ),
+            size=threads_count,
+        ).start()
+        DistributedWorker(
+            task_queue=task_queue,
+            pool=pool,
+            settings=settings,
+            tmp_dir=temporary_dir,
+            fetcher=fetcher,
+            search_client=search_client,
+            downloader=downloader,
+            page_cache=page_cache,
+            registry=registry,
+            visibility_timeout=VISIBILITY_TIMEOUT,
+            poll_interval=POLL_INTERVAL,
+            stall_timeout=STALL_TIMEOUT,
+            max_lease_age=MAX_LEASE_AGE,
+        ).run(threads_count=threads_count)
+    finally:
+        if downloader is not None:
+            downloader.close()
+        if pool is not None:
+            pool.sample_memory()
+            pool.close()
+            report_browser_profile(profile=BROWSER_PROFILE)
+        if page_cache is not None:
+            page_cache.report()
+        if registry is not None:
+            registry.report()
+
+
+if __name__ == '__main__':
+    path_to_chrome_driver = 'chromedriver'
+    mode = sys.argv[1] if len(sys.argv) > 1 else ""
+    if mode not in (COORDINATOR_MODE, WORKER_MODE):
+        Message.error_message(
+            f"Укажите режим запуска: {COORDINATOR_MODE} или {WORKER_MODE}. "
+            "Координатор хранит очередь в файле --queue= на локальном диске и раздаёт задачи по HTTP "
+            f"на адресе --listen= (по умолчанию {DEFAULT_LISTEN}). "
+            "Исполнители подключаются к нему параметром --coordinator=http://host:port/ с любой машины, "
+            "количество потоков исполнителя --threads=. "
+            "Каталог результатов должен быть общим для всех машин, на исполнителе его путь задаётся --result-dir=. "
+            "Общий секрет для доступа к очереди --token=, порт для метрик --metrics-port="
+        )
+        sys.exit()
+
+    start_time = datetime.now()
+    RATE_GOVERNOR.configure(requests_per_second=REQUESTS_PER_SECOND)
+    dir_manager = MakeDirManager()
+    token = parse_option(argv=sys.argv, name="token")
+    queue_server = None
+    if mode == COORDINATOR_MODE:
+        queue_path = parse_option(argv=sys.argv, name="queue", default=os.path.join(os.getcwd(), TASKS_DB))
+        task_queue = SqliteTaskQueue(path=queue_path, max_attempts=TASK_MAX_ATTEMPTS)
+        host, _, port = parse_option(argv=sys.argv, name="listen", default=DEFAULT_LISTEN).rpartition(":")
+        queue_server = TaskQueueHttpServer(
+            service=TaskQueueService(queue=task_queue, governor=RATE_GOVERNOR),
+            token=token,
+            host=host,
+            port=int(port),
+        ).start()
+    else:
+        threads_count = parse_option(argv=sys.argv, name="threads", default="")
+        threads_count = int(threads_count) if threads_count.isdigit() else DEFAULT_THREADS_COUNT
+        task_queue = RemoteTaskQueue(
+            base_url=parse_option(argv=sys.argv, name="coordinator", default="http://127.0.0.1:8765/"),
+            token=token,
+            pool_size=threads_count + PDF_DOWNLOAD_WORKERS + 1,
+        )
+    metrics_port = parse_option(argv=sys.argv, name="metrics-port", default="")
+    metrics_server = MetricsHttpServer(port=int(metrics_port)).start() if metrics_port.isdigit() else None
+    try:
+        if mode == COORDINATOR_MODE:
+            run_coordinator(task_queue=task_queue, dir_manager=dir_manager)
+        else:
+            run_worker(
+                task_queue=task_queue,
+                dir_manager=dir_manager,
+                path_to_chrome_driver=path_to_chrome_driver,
+                threads_count=threads_count,
+            )
+    except (FileNotFoundError, KeyError, IndexError, TypeError) as Error:
+        Message.error_message(f"Ошибка в работе программы. Ошибка: {Error}.")
+    finally:
+        execution_time = datetime.now() - start_time
+        Message.info_message(f"Время выполнения: {execution_time}")
+        RATE_GOVERNOR.report()
+        task_queue.report()
+        if queue_server is not None:
+            queue_server.stop()
+        task_queue.close()
+        STATISTICS.report()
+        if WRITE_METRICS_JSON:
+            STATISTICS.dump_json(path=os.path.join(os.getcwd(), f"{mode}.{os.getpid()}.{METRICS_JSON}"))
+        if metrics_server is not None:
+            metrics_server.stop()
+        Message.success_message("============== Завершение работы программы. ==============")
@@ -0,0 +1,171 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Iterator, Optional, Sequence, Union
+
+from selenium import webdriver
+
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS, process_tree_rss
+from thread_patents_parser.scheduler import ResourceTimeoutError
+
+
+class WebDriverPool:
+    BLANK_PAGE = "about:blank"
+    DEFAULT_LEND_TIMEOUT = 600.0
+    MEMORY_SAMPLE_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        factory: Callable[[], webdriver.Chrome],
+        size: int,
+        lend_timeout: float = DEFAULT_LEND_TIMEOUT,
+        memory_sample_interval: float = MEMORY_SAMPLE_INTERVAL,
+    ) -> None:
+        self._factory = factory
+        self._size = size
+        self._lend_timeout = lend_timeout
+        self._memory_sample_interval = memory_sample_interval
+        self._memory_sampled_at = 0.0
+        self._idle = queue.Queue()
+        self._drivers: List[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+        self._shared = 0
+
+    @staticmethod
+    def split_capacity(size: int, weights: Sequence[int]) -> List[int]:
+        total = sum(weights)
+        sizes = [max(1, size * weight // total) for weight in weights]
+        sizes[-1] = max(1, size - sum(sizes[:-1]))
+        return sizes
+
+    def share(self, name: str, size: int) -> "WebDriverPoolShare":
+        with self._lock:
+            if self._shared + size > self._size:
+                raise ValueError(
+                    f"Доля пула {name} ({size}) превышает свободные браузеры: {self._size - self._shared}"
+                )
+            self._shared += size
+        return WebDriverPoolShare(pool=self, name=name, size=size)
+
+    def start(self) -> "WebDriverPool":
+        Message.info_message(f"Запуск {self._size} браузеров...")
+        with ThreadPoolExecutor(max_workers=self._size) as executor:
+            for driver in executor.map(lambda _: self._create_driver(), range(self._size)):
+                self._idle.put(driver)
+        Message.success_message(f"Пул браузеров готов. Размер пула: {self._size}")
+        return self
+
+    @contextmanager
+    def lend(self) -> Iterator[webdriver.Chrome]:
+        try:
+            slot = self._idle.get(timeout=self._lend_timeout)
+        except queue.Empty:
+            raise ResourceTimeoutError(
+                f"Нет свободного браузера в пуле за {self._lend_timeout} сек. Размер пула: {self._size}"
+            ) from None
+        # An empty slot (None) marks a browser that has to be rebuilt; the slot always goes back to the pool.
+        driver = None
+        try:
+            driver = slot if slot is not None and self._is_alive(driver=slot) else self._replace_driver(driver=slot)
+            yield driver
+        finally:
+            self._idle.put(self._reset_driver(driver=driver) if driver is not None else None)
+
+    def close(self) -> None:
+        with self._lock:
+            drivers = self._drivers.copy()
+            self._drivers.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                ...
+        Message.info_message(f"Пул браузеров закрыт. Закрыто браузеров: {len(drivers)}")
+
+    def __enter__(self) -> "WebDriverPool":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _create_driver(self) -> webdriver.Chrome:
+        driver = self._factory()
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _replace_driver(self, driver: Optional[webdriver.Chrome]) -> webdriver.Chrome:
+        Message.warning_message("Браузер не отвечает. Запуск нового браузера...")
+        if driver is not None:
+            with self._lock:
+                if driver in self._drivers:
+                    self._drivers.remove(driver)
+            try:
+                driver.quit()
+            except Exception:
+                ...
+        STATISTICS.increment("browser.replacements")
+        return self._create_driver()
+
+    def sample_memory(self) -> int:
+        with self._lock:
+            pids = [driver.service.process.pid for driver in self._drivers if driver.service.process]
+        total = sum(process_tree_rss(pid=pid) for pid in pids)
+        STATISTICS.set_max("browser.rss_peak_bytes", total)
+        return total
+
+    def _sample_memory_if_due(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._memory_sampled_at < self._memory_sample_interval:
+                return
+            self._memory_sampled_at = now
+        self.sample_memory()
+
+    def _reset_driver(self, driver: webdriver.Chrome) -> Optional[webdriver.Chrome]:
+        try:
+            self._sample_memory_if_due()
+            for handle in driver.window_handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+            driver.delete_all_cookies()
+            driver.get(self.BLANK_PAGE)
+            return driver
+        except Exception:
+            ...
+        try:
+            return self._replace_driver(driver=driver)
+        except Exception as error:
+            Message.error_message(f"Не удалось запустить новый браузер, он будет пересоздан позже. Ошибка: {error}")
+            return None
+
+    @staticmethod
+    def _is_alive(driver: webdriver.Chrome) -> bool:
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+
+# A share reserves part of the pool for one stage: a stage waits only for its own browsers and
+# can never starve another stage, so lend() on the pool does not time out because of contention.
+class WebDriverPoolShare:
+
+    def __init__(self, pool: WebDriverPool, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+        self._pool = pool
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def lend(self) -> Iterator[webdriver.Chrome]:
+        with self._slots, self._pool.lend() as driver:
+            yield driver
+
+
+DriverLender = Union[WebDriverPool, WebDriverPoolShare]
@@ -1,37 +1,70 @@
-from math import ceil
-from typing import List, Dict
+import os
+from typing import List, Dict, Optional, Callable, Any, Tuple
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
-from general_classes.file_services import MakeDirManager, XlsxFileWriter
+from general_classes.archive_writer import StreamingArchiveWriter
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import ExtractionModeEnum, BrowserProfileEnum, LedgerStageEnum, ResultFormatEnum
+from general_classes.file_services import MakeDirManager, ConsolidatedXlsxWriter
+from general_classes.http_client import HttpPageFetcher
+from general_classes.job_ledger import JobLedger
 from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.patent_registry import PatentRegistry
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.result_sinks import create_result_sink, CompositeResultSink, ConsolidatedResultSink
+from general_classes.search_client import PatentsSearchClient
+from general_classes.statistics import STATISTICS
+from thread_patents_parser.driver_pool import DriverLender
 from thread_patents_parser.file_services import LinksJsonFileWriter
-from thread_patents_parser.inventors_links_parser import SeleniumInventorsLinksParser
+from thread_patents_parser.inventors_links_parser import SeleniumInventorsLinksParser, InventorQueryBuilder
 from thread_patents_parser.main_links_parser import SeleniumMainLinksParser
-from thread_patents_parser.patents_links_parser import SeleniumPatentsInventorsLinksParser, SeleniumPatentsParser, LOCK
+from thread_patents_parser.patents_links_parser import SeleniumPatentsInventorsLinksParser, SeleniumPatentsParser
+from thread_patents_parser.scheduler import WorkQueueConsumer, StageOutput
 
-RESULT_ARRAY = []
+SCRAPING_WINDOW_SIZE = "1280,900"
+SCRAPING_ARGUMENTS = (
+    "--headless=new",
+    f"--window-size={SCRAPING_WINDOW_SIZE}",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication",
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+    "--no-first-run",
+)
+SCRAPING_BLOCKED_URLS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googleadservices.com*", "*gstatic.com/recaptcha*", "*apis.google.com*",
+    "*patentimages.storage.googleapis.com*",
+)
 
 
-def validate_urls(array: List[Dict]) -> List[Dict]:
-    Message.info_message(f"Общее количество ссылок: {len(array)}")
-    seen_links = set()
-    validate_links = []
-    for element in array:
-        query = element["link"]
-        lower_query = query.lower()
-        if lower_query not in seen_links:
-            seen_links.add(lower_query)
-            validate_links.append(element)
-    Message.info_message(f"Общее количество уникальных ссылок: {len(validate_links)}")
-    return validate_links
-
-
-def init_settings(temp_dir: str) -> Options:
+def init_settings(temp_dir: str, profile: BrowserProfileEnum = BrowserProfileEnum.DEFAULT) -> Options:
     prefs = {"download.default_directory": temp_dir}
     chrome_options = webdriver.ChromeOptions()
+    if profile == BrowserProfileEnum.SCRAPING:
+        prefs.update({
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        for argument in SCRAPING_ARGUMENTS:
+            chrome_options.add_argument(argument)
     chrome_options.add_experimental_option("prefs", prefs)
     return chrome_options
 
@@ -41,97 +74,269 @@ def init_service(path_to_driver: str) -> Service:
     return chrome_service
 
 
-def divide_into_parts(array: List, parts: int) -> List[List]:
-    part_len = ceil(len(array) / parts)
-    return [array[part_len * part:part_len * (part + 1)] for part in range(parts)]
+def create_driver(
+    path_to_chrome_driver: str,
+    tmp_dir: str,
+    profile: BrowserProfileEnum = BrowserProfileEnum.DEFAULT,
+) -> webdriver.Chrome:
+    service = init_service(path_to_driver=path_to_chrome_driver)
+    options = init_settings(temp_dir=tmp_dir, profile=profile)
+    chrome = webdriver.Chrome(service=service, options=options)
+    if profile == BrowserProfileEnum.SCRAPING:
+        chrome.execute_cdp_cmd("Network.enable", {})
+        chrome.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(SCRAPING_BLOCKED_URLS)})
+    else:
+        chrome.maximize_window()
+    return chrome
+
+
+def report_browser_profile(profile: BrowserProfileEnum) -> None:
+    page_loads = STATISTICS.get_counter("browser.page_loads")
+    average_load = STATISTICS.get_time("browser.page_load") / page_loads if page_loads else 0
+    peak_rss = STATISTICS.get_max("browser.rss_peak_bytes") // (1024 * 1024)
+    Message.info_message(
+        f"Профиль браузера: {profile.value}. Загружено страниц: {page_loads}. "
+        f"Среднее время загрузки: {average_load:.2f} сек. Пиковая память браузеров: {peak_rss} мб."
+    )
+
+
+def run_ledger_job(
+    ledger: Optional[JobLedger],
+    stage: LedgerStageEnum,
+    key: str,
+    job: Callable,
+    *args,
+) -> Any:
+    if ledger is None:
+        return job(*args)
+    if ledger.is_done(stage=stage, key=key):
+        Message.info_message(f"Задача уже выполнена, результат взят из журнала. Этап: {stage.value}. Ключ: {key}")
+        return ledger.payload(stage=stage, key=key)
+    ledger.start(stage=stage, key=key)
+    try:
+        result = job(*args)
+    except Exception:
+        ledger.fail(stage=stage, key=key)
+        raise
+    ledger.finish(stage=stage, key=key, payload=result)
+    return result
 
 
-def collect_main_links(path_to_chrome_driver: str, request: str, directory: str, file_name: str) -> str:
+def collect_main_links(
+    pool: DriverLender,
+    request: str,
+    file_name: str,
+    directory: Optional[str] = None,
+    search_client: Optional[PatentsSearchClient] = None,
+    ledger: Optional[JobLedger] = None,
+) -> List[Dict]:
     Message.info_message("Сбор основных ссылок...")
-    service = init_service(path_to_driver=path_to_chrome_driver)
-    chrome = webdriver.Chrome(service=service)
-    parser = SeleniumMainLinksParser(driver=chrome, request=request)
-    links_list = parser.collect_links()
-    path_to_main_links = LinksJsonFileWriter.write_links_to_file(
-        file_name=file_name,
-        data=links_list,
-        directory=directory,
+    links_list = run_ledger_job(
+        ledger, LedgerStageEnum.MAIN_LINKS, request, parse_main_links, pool, request, search_client
     )
+    if directory is not None:
+        LinksJsonFileWriter.write_links_to_file(
+            file_name=file_name,
+            data=links_list,
+            directory=directory,
+        )
     Message.success_message("Сбор основных ссылок завершен.")
-    parser.close_browser()
-    return path_to_main_links
+    return links_list
 
 
 def collect_inventors_links(
-    links: List[Dict],
+    links: WorkQueueConsumer,
+    output: StageOutput,
     request_params_before: str,
     request_params_after: str,
-    path_to_chrome_driver: str
+    pool: DriverLender,
+    ledger: Optional[JobLedger] = None,
 ) -> None:
     Message.info_message("Сбор ссылок авторов...")
-    service = init_service(path_to_driver=path_to_chrome_driver)
-    chrome = webdriver.Chrome(service=service)
-    parser = SeleniumInventorsLinksParser(
-        driver=chrome,
-        request_params_before=request_params_before,
-        request_params_after=request_params_after,
-    )
-    parser.set_links(links=links)
+    for element in links:
+        result = run_ledger_job(
+            ledger,
+            LedgerStageEnum.INVENTORS,
+            element["link"],
+            parse_inventors_links,
+            element,
+            pool,
+            request_params_before,
+            request_params_after,
+        )
+        output.emit(items=result)
     Message.success_message("Сбор ссылок авторов завершен.")
-    result = parser.collect_links()
-    LOCK.acquire()
-    RESULT_ARRAY.extend(result)
-    LOCK.release()
-    parser.close_browser()
 
 
-def collect_patents_inventors_links(links: List[Dict], path_to_chrome_driver: str) -> None:
+def collect_patents_inventors_links(
+    links: WorkQueueConsumer,
+    output: StageOutput,
+    pool: DriverLender,
+    search_client: Optional[PatentsSearchClient] = None,
+    ledger: Optional[JobLedger] = None,
+) -> None:
     Message.info_message("Сбор ссылок патентов авторов...")
-    service = init_service(path_to_driver=path_to_chrome_driver)
-    chrome = webdriver.Chrome(service=service)
-    parser = SeleniumPatentsInventorsLinksParser(driver=chrome)
-    parser.set_links(links=links)
+    for element in links:
+        result = run_ledger_job(
+            ledger,
+            LedgerStageEnum.PATENTS_LINKS,
+            element["link"],
+            parse_patents_inventors_links,
+            element,
+            pool,
+            search_client,
+        )
+        output.emit(items=result)
     Message.success_message("Сбор ссылок патентов авторов завершен.")
-    result = parser.collect_links()
-    LOCK.acquire()
-    RESULT_ARRAY.extend(result)
-    LOCK.release()
-    parser.close_browser()
 
 
 def collect_patent(
-    links: List[Dict],
-    path_to_chrome_driver: str,
+    links: WorkQueueConsumer,
+    pool: DriverLender,
     tmp_dir: str,
     directory: str,
-    valid_classifications_code: str,
+    classification_matcher: ClassificationMatcher,
     keyword: str,
     min_keyword_count: int,
+    fetcher: Optional[HttpPageFetcher] = None,
+    extraction_mode: ExtractionModeEnum = ExtractionModeEnum.ELEMENTS,
+    downloader: Optional[PdfDownloadManager] = None,
+    page_cache: Optional[PageCache] = None,
+    ledger: Optional[JobLedger] = None,
+    registry: Optional[PatentRegistry] = None,
+    use_cards: bool = False,
+    consolidated_writer: Optional[ConsolidatedXlsxWriter] = None,
+    result_formats: Tuple[ResultFormatEnum, ...] = (ResultFormatEnum.XLSX,),
+    archive_writer: Optional[StreamingArchiveWriter] = None,
 ) -> None:
     Message.info_message("Сбор патентов автора...")
-    service = init_service(path_to_driver=path_to_chrome_driver)
-    options = init_settings(temp_dir=tmp_dir)
-    chrome = webdriver.Chrome(service=service, options=options)
-    parser = SeleniumPatentsParser(
-        driver=chrome,
-        tmp_dir=tmp_dir,
-        keyword=keyword,
-        min_keyword_count=min_keyword_count,
-        valid_classifications_code=valid_classifications_code,
-    )
-    patents_links_len = len(links)
     for element in links:
         dir_name = element["name"]
-        links = element["links"]
-        parser.set_links(links=links)
+        if ledger is not None and ledger.is_done(stage=LedgerStageEnum.AUTHORS, key=dir_name):
+            Message.info_message(f"Автор уже обработан: {dir_name}")
+            dir_patent = os.path.join(directory, dir_name, "patents")
+            if archive_writer is not None and os.path.isdir(dir_patent) and os.listdir(dir_patent):
+                archive_writer.add_directory(directory=os.path.join(directory, dir_name))
+            continue
         dir_author, dir_patent = MakeDirManager.make_author_dirs(
             name=dir_name, directory=directory
         )
-        Message.info_message(f"Осталось авторов: {patents_links_len}")
+        Message.info_message(f"Осталось авторов в очереди: {len(links)}")
         Message.info_message(f"Текущий автор: {dir_name}")
-        parser.parse_patents_links(patent_dir=dir_patent)
-        state = parser.get_state()
-        writer = XlsxFileWriter(directory=dir_author, state=state)
-        writer.execute_write()
-        patents_links_len -= 1
+        patents_count = parse_author_patents(
+            element,
+            dir_author,
+            dir_patent,
+            pool,
+            tmp_dir,
+            classification_matcher,
+            keyword,
+            min_keyword_count,
+            fetcher,
+            extraction_mode,
+            downloader,
+            page_cache,
+            ledger,
+            registry,
+            use_cards,
+            result_formats,
+            consolidated_writer,
+        )
+        if archive_writer is not None and patents_count:
+            pending = downloader.futures_under(directory=dir_patent) if downloader is not None else []
+            archive_writer.add_directory(directory=dir_author, pending=pending)
+        if ledger is not None:
+            ledger.finish(stage=LedgerStageEnum.AUTHORS, key=dir_name)
     Message.success_message("Сбор патентов авторов завершен.")
+
+
+def parse_author_patents(
+    element: Dict,
+    dir_author: str,
+    dir_patent: str,
+    pool: DriverLender,
+    tmp_dir: str,
+    classification_matcher: ClassificationMatcher,
+    keyword: str,
+    min_keyword_count: int,
+    fetcher: Optional[HttpPageFetcher],
+    extraction_mode: ExtractionModeEnum,
+    downloader: Optional[PdfDownloadManager],
+    page_cache: Optional[PageCache],
+    ledger: Optional[JobLedger],
+    registry: Optional[PatentRegistry],
+    use_cards: bool,
+    result_formats: Tuple[ResultFormatEnum, ...],
+    consolidated_writer: Optional[ConsolidatedXlsxWriter] = None,
+) -> int:
+    sinks = [create_result_sink(directory=dir_author, formats=result_formats)]
+    if consolidated_writer is not None:
+        sinks.append(ConsolidatedResultSink(writer=consolidated_writer, author=element["name"]))
+    with CompositeResultSink(sinks=sinks) as sink, pool.lend() as chrome:
+        parser = SeleniumPatentsParser(
+            driver=chrome,
+            tmp_dir=tmp_dir,
+            keyword=keyword,
+            min_keyword_count=min_keyword_count,
+            classification_matcher=classification_matcher,
+            fetcher=fetcher,
+            extraction_mode=extraction_mode,
+            downloader=downloader,
+            page_cache=page_cache,
+            ledger=ledger,
+            registry=registry,
+        )
+        parser.set_links(links=element["links"])
+        parser.set_cards(cards=element.get("cards") if use_cards else None)
+        parser.set_result_sink(result_sink=sink)
+        parser.parse_patents_links(patent_dir=dir_patent)
+        return parser.get_emitted_count()
+
+
+def parse_main_links(
+    pool: DriverLender,
+    request: str,
+    search_client: Optional[PatentsSearchClient],
+) -> List[Dict]:
+    with pool.lend() as chrome:
+        parser = SeleniumMainLinksParser(driver=chrome, request=request, search_client=search_client)
+        return parser.collect_links()
+
+
+def parse_inventors_links(
+    element: Dict,
+    pool: DriverLender,
+    request_params_before: str,
+    request_params_after: str,
+) -> List[Dict]:
+    query_builder = InventorQueryBuilder(
+        request_params_before=request_params_before,
+        request_params_after=request_params_after,
+    )
+    card_links = query_builder.links_from_card(card=element.get("card"))
+    if card_links is not None:
+        return card_links
+    with pool.lend() as chrome:
+        parser = SeleniumInventorsLinksParser(
+            driver=chrome,
+            request_params_before=request_params_before,
+            request_params_after=request_params_after,
+        )
+        parser.set_links(links=[element])
+        return parser.collect_links()
+
+
+def parse_patents_inventors_links(
+    element: Dict,
+    pool: DriverLender,
+    search_client: Optional[PatentsSearchClient],
+) -> List[Dict]:
+    if search_client is not None:
+        links = search_client.collect_links(query=PatentsSearchClient.query_from_link(link=element["link"]))
+        if links is not None:
+            return SeleniumPatentsInventorsLinksParser.inventor_links(element=element, links=links)
+        Message.warning_message("Сбор ссылок по API не удался, используется пагинация в браузере.")
+    with pool.lend() as chrome:
+        parser = SeleniumPatentsInventorsLinksParser(driver=chrome)
+        parser.set_links(links=[element])
+        return parser.collect_links()
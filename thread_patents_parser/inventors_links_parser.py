@@ -1,43 +1,76 @@
-import time
-from random import randint
-from typing import List, Dict
+from typing import List, Dict, Optional
 from urllib.parse import urljoin
 
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
-from general_classes.enums import XpathRightPartElements, UniqueNames
+from general_classes.enums import XpathRightPartElements, UniqueNames, ReadySignalElements
 from general_classes.logger import Message
+from general_classes.statistics import STATISTICS
+from general_classes.type_annotations import PatentCard
 from thread_patents_parser.base import SeleniumLinksParser
 
 
+class InventorQueryBuilder:
+    BASE_URL = SeleniumLinksParser.BASE_URL
+
+    def __init__(self, request_params_before: str, request_params_after: str) -> None:
+        self._request_params_before = request_params_before
+        self._request_params_after = request_params_after.replace(",", "%2C")
+
+    def build(self, name: str) -> Dict:
+        inv_name = name.replace(",", "%2C").replace(" ", "+")
+        query = (
+            f"?q={self._request_params_before}&inventor={inv_name}&{self._request_params_after}"
+            f"&oq={self._request_params_before}+inventor:({inv_name})+{self._request_params_after})"
+        )
+        Message.info_message(f"Сгенерированный Query-запрос: {query}")
+        return {"name": name.replace(" ", "_"), "query": query}
+
+    def links_from_card(self, card: Optional[PatentCard]) -> Optional[List[Dict]]:
+        if not card or not card.get("inventors") or card.get("inventors_truncated"):
+            return None
+        STATISTICS.increment("cards.navigations_avoided")
+        return self.convert(data=[self.build(name=name) for name in card["inventors"]])
+
+    def convert(self, data: List[Dict]) -> List[Dict]:
+        return [
+            {"name": element["name"], "link": urljoin(base=self.BASE_URL, url=element["query"])}
+            for element in data
+        ]
+
+
 class SeleniumInventorsLinksParser(SeleniumLinksParser):
+    READY_SIGNAL = ReadySignalElements.patent_result
 
     def __init__(self, driver: webdriver.Chrome, request_params_before: str, request_params_after: str) -> None:
         super().__init__(driver)
         self._inventors_links_list = []
-        self._request_params_before = request_params_before
-        self._request_params_after = request_params_after.replace(",", "%2C")
+        self._query_builder = InventorQueryBuilder(
+            request_params_before=request_params_before,
+            request_params_after=request_params_after,
+        )
 
     def collect_links(self) -> List:
         len_inventors_links = len(self._links)
+        valid_links = []
         for element in self._links:
             link = element["link"]
             Message.info_message(f"Осталось спарсить ссылок: {len_inventors_links}")
             Message.info_message(f"Текущая ссылка: {link}")
+            len_inventors_links -= 1
+            card_links = self._query_builder.links_from_card(card=element.get("card"))
+            if card_links is not None:
+                Message.info_message(f"Авторы взяты из карточки результата поиска. URL: {link}")
+                valid_links.extend(card_links)
+                continue
             self._follow_the_link(link=link)
             self._find_inventors_links(link=link)
-            if len_inventors_links % 10 == 0:
-                time.sleep(randint(5, 10))
-            len_inventors_links -= 1
-        valid_links = self._links_converter(data=self._inventors_links_list)
+        valid_links.extend(self._links_converter(data=self._inventors_links_list))
         return valid_links
 
     def _find_inventors_links(self, link: str) -> None:
-        people_section = self._driver.find_elements(
-            by=By.XPATH, value=XpathRightPartElements.inventors_link.value
-        )
+        people_section = self._find_elements(element=XpathRightPartElements.inventors_link)
         if not people_section:
             Message.warning_message(f"Секция people_section не найдена. URL: {link}")
         else:
@@ -47,14 +80,7 @@ class SeleniumInventorsLinksParser(SeleniumLinksParser):
         inventors = []
         for element in people_section:
             if self._check_inventor_element(element=element):
-                name = element.text
-                inv_name = name.replace(",", "%2C").replace(" ", "+")
-                query = (
-                    f"?q={self._request_params_before}&inventor={inv_name}&{self._request_params_after}"
-                    f"&oq={self._request_params_before}+inventor:({inv_name})+{self._request_params_after})"
-                )
-                inventors.append({"name": name.replace(" ", "_"), "query": query})
-                Message.info_message(f"Сгенерированный Query-запрос: {query}")
+                inventors.append(self._query_builder.build(name=element.text))
         if not inventors:
             Message.warning_message(f"Авторы не найдены. Query-запросы не сгенерированы. URL: {link}")
         else:
@@ -63,10 +89,7 @@ class SeleniumInventorsLinksParser(SeleniumLinksParser):
 
     def _links_converter(self, data: List[Dict]) -> List[Dict]:
         Message.info_message(f"Конвертация {len(data)} ссылок..")
-        list_link = [
-            {"name": element["name"], "link": urljoin(base=self.BASE_URL, url=element["query"])}
-            for element in data
-        ]
+        list_link = self._query_builder.convert(data=data)
         Message.info_message(f"Всего ссылок: {len(data)}")
         return list_link
 
@@ -1,45 +1,64 @@
-import re
+import os
 import sys
-import threading
-import time
 from datetime import datetime
-from typing import List, Callable
+from functools import partial
 
-from general_classes.enums import DirTypeEnum, FileTypeEnum
-from general_classes.file_services import MakeDirManager, XlsxFileWriter, LinksJsonFileReader
+from general_classes.archive_writer import StreamingArchiveWriter
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import DirTypeEnum, FileTypeEnum, ExtractionModeEnum, BrowserProfileEnum, ResultFormatEnum
+from general_classes.file_services import MakeDirManager, XlsxFileWriter, ConsolidatedXlsxWriter
+from general_classes.http_client import HttpClient, HttpPageFetcher
+from general_classes.job_ledger import JobLedger
+from general_classes.keyword_scorer import KeywordScorer
+from general_classes.local_server import MetricsHttpServer
 from general_classes.logger import Message
+from general_classes.page_cache import PageCache
+from general_classes.patent_registry import PatentRegistry
+from general_classes.pdf_downloader import PdfDownloadManager
+from general_classes.rate_governor import RATE_GOVERNOR
+from general_classes.result_sinks import parse_result_formats
+from general_classes.search_client import PatentsSearchClient
+from general_classes.statistics import STATISTICS
+from thread_patents_parser.driver_pool import WebDriverPool
 from thread_patents_parser.file_services import LinksJsonFileWriter
 from thread_patents_parser.functions_performed import (
-    divide_into_parts, RESULT_ARRAY, validate_urls, collect_inventors_links,
-    collect_patents_inventors_links, collect_main_links, collect_patent,
+    collect_inventors_links, collect_patents_inventors_links, collect_main_links, collect_patent, create_driver,
+    report_browser_profile,
 )
+from thread_patents_parser.scheduler import WorkQueue, StageOutput, start_stage
 
 MAIN_JSON: str = FileTypeEnum.MAIN_JSON.value
 INVENTORS_JSON: str = FileTypeEnum.INVENTORS_JSON.value
 PATENTS_JSON: str = FileTypeEnum.PATENTS_JSON.value
+LEDGER_DB: str = FileTypeEnum.LEDGER_DB.value
+METRICS_JSON: str = FileTypeEnum.METRICS_JSON.value
 TEMP_DIR: str = DirTypeEnum.TEMP_DIR.value
 LINKS_DIR: str = DirTypeEnum.LINKS_DIR.value
 RESULT_DIR: str = DirTypeEnum.RESULT_DIR.value
+CACHE_DIR: str = DirTypeEnum.CACHE_DIR.value
 
 DEFAULT_THREADS_COUNT = 8
 DEFAULT_KEYWORD_COUNT = 10
 REQUIRED_WORD = "assignee"
-
-
-def execute_threading_command(target_func: Callable, links: List,  *args) -> None:
-    parts = divide_into_parts(array=links, parts=DEFAULT_THREADS_COUNT)
-    threads = []
-    for number in range(DEFAULT_THREADS_COUNT):
-        thread = threading.Thread(
-            target=target_func,
-            args=(parts[number], *args),
-            name=f'Thread {number + 1}'
-        )
-        thread.start()
-        threads.append(thread)
-    Message.info_message(f'Создание {DEFAULT_THREADS_COUNT} потоков...')
-    for thread in threads:
-        thread.join()
+USE_HTTP_FETCHER = True
+USE_SEARCH_API = True
+EXTRACTION_MODE = ExtractionModeEnum.SCRIPT
+BROWSER_PROFILE = BrowserProfileEnum.SCRAPING
+STAGE_QUEUE_SIZE = 32
+STAGE_BROWSER_WEIGHTS = (1, 1, 2)
+WRITE_LINKS_JSON = True
+USE_PDF_DOWNLOADER = True
+PDF_DOWNLOAD_WORKERS = 4
+USE_PAGE_CACHE = True
+REQUESTS_PER_SECOND = 4.0
+RESUME = "--resume" in sys.argv
+USE_PATENT_REGISTRY = True
+USE_RESULT_CARDS = True
+WRITE_CONSOLIDATED_XLSX = True
+ARCHIVE_VOLUME_BYTES = None
+RESULT_FORMATS = parse_result_formats(argv=sys.argv, default=(ResultFormatEnum.XLSX, ResultFormatEnum.JSONL))
+METRICS_PORT = None
+WRITE_METRICS_JSON = True
 
 
 if __name__ == '__main__':
@@ -48,9 +67,13 @@ if __name__ == '__main__':
         'Введите поисковый запрос формата "((((H04L9)) OR (crypt))) '
         f'{REQUIRED_WORD}:raytheon country:US language:ENGLISH)": '
     ).strip()
-    keyword = input('Введите ключевое слово для поиска на странице: ')
+    keyword = input(
+        'Введите ключевые слова для поиска на странице через запятую, '
+        'при необходимости с весом (формат "crypt:2, secure key"; слова ищутся как обычный текст, '
+        'без регулярных выражений; пустой ввод отключает проверку): '
+    )
     min_keyword_count = input(
-        f'Введите мин.количество ключевых слов на странице(по умолчанию {DEFAULT_KEYWORD_COUNT}): '
+        f'Введите мин.суммарный вес ключевых слов на странице(по умолчанию {DEFAULT_KEYWORD_COUNT}): '
     )
 
     if REQUIRED_WORD not in request:
@@ -60,81 +83,201 @@ if __name__ == '__main__':
     split_params = request.split(REQUIRED_WORD)
     request_params_before = split_params[0].strip().replace(" ", "+")
     request_params_after = split_params[1].strip().split(" ", maxsplit=1)[1].replace(" ", "+")
-    classifications_code = re.search(r'[^(][a-zA-Z\d]+[^)]', request_params_before)
+    classifications_codes = ClassificationMatcher.codes_in_text(text=request_params_before.upper())
 
-    if not classifications_code:
+    if not classifications_codes:
         Message.error_message("Неверный формат поискового запроса. Не найден код классификатора")
         sys.exit()
 
+    extra_classifications_codes = input(
+        'Введите дополнительные коды классификаторов через запятую, диапазоны через "-", '
+        'исключения с "!" (например "G06F21/60-G06F21/64, !H04L9/32"), или оставьте пустым: '
+    )
+
     threads_count = input(f'Введите желаемое количество потоков(по умолчанию {DEFAULT_THREADS_COUNT}): ')
     result_zip_file_name = input('Введите желаемое название архива с результатом: ')
 
     start_time = datetime.now()
+    RATE_GOVERNOR.configure(requests_per_second=REQUESTS_PER_SECOND)
+    metrics_server = MetricsHttpServer(port=METRICS_PORT).start() if METRICS_PORT else None
 
     DEFAULT_THREADS_COUNT = int(threads_count) if threads_count.isdigit() else DEFAULT_THREADS_COUNT
     DEFAULT_KEYWORD_COUNT = int(min_keyword_count) if min_keyword_count.isdigit() else DEFAULT_KEYWORD_COUNT
-    valid_classifications_code = classifications_code.group(0)
-    Message.info_message(f'Код классификатора: {valid_classifications_code}')
+    classification_matcher = ClassificationMatcher.from_spec(
+        spec=", ".join(classifications_codes + [extra_classifications_codes])
+    )
+    Message.info_message(f'Коды классификаторов: {classification_matcher.describe()}')
+    if not KeywordScorer.from_prompt(raw=keyword, threshold=0).enabled:
+        Message.warning_message("Ключевые слова не заданы, проверка по ключевым словам отключена.")
     dir_manager = MakeDirManager()
+    http_client = HttpClient(pool_size=DEFAULT_THREADS_COUNT)
+    fetcher = HttpPageFetcher(client=http_client) if USE_HTTP_FETCHER else None
+    page_cache = PageCache(directory=dir_manager.make_link_dir(name=CACHE_DIR)) if USE_PAGE_CACHE else None
+    search_client = PatentsSearchClient(client=http_client, page_cache=page_cache) if USE_SEARCH_API else None
+    downloader = PdfDownloadManager(client=http_client, max_workers=PDF_DOWNLOAD_WORKERS) if USE_PDF_DOWNLOADER else None
 
+    pool = None
+    ledger = None
+    consolidated_writer = None
+    archive_writer = None
+    registry = PatentRegistry() if USE_PATENT_REGISTRY else None
     try:
         links_dir = dir_manager.make_link_dir(name=LINKS_DIR)
+        ledger = JobLedger(path=os.path.join(links_dir, LEDGER_DB))
+        if RESUME:
+            ledger.requeue_in_progress()
+        else:
+            ledger.reset()
         temporary_dir = dir_manager.make_temp_browser_dir(directory=TEMP_DIR)
-        path_to_main_links = collect_main_links(
-            path_to_chrome_driver=path_to_chrome_driver,
-            request=request,
-            directory=links_dir,
-            file_name=MAIN_JSON
+        pool_size = max(DEFAULT_THREADS_COUNT, len(STAGE_BROWSER_WEIGHTS))
+        pool = WebDriverPool(
+            factory=partial(
+                create_driver,
+                path_to_chrome_driver=path_to_chrome_driver,
+                tmp_dir=temporary_dir,
+                profile=BROWSER_PROFILE,
+            ),
+            size=pool_size,
+        ).start()
+        inventors_pool, patents_links_pool, patents_pool = (
+            pool.share(name=name, size=size)
+            for name, size in zip(
+                ("Inventors", "Patents links", "Patents"),
+                WebDriverPool.split_capacity(size=pool_size, weights=STAGE_BROWSER_WEIGHTS),
+            )
         )
-        time.sleep(10)
-
-        main_links = LinksJsonFileReader.parse_file(path_to_links=path_to_main_links)
-        execute_threading_command(
-            collect_inventors_links,
-            main_links,
-            request_params_before,
-            request_params_after,
-            path_to_chrome_driver,
+        result_dir_name = dir_manager.make_result_dir(name=RESULT_DIR)
+        if WRITE_CONSOLIDATED_XLSX:
+            consolidated_writer = ConsolidatedXlsxWriter(directory=result_dir_name)
+        archive_writer = StreamingArchiveWriter(
+            name=result_zip_file_name,
+            root_dir=result_dir_name,
+            max_volume_bytes=ARCHIVE_VOLUME_BYTES,
         )
-        valid_urls = validate_urls(array=RESULT_ARRAY)
-        path_to_inventors_links = LinksJsonFileWriter.write_links_to_file(
-            file_name=INVENTORS_JSON,
-            data=valid_urls,
-            directory=links_dir
+        side_output_dir = links_dir if WRITE_LINKS_JSON else None
+
+        main_queue = WorkQueue()
+        inventors_queue = WorkQueue(maxsize=STAGE_QUEUE_SIZE)
+        patents_queue = WorkQueue(maxsize=STAGE_QUEUE_SIZE)
+        inventors_output = StageOutput(
+            queue=inventors_queue,
+            key=lambda element: element["link"].lower(),
+            keep_history=WRITE_LINKS_JSON,
         )
-        RESULT_ARRAY.clear()
-        time.sleep(10)
-
-        inventors_links = LinksJsonFileReader.parse_file(path_to_links=path_to_inventors_links)
-        execute_threading_command(collect_patents_inventors_links, inventors_links, path_to_chrome_driver)
-        path_to_json_links = LinksJsonFileWriter.write_links_to_file(
-            file_name=PATENTS_JSON,
-            data=RESULT_ARRAY,
-            directory=links_dir,
+        patents_output = StageOutput(
+            queue=patents_queue,
+            size_key=lambda element: len(element["links"]),
+            keep_history=WRITE_LINKS_JSON,
         )
-        Message.info_message(f'Общее количество элементов: {len(RESULT_ARRAY)}')
-        RESULT_ARRAY.clear()
-        time.sleep(10)
+        stages = [
+            start_stage(
+                collect_inventors_links,
+                main_queue,
+                inventors_pool.size,
+                inventors_output,
+                request_params_before,
+                request_params_after,
+                inventors_pool,
+                ledger,
+                name="Inventors",
+                on_finish=inventors_output.close,
+            ),
+            start_stage(
+                collect_patents_inventors_links,
+                inventors_queue,
+                patents_links_pool.size,
+                patents_output,
+                patents_links_pool,
+                search_client,
+                ledger,
+                name="Patents links",
+                on_finish=patents_output.close,
+            ),
+            start_stage(
+                collect_patent,
+                patents_queue,
+                patents_pool.size,
+                patents_pool,
+                temporary_dir,
+                result_dir_name,
+                classification_matcher,
+                keyword,
+                DEFAULT_KEYWORD_COUNT,
+                fetcher,
+                EXTRACTION_MODE,
+                downloader,
+                page_cache,
+                ledger,
+                registry,
+                USE_RESULT_CARDS,
+                consolidated_writer,
+                RESULT_FORMATS,
+                archive_writer,
+                name="Patents",
+            ),
+        ]
+        try:
+            main_links = collect_main_links(
+                pool=inventors_pool,
+                request=request,
+                file_name=MAIN_JSON,
+                directory=side_output_dir,
+                search_client=search_client,
+                ledger=ledger,
+            )
+            for element in main_links:
+                main_queue.put(element)
+        finally:
+            main_queue.close()
+            for stage in stages:
+                stage.join()
 
-        patents_links = LinksJsonFileReader.parse_file(path_to_links=path_to_json_links)
-        result_dir_name = dir_manager.make_result_dir(name=RESULT_DIR)
-        execute_threading_command(
-            collect_patent,
-            patents_links,
-            path_to_chrome_driver,
-            temporary_dir,
-            result_dir_name,
-            valid_classifications_code,
-            keyword,
-            DEFAULT_KEYWORD_COUNT,
-        )
+        if WRITE_LINKS_JSON:
+            LinksJsonFileWriter.write_links_to_file(
+                file_name=INVENTORS_JSON,
+                data=inventors_output.history,
+                directory=links_dir,
+            )
+            LinksJsonFileWriter.write_links_to_file(
+                file_name=PATENTS_JSON,
+                data=patents_output.history,
+                directory=links_dir,
+            )
+        Message.info_message(f'Общее количество элементов: {patents_output.emitted}')
 
+        if consolidated_writer is not None:
+            consolidated_writer.close()
+            archive_writer.add_file(path=consolidated_writer.path)
+        if downloader is not None:
+            downloader.wait()
+        archive_writer.finalize()
         XlsxFileWriter.delete_empty_directory(dir_name=RESULT_DIR)
-        time.sleep(5)
-        XlsxFileWriter.zipped_files(dir_name=RESULT_DIR, zip_file_name=result_zip_file_name)
     except (FileNotFoundError, KeyError, IndexError, TypeError) as Error:
         Message.error_message(f"Ошибка в работе программы. Ошибка: {Error}.")
     finally:
+        if consolidated_writer is not None:
+            consolidated_writer.close()
+        if downloader is not None:
+            downloader.close()
+        if archive_writer is not None:
+            archive_writer.abort()
+        if pool is not None:
+            pool.sample_memory()
+            pool.close()
+            report_browser_profile(profile=BROWSER_PROFILE)
         execution_time = datetime.now() - start_time
         Message.info_message(f"Время выполнения: {execution_time}")
+        if page_cache is not None:
+            page_cache.report()
+        RATE_GOVERNOR.report()
+        if registry is not None:
+            registry.report()
+        if ledger is not None:
+            ledger.report()
+            ledger.close()
+        STATISTICS.report()
+        if WRITE_METRICS_JSON:
+            STATISTICS.dump_json(path=os.path.join(os.getcwd(), METRICS_JSON))
+        if metrics_server is not None:
+            metrics_server.stop()
         Message.success_message("============== Завершение работы программы. ==============")
@@ -1,24 +1,32 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from urllib.parse import urljoin
 
 from selenium import webdriver
 from selenium.webdriver import Keys
-from selenium.webdriver.common.by import By
 
-from general_classes.enums import SearchItems
+from general_classes.enums import SearchItems, ReadySignalElements
 from general_classes.logger import Message
+from general_classes.search_client import PatentsSearchClient
 from thread_patents_parser.base import SeleniumLinksParser
 
 
 class SeleniumMainLinksParser(SeleniumLinksParser):
 
-    def __init__(self, driver: webdriver.Chrome, request: str) -> None:
-        super().__init__(driver)
+    def __init__(
+        self, driver: webdriver.Chrome, request: str, search_client: Optional[PatentsSearchClient] = None
+    ) -> None:
+        super().__init__(driver, search_client)
         self._request = request
         self._main_links_list = []
 
     def collect_links(self) -> List[Dict]:
-        self._follow_the_link(link=self.BASE_URL)
+        api_links = self._collect_links_from_api(query=PatentsSearchClient.build_query(request=self._request))
+        if api_links is not None:
+            if not api_links:
+                raise ValueError("Ошибка. Результатов по введённому запросу не найдено")
+            return self._links_converter(data=api_links)
+
+        self._follow_the_link(link=self.BASE_URL, ready_signal=ReadySignalElements.search_form)
         self._fill_form(request=self._request)
         if not self._check_result():
             raise ValueError("Ошибка. Результатов по введённому запросу не найдено")
@@ -27,12 +35,11 @@ class SeleniumMainLinksParser(SeleniumLinksParser):
         return valid_links
 
     def _fill_form(self, request: str) -> None:
-        form = self._driver.find_element(
-            by=By.XPATH, value=SearchItems.search_form.value
-        )
+        form = self._find_element(element=SearchItems.search_form)
         form.send_keys(request)
         form.send_keys(Keys.ENTER)
         Message.info_message("Ввод запроса в форму...")
+        self._waiter.wait_until_ready(signal=ReadySignalElements.search_results)
 
     def _links_converter(self, data: List[Dict]) -> List[Dict]:
         Message.info_message(f"Конвертация основных ссылок: {len(data)}")
@@ -42,6 +49,6 @@ class SeleniumMainLinksParser(SeleniumLinksParser):
             link = element["link"]
             if link not in seen_links:
                 seen_links.add(link)
-                list_link.append({"link": urljoin(base=self.BASE_URL, url=element["link"])})
+                list_link.append({"link": urljoin(base=self.BASE_URL, url=link), "card": element.get("card")})
         Message.info_message(f"Всего уникальных ссылок: {len(list_link)}")
         return list_link
@@ -2,7 +2,7 @@ import os
 import re
 import threading
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Dict
 from urllib.parse import urljoin
 
 from selenium import webdriver
@@ -10,9 +10,23 @@ from selenium.common import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
-from general_classes.enums import XpathRightPartElements, UniqueNames, XpathIdElements
+from general_classes.classification_matcher import ClassificationMatcher
+from general_classes.enums import (
+    XpathRightPartElements, UniqueNames, XpathIdElements, ExtractionModeEnum, LedgerStageEnum,
+    KeywordCountModeEnum,
+)
+from general_classes.http_client import HttpPageFetcher
+from general_classes.job_ledger import JobLedger
+from general_classes.keyword_scorer import KeywordScorer
 from general_classes.logger import Message
-from general_classes.type_annotations import JsonDict, State
+from general_classes.page_cache import PageCache
+from general_classes.patent_registry import PatentRegistry, RegisteredPatent
+from general_classes.pdf_downloader import PdfDownloadManager, link_or_copy
+from general_classes.result_sinks import ResultSink
+from general_classes.search_client import PatentsSearchClient
+from general_classes.static_page_parser import StaticPageParserMixin
+from general_classes.statistics import STATISTICS
+from general_classes.type_annotations import JsonDict, State, PatentCard, PatentPage
 from thread_patents_parser.base import SeleniumLinksParser, SeleniumBaseParser
 
 LOCK = threading.Lock()
@@ -20,79 +34,236 @@ LOCK = threading.Lock()
 
 class SeleniumPatentsInventorsLinksParser(SeleniumLinksParser):
 
-    def __init__(self, driver: webdriver.Chrome):
-        super().__init__(driver)
-        self._json_element = JsonDict()
+    def __init__(self, driver: webdriver.Chrome, search_client: Optional[PatentsSearchClient] = None):
+        super().__init__(driver, search_client)
         self._patents_links_list = []
 
     def collect_links(self) -> List[JsonDict]:
         len_patents_links = len(self._links)
         for element in self._links:
             link = element["link"]
-            inventor = element["name"]
             Message.info_message(f"Осталось спарсить ссылок: {len_patents_links}")
             Message.info_message(f"Текущая ссылка: {link}")
-            self._follow_the_link(link=link)
             len_patents_links -= 1
-            if not self._check_result():
-                Message.warning_message(f"Патенты у автора {inventor} не найдена")
-                continue
-            self._json_element["name"] = inventor
-            self._json_element["links"] = []
-            self._add_links_to_list(list_=self._json_element["links"])
-            valid_links = self._links_converter(data=self._json_element["links"])
-            self._json_element["links"] = valid_links
-            copy_element = self._json_element.copy()
-            self._patents_links_list.append(copy_element)
+            links = self._collect_links_from_api(query=PatentsSearchClient.query_from_link(link=link))
+            if links is None:
+                links = self._collect_links_from_browser(link=link)
+            self._patents_links_list.extend(self.inventor_links(element=element, links=links))
         return self._patents_links_list
 
-    def _links_converter(self, data: List) -> List:
+    @classmethod
+    def inventor_links(cls, element: Dict, links: List[Dict]) -> List[JsonDict]:
+        if not links:
+            Message.warning_message(f"Патенты у автора {element['name']} не найдена")
+            return []
+        return [JsonDict(
+            name=element["name"],
+            links=cls._links_converter(data=links),
+            cards=cls._cards_converter(data=links),
+        )]
+
+    @classmethod
+    def _links_converter(cls, data: List) -> List:
         Message.info_message(f"Конвертация {len(data)} ссылок..")
-        list_link = list({urljoin(base=self.BASE_URL, url=element["link"]) for element in data})
+        list_link = list({urljoin(base=cls.BASE_URL, url=element["link"]) for element in data})
         Message.info_message(f"Всего уникальных ссылок: {len(list_link)}")
         return list_link
 
+    @classmethod
+    def _cards_converter(cls, data: List) -> Dict[str, PatentCard]:
+        return {
+            urljoin(base=cls.BASE_URL, url=element["link"]): element["card"]
+            for element in data
+            if element.get("card")
+        }
+
 
-class SeleniumPatentsParser(SeleniumBaseParser):
+class SeleniumPatentsParser(StaticPageParserMixin, SeleniumBaseParser):
+    CARD_FIELDS = (
+        ("title", "_find_title"),
+        ("patent_code", "_find_patent_code"),
+        ("priority_date", "_find_priority_date"),
+        ("publication_date", "_find_publication_date"),
+    )
 
     def __init__(
         self,
         driver: webdriver.Chrome,
         tmp_dir: str,
-        valid_classifications_code: str,
+        classification_matcher: ClassificationMatcher,
         keyword: str,
-        min_keyword_count: int
+        min_keyword_count: int,
+        fetcher: Optional[HttpPageFetcher] = None,
+        extraction_mode: ExtractionModeEnum = ExtractionModeEnum.ELEMENTS,
+        downloader: Optional[PdfDownloadManager] = None,
+        page_cache: Optional[PageCache] = None,
+        keyword_count_mode: KeywordCountModeEnum = KeywordCountModeEnum.BROWSER,
+        ledger: Optional[JobLedger] = None,
+        registry: Optional[PatentRegistry] = None,
+        selector_timeouts: Optional[Dict[str, float]] = None,
     ) -> None:
-        super().__init__(driver)
+        super().__init__(driver, selector_timeouts)
         self._tmp_dir = tmp_dir
-        self._valid_classifications_code = valid_classifications_code
         self._keyword = keyword
         self._min_keyword_count = min_keyword_count
+        self._init_static_parser(
+            fetcher=fetcher,
+            extraction_mode=extraction_mode,
+            downloader=downloader,
+            page_cache=page_cache,
+            classification_matcher=classification_matcher,
+            keyword_scorer=KeywordScorer.from_prompt(raw=keyword, threshold=min_keyword_count),
+            keyword_count_mode=keyword_count_mode,
+        )
         self._state = State()
         self._url_regex = re.compile(r"^(http|https)://([\w.]+/?)\S*$")
         self._result_list = []
+        self._last_state: Optional[State] = None
+        self._emitted_count = 0
+        self._ledger = ledger
+        self._registry = registry
+        self._cards: Dict[str, PatentCard] = {}
+        self._result_sink: Optional[ResultSink] = None
+
+    def set_result_sink(self, result_sink: Optional[ResultSink]) -> None:
+        self._result_sink = result_sink
+
+    def set_cards(self, cards: Optional[Dict[str, PatentCard]]) -> None:
+        self._cards = cards or {}
 
     def parse_patents_links(self, patent_dir: str) -> None:
         for link in self._links:
-            self._follow_the_link(link=link)
-            self._state["link"] = link
-            Message.success_message(f"Ссылка сохранена")
-            self._click_to_more_button()
+            job_key = self._job_key(link=link, patent_dir=patent_dir)
+            if self._restore_from_ledger(link=link, job_key=job_key, patent_dir=patent_dir):
+                continue
+            if self._reuse_registered_patent(link=link, job_key=job_key, patent_dir=patent_dir):
+                continue
+            if self._ledger is not None:
+                self._ledger.start(stage=LedgerStageEnum.PATENTS, key=job_key)
+            try:
+                accepted = self._parse_patent_link(link=link, patent_dir=patent_dir)
+            except Exception:
+                if self._registry is not None:
+                    self._registry.abandon(link=link)
+                raise
+            state = self._last_state if accepted else None
+            if self._registry is not None:
+                self._registry.complete(link=link, state=state, patent_dir=patent_dir)
+            if self._ledger is not None:
+                self._ledger.finish(stage=LedgerStageEnum.PATENTS, key=job_key, payload=state)
 
+    def _parse_patent_link(self, link: str, patent_dir: str) -> bool:
+        card = self._cards.get(link)
+        page = self._load_page(link=link)
+        if page is not None:
+            self._state["link"] = link
             try:
-                self._find_classification_codes()
+                self._parse_static_page(page=page, patent_dir=patent_dir)
             except ValueError:
-                continue
+                return False
+            self._add_state_to_result_list()
+            return True
+
+        STATISTICS.increment("extraction.elements")
+        self._follow_the_link(link=link)
+        self._state["link"] = link
+        Message.success_message(f"Ссылка сохранена")
+        if not self._decided_by_visible_codes():
+            self._click_to_more_button()
+
+        try:
+            self._find_classification_codes()
+        except ValueError:
+            return False
+        finally:
+            self._store_browser_page(link=link)
 
-            self._find_title()
-            self._parse_people_section()
-            self._find_country()
-            self._find_priority_date()
-            self._find_patent_code()
-            self._find_publication_date()
-            self._find_abstract()
+        self._find_detail_fields(card=card or PatentCard())
+        if card and card.get("pdf_link"):
+            Message.info_message("Скачивание pdf файла...")
+            self._save_pdf_file(link=card["pdf_link"], patent_dir=patent_dir)
+        else:
             self._download_pdf_file(patent_dir=patent_dir)
-            self._add_state_to_result_list()
+        self._add_state_to_result_list()
+        return True
+
+    def _find_detail_fields(self, card: PatentCard) -> None:
+        for field, finder in self.CARD_FIELDS:
+            if card.get(field):
+                self._state[field] = card[field]
+                STATISTICS.increment("cards.fields_reused")
+            else:
+                getattr(self, finder)()
+        self._parse_people_section()
+        self._find_country()
+        self._find_abstract()
+
+    def _complete_page(self, page: PatentPage, link: str) -> None:
+        self._fill_page_from_card(page=page, card=self._cards.get(link))
+        super()._complete_page(page=page, link=link)
+
+    def _fill_page_from_card(self, page: PatentPage, card: Optional[PatentCard]) -> None:
+        if not card:
+            return
+        for field in ("title", "patent_code", "priority_date", "publication_date", "pdf_link"):
+            if page.get(field) is None and card.get(field):
+                page[field] = card[field]
+                STATISTICS.increment("cards.fields_reused")
+
+    def _restore_from_ledger(self, link: str, job_key: str, patent_dir: str) -> bool:
+        if self._ledger is None or not self._ledger.is_done(stage=LedgerStageEnum.PATENTS, key=job_key):
+            return False
+        state = self._ledger.payload(stage=LedgerStageEnum.PATENTS, key=job_key)
+        if self._registry is not None:
+            self._registry.complete(link=link, state=state, patent_dir=patent_dir)
+        if state is not None:
+            pdf_link = state.get("pdf_link")
+            target = os.path.join(patent_dir, os.path.basename(state.get("path_to_pdf_file", "")))
+            if self._downloader is not None and pdf_link and not os.path.exists(target):
+                self._schedule_pdf_download(link=pdf_link, patent_dir=patent_dir)
+            self._emit_state(state=state)
+        Message.info_message(f"Патент уже обработан, результат взят из журнала. Ключ: {job_key}")
+        return True
+
+    def _reuse_registered_patent(self, link: str, job_key: str, patent_dir: str) -> bool:
+        if self._registry is None:
+            return False
+        patent = self._registry.claim(link=link)
+        if patent is None:
+            return False
+        state = None
+        if patent.accepted:
+            state = patent.state_for(patent_dir=patent_dir)
+            self._place_registered_file(patent=patent, patent_dir=patent_dir)
+            self._emit_state(state=state)
+            Message.success_message(f"Патент уже разобран для другого автора, результат переиспользован. URL: {link}")
+        else:
+            Message.info_message(f"Патент уже отклонён для другого автора. URL: {link}")
+        if self._ledger is not None:
+            self._ledger.finish(stage=LedgerStageEnum.PATENTS, key=job_key, payload=state)
+        return True
+
+    def _place_registered_file(self, patent: RegisteredPatent, patent_dir: str) -> None:
+        source = patent.file_path
+        if source is None:
+            return
+        target = os.path.join(patent_dir, os.path.basename(source))
+        pdf_link = patent.state.get("pdf_link")
+        if self._downloader is not None and pdf_link:
+            self._downloader.submit(url=pdf_link, target=target)
+            return
+        try:
+            link_or_copy(source=source, target=target)
+        except OSError as error:
+            Message.warning_message(f"Не удалось скопировать файл патента. Путь: {target}. Ошибка: {error}")
+
+    @staticmethod
+    def _job_key(link: str, patent_dir: str) -> str:
+        author = os.path.basename(os.path.dirname(os.path.normpath(patent_dir)))
+        return f"{author}|{link}"
+
+    def get_emitted_count(self) -> int:
+        return self._emitted_count
 
     def get_state(self) -> List[State]:
         Message.info_message("Выгружается стейт...")
@@ -102,18 +273,14 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _click_to_more_button(self) -> None:
         try:
-            button = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.more_classifications_button.value
-            )
+            button = self._find_element(element=XpathIdElements.more_classifications_button)
             self._driver.execute_script("arguments[0].click();", button)
         except NoSuchElementException:
             Message.warning_message(f'Кнопка "View more classifications" не найдена. URL: {self._state["link"]}')
 
     def _find_classification_codes(self) -> None:
         try:
-            classification_element = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.classification_elements.value
-            )
+            classification_element = self._find_element(element=XpathIdElements.classification_elements)
         except NoSuchElementException:
             self._state["classification_codes"] = ""
             Message.warning_message(f'Коды патентных классификаторов не найдены. URL: {self._state["link"]}')
@@ -121,9 +288,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             self._parse_classification_elements(element=classification_element)
 
     def _parse_classification_elements(self, element: WebElement) -> None:
-        find_code_elements = element.find_elements(
-            by=By.XPATH, value=XpathIdElements.classification_element_codes.value
-        )
+        find_code_elements = self._find_elements(element=XpathIdElements.classification_element_codes)
         codes = [i.text for i in find_code_elements if i.text]
         self._validate_patent(list_of_code=codes)
         if not codes:
@@ -133,36 +298,44 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             self._state["classification_codes"] = ", ".join(codes)
             Message.success_message("Кода патентного классификатора сохранены.")
 
-    def _validate_patent(self, list_of_code: List[str]) -> None:
+    def _save_static_codes(self, codes: List[str], text: str) -> None:
+        self._validate_patent(list_of_code=codes, page_text=text)
+        super()._save_static_codes(codes=codes, text=text)
+
+    def _validate_patent(self, list_of_code: List[str], page_text: Optional[str] = None) -> None:
         Message.info_message(f' Проверка валидности патента...')
-        check_valid_code = [True if self._valid_classifications_code in code else False for code in list_of_code]
-        if any(check_valid_code):
-            Message.success_message(
-                f"Патент прошел проверку. Найден ключевой классификатор: {self._valid_classifications_code}"
+        denied_code = self._classification_matcher.find_denied(codes=list_of_code)
+        if denied_code is not None:
+            Message.warning_message(
+                f"Найден исключённый классификатор: {denied_code}. "
+                f'Патент записан не будет. URL: {self._state["link"]}'
             )
-            ...
+            STATISTICS.increment("patents.rejected.denied_code")
+            raise ValueError
+        allowed_code = self._classification_matcher.find_allowed(codes=list_of_code)
+        if allowed_code is not None:
+            STATISTICS.increment("patents.accepted.classification")
+            Message.success_message(f"Патент прошел проверку. Найден ключевой классификатор: {allowed_code}")
         else:
-            Message.warning_message(f"Не найден ключевой классификатор: {self._valid_classifications_code}")
-            html = self._driver.find_element(by=By.TAG_NAME, value='html').text
-            count_keywords = len(re.findall(self._keyword, html, flags=re.IGNORECASE))
-            valid_flag = count_keywords >= self._min_keyword_count
-            if not valid_flag:
+            Message.warning_message(f"Не найден ключевой классификатор: {self._classification_matcher.describe()}")
+            keyword_score = self._score_keywords(page_text=page_text)
+            if not keyword_score.passed:
+                STATISTICS.increment("patents.rejected.keywords")
                 Message.warning_message(
-                    f"Недостаточно ключевых слов в патенте. Найдено: {count_keywords}. "
+                    f"Недостаточно ключевых слов в патенте. Найдено: {keyword_score.describe()}. "
                     f"Мин.значение: {self._min_keyword_count}. "
                     f'Патент записан не будет. URL: {self._state["link"]}'
                 )
                 raise ValueError
+            STATISTICS.increment("patents.accepted.keywords")
             Message.success_message(
-                f"Патент прошел проверку. Найдено ключевых слов: {count_keywords}. "
+                f"Патент прошел проверку. Найдено ключевых слов: {keyword_score.describe()}. "
                 f"Мин.значение: {self._min_keyword_count}."
             )
 
     def _find_title(self) -> None:
         try:
-            title = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.patent_title.value
-            )
+            title = self._find_element(element=XpathIdElements.patent_title)
             self._state["title"] = title.text
             Message.success_message("Название патента сохранено")
         except NoSuchElementException:
@@ -170,9 +343,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             Message.warning_message(f'Название патента не найдено. URL: {self._state["link"]}')
 
     def _parse_people_section(self) -> None:
-        people_section = self._driver.find_elements(
-            by=By.XPATH, value=XpathRightPartElements.important_people_section.value
-        )
+        people_section = self._find_elements(element=XpathRightPartElements.important_people_section)
         if not people_section:
             self._state["current_assignee"] = []
             self._state["inventors"] = []
@@ -212,9 +383,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_priority_date(self) -> None:
         try:
-            priority_date = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.date_priority.value
-            )
+            priority_date = self._find_element(element=XpathRightPartElements.date_priority)
             date_to_datetime = datetime.strptime(priority_date.text, "%Y-%m-%d") if priority_date.text else ''
             self._state["priority_date"] = date_to_datetime.strftime("%d.%m.%Y") if date_to_datetime else ''
             Message.success_message("Дата приоритета сохранена")
@@ -224,9 +393,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_patent_code(self) -> None:
         try:
-            patent_code = self._driver.find_element(
-                by=By.XPATH, value=XpathIdElements.patent_code.value
-            )
+            patent_code = self._find_element(element=XpathIdElements.patent_code)
             self._state["patent_code"] = patent_code.text
             Message.success_message("Номер патента сохранён")
         except NoSuchElementException:
@@ -239,7 +406,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             patent_code=patent_code
         )
         try:
-            publication_date = self._driver.find_element(by=By.XPATH, value=xpath)
+            publication_date = self._find_element(element=XpathRightPartElements.date_publication_template, xpath=xpath)
             date_to_datetime = datetime.strptime(publication_date.text, "%Y-%m-%d")
             self._state["publication_date"] = date_to_datetime.strftime("%d.%m.%Y")
             Message.success_message("Дата публикации сохранена")
@@ -249,9 +416,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_abstract(self) -> None:
         try:
-            abstract = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.abstract.value
-            )
+            abstract = self._find_element(element=XpathRightPartElements.abstract)
             Message.success_message("Абстракт сохранён")
             self._state["abstract"] = abstract.text
         except NoSuchElementException:
@@ -260,9 +425,7 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _find_country(self) -> None:
         try:
-            country = self._driver.find_element(
-                by=By.XPATH, value=XpathRightPartElements.country.value
-            )
+            country = self._find_element(element=XpathRightPartElements.country)
             self._state["country"] = country.text
             Message.success_message("Страна сохранена")
         except NoSuchElementException:
@@ -271,11 +434,12 @@ class SeleniumPatentsParser(SeleniumBaseParser):
 
     def _download_pdf_file(self, patent_dir: str) -> None:
         Message.info_message("Скачивание pdf файла...")
-        element = self._driver.find_element(
-            by=By.XPATH, value=XpathRightPartElements.pdf.value
-        )
+        element = self._find_element(element=XpathRightPartElements.pdf)
         link = element.get_attribute("href")
-        LOCK.acquire()
+        self._save_pdf_file(link=link, patent_dir=patent_dir)
+
+    def _save_pdf_file(self, link: Optional[str], patent_dir: str) -> None:
+        self._state["pdf_link"] = link or ""
         if link is None:
             Message.warning_message(f'Ссылка для скачивания PDF не найдена. URL: {self._state["link"]}')
             Message.info_message("Скачивание html файла...")
@@ -283,14 +447,18 @@ class SeleniumPatentsParser(SeleniumBaseParser):
             target = os.path.join(patent_dir, f"{self._state['patent_code']}.html")
             with open(target, "w", encoding="utf-8") as file:
                 file.write(html)
+            Message.success_message("Файл успешно скачен.")
+        elif self._downloader is not None:
+            target = self._schedule_pdf_download(link=link, patent_dir=patent_dir)
         else:
+            LOCK.acquire()
             self._execute_download(link=link)
             file_name = os.listdir(self._tmp_dir)[0]
             file_path = os.path.join(self._tmp_dir, file_name)
             target = os.path.join(patent_dir, file_name)
             os.replace(file_path, target)
-        LOCK.release()
-        Message.success_message("Файл успешно скачен.")
+            LOCK.release()
+            Message.success_message("Файл успешно скачен.")
         self._state["path_to_pdf_file"] = "/".join(target.split("/")[-3:])
         Message.success_message("Путь к файлу сохранён.")
 
@@ -300,5 +468,12 @@ class SeleniumPatentsParser(SeleniumBaseParser):
         os.system(wget)
 
     def _add_state_to_result_list(self) -> None:
-        copy_state = self._state.copy()
-        self._result_list.append(copy_state)
+        self._emit_state(state=self._state.copy())
+
+    def _emit_state(self, state: State) -> None:
+        self._last_state = state
+        self._emitted_count += 1
+        if self._result_sink is not None:
+            self._result_sink.append(state=state)
+        else:
+            self._result_list.append(state)
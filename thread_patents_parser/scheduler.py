@@ -0,0 +1,264 @@
+import heapq
+import itertools
+import threading
+from typing import List, Callable, Optional, Dict, Any, Set
+
+from general_classes.logger import Message
+from general_classes.statistics import STATISTICS
+
+
+class ResourceTimeoutError(TimeoutError):
+    pass
+
+
+class WorkItem:
+
+    def __init__(self, item: Any, size: int, sequence: int) -> None:
+        self.item = item
+        self.size = size
+        self.sequence = sequence
+        self.attempts = 0
+        self.failed_by: Set[str] = set()
+
+    def __lt__(self, other: "WorkItem") -> bool:
+        return (-self.size, self.sequence) < (-other.size, other.sequence)
+
+
+class WorkQueue:
+
+    def __init__(self, maxsize: int = 0, max_attempts: int = 3) -> None:
+        self._condition = threading.Condition()
+        self._heap: List[WorkItem] = []
+        self._sequence = itertools.count()
+        self._maxsize = maxsize
+        self._max_attempts = max_attempts
+        self._in_progress = 0
+        self._closed = False
+
+    def put(self, item: Any, size: int = 1) -> None:
+        with self._condition:
+            while self._maxsize and len(self._heap) >= self._maxsize and not self._closed:
+                self._condition.wait()
+            heapq.heappush(self._heap, WorkItem(item=item, size=size, sequence=next(self._sequence)))
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def get(self, worker: str) -> Optional[WorkItem]:
+        with self._condition:
+            while True:
+                if self._heap:
+                    work_item = self._pop_for_worker(worker=worker)
+                    self._in_progress += 1
+                    self._condition.notify_all()
+                    return work_item
+                if self._closed and not self._in_progress:
+                    return None
+                self._condition.wait()
+
+    def task_done(self) -> None:
+        with self._condition:
+            self._in_progress -= 1
+            self._condition.notify_all()
+
+    def retry(self, work_item: WorkItem, worker: str) -> None:
+        with self._condition:
+            self._in_progress -= 1
+            work_item.attempts += 1
+            work_item.failed_by.add(worker)
+            if work_item.attempts >= self._max_attempts:
+                STATISTICS.increment("scheduler.dropped")
+                Message.error_message(f"Элемент отброшен после {work_item.attempts} попыток: {work_item.item}")
+            else:
+                Message.warning_message(f"Элемент возвращён в очередь для другого потока: {work_item.item}")
+                heapq.heappush(self._heap, work_item)
+            self._condition.notify_all()
+
+    def requeue(self, work_item: WorkItem) -> None:
+        with self._condition:
+            self._in_progress -= 1
+            heapq.heappush(self._heap, work_item)
+            self._condition.notify_all()
+
+    def consumer(self, worker: str) -> "WorkQueueConsumer":
+        return WorkQueueConsumer(queue=self, worker=worker)
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._heap)
+
+    def _pop_for_worker(self, worker: str) -> WorkItem:
+        skipped = []
+        work_item = heapq.heappop(self._heap)
+        while worker in work_item.failed_by and self._heap:
+            skipped.append(work_item)
+            work_item = heapq.heappop(self._heap)
+        if worker in work_item.failed_by and skipped:
+            skipped.append(work_item)
+            work_item = skipped.pop(0)
+        for element in skipped:
+            heapq.heappush(self._heap, element)
+        return work_item
+
+
+class WorkQueueConsumer:
+
+    def __init__(self, queue: WorkQueue, worker: str) -> None:
+        self._queue = queue
+        self._worker = worker
+        self._current: Optional[WorkItem] = None
+        self.completed = 0
+
+    def __iter__(self) -> "WorkQueueConsumer":
+        return self
+
+    def __next__(self) -> Any:
+        self.finish()
+        self._current = self._queue.get(worker=self._worker)
+        if self._current is None:
+            raise StopIteration
+        return self._current.item
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def finish(self) -> None:
+        if self._current is not None:
+            self._current = None
+            self.completed += 1
+            self._queue.task_done()
+
+    def fail(self) -> None:
+        if self._current is not None:
+            self._queue.retry(work_item=self._current, worker=self._worker)
+            self._current = None
+
+    def release(self) -> None:
+        if self._current is not None:
+            self._queue.requeue(work_item=self._current)
+            self._current = None
+
+
+def run_worker(target_func: Callable, queue: WorkQueue, max_restarts: int, *args) -> None:
+    worker = threading.current_thread().name
+    restarts = 0
+    while restarts <= max_restarts:
+        consumer = queue.consumer(worker=worker)
+        try:
+            target_func(consumer, *args)
+            consumer.finish()
+            return
+        except ResourceTimeoutError as error:
+            Message.warning_message(f"Поток {worker} не дождался ресурса: {error}. Элемент возвращён в очередь.")
+            STATISTICS.increment("scheduler.requeued")
+            consumer.release()
+            restarts = 1 if consumer.completed else restarts + 1
+        except Exception as error:
+            Message.error_message(f"Ошибка в потоке {worker}: {error!r}. Перезапуск обработчика...")
+            consumer.fail()
+            restarts = 1 if consumer.completed else restarts + 1
+    Message.error_message(f"Поток {worker} остановлен после {max_restarts} перезапусков.")
+
+
+class StageOutput:
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        key: Optional[Callable[[Any], str]] = None,
+        size_key: Optional[Callable[[Any], int]] = None,
+        keep_history: bool = False,
+    ) -> None:
+        self._queue = queue
+        self._key = key
+        self._size_key = size_key
+        self._keep_history = keep_history
+        self._lock = threading.Lock()
+        self._seen: Set[str] = set()
+        self._history: List = []
+        self._emitted = 0
+        self._duplicates = 0
+
+    @property
+    def history(self) -> List:
+        with self._lock:
+            return self._history.copy()
+
+    @property
+    def emitted(self) -> int:
+        with self._lock:
+            return self._emitted
+
+    def emit(self, items: List) -> None:
+        for item in items:
+            with self._lock:
+                if self._key is not None:
+                    key = self._key(item)
+                    if key in self._seen:
+                        self._duplicates += 1
+                        continue
+                    self._seen.add(key)
+                if self._keep_history:
+                    self._history.append(item)
+                self._emitted += 1
+            self._queue.put(item, size=self._size_key(item) if self._size_key else 1)
+
+    def close(self) -> None:
+        self._queue.close()
+        Message.info_message(
+            f"Передано элементов на следующий этап: {self.emitted}. Отброшено дубликатов: {self._duplicates}"
+        )
+
+
+def start_stage(
+    target_func: Callable,
+    queue: WorkQueue,
+    threads_count: int,
+    *args,
+    name: str = "Thread",
+    on_finish: Optional[Callable[[], None]] = None,
+    max_restarts: int = 3,
+) -> threading.Thread:
+    workers = [
+        threading.Thread(
+            target=run_worker,
+            args=(target_func, queue, max_restarts, *args),
+            name=f"{name} {number + 1}",
+        )
+        for number in range(threads_count)
+    ]
+
+    def supervise() -> None:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        queue.close()
+        if len(queue):
+            Message.error_message(f"Этап {name} остановлен. Необработанных элементов: {len(queue)}")
+        if on_finish is not None:
+            on_finish()
+
+    STATISTICS.register_gauge(f"queue.depth.{name}", lambda: len(queue))
+    supervisor = threading.Thread(target=supervise, name=f"{name} supervisor")
+    Message.info_message(f"Создание {threads_count} потоков для этапа {name}...")
+    supervisor.start()
+    return supervisor
+
+
+def execute_threading_command(
+    target_func: Callable,
+    links: List,
+    threads_count: int,
+    *args,
+    size_key: Optional[Callable[[Dict], int]] = None,
+    max_restarts: int = 3,
+) -> None:
+    queue = WorkQueue()
+    for element in links:
+        queue.put(element, size=size_key(element) if size_key else 1)
+    queue.close()
+    start_stage(target_func, queue, threads_count, *args, max_restarts=max_restarts).join()